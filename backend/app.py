@@ -4,15 +4,35 @@ PurdueTHINK Alumni Finder - Backend API
 Flask backend to serve alumni data from Google Drive CSV
 """
 
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, send_file, stream_with_context
 from flask_cors import CORS
 import pandas as pd
 import requests
-from io import StringIO
 import os
 import hashlib
+import gc
+import json
+import threading
+import time
 from pathlib import Path
 
+from config import (
+    DIRECTORY_REFRESH_SECONDS, DIRECTORY_VERSION_FILE, DRIVE_REFRESH_SECONDS,
+    VECTOR_INDEX_ENABLED, VECTOR_INDEX_REFRESH_SECONDS,
+    MEMBER_SEARCH_CANDIDATES, RESUME_JOB_WORKERS, RESUME_JOB_STALE_SECONDS,
+    MAX_ALUMNI_PAGE_SIZE,
+)
+from services.alumni_columns import image_url_hashes, cached_image_filenames
+from services.alumni_store import load_alumni_frame
+from services.drive_refresher import DriveCsvRefresher
+from services.alumni_snapshot import alumni_snapshots, file_source_key
+from services.directory import DirectoryCache, SORT_KEYS, build_csv_entries, clean_nan_values
+from services.pagination import encode_cursor, decode_cursor
+from services.markdown_fences import CodeFenceStripper, strip_code_fence
+from services.recommendation_cache import RecommendationCache, profile_version
+from services.resume_jobs import ResumeJobRunner
+from services.vector_index import VectorIndexCache, load_vector_index
+
 # Import config and authentication services
 try:
     import config
@@ -62,6 +82,20 @@ DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 # Use relative path so it works for all users
 ALUMNI_CSV = os.path.join(os.path.dirname(__file__), "..", "gdrive_alumni.csv")
 
+# Local copy of the Google Drive CSV (used when ALUMNI_CSV is missing),
+# kept current in the background by drive_refresher
+DRIVE_CSV = os.path.join(os.path.dirname(__file__), "drive_alumni.csv")
+
+# Merged directory, rebuilt when DIRECTORY_VERSION_FILE records a write by any
+# worker, and otherwise at most every DIRECTORY_REFRESH_SECONDS
+directory_cache = DirectoryCache(max_age=DIRECTORY_REFRESH_SECONDS, marker_path=DIRECTORY_VERSION_FILE)
+
+# In-process copy of alumni_embeddings for similarity searches (see VECTOR_INDEX_ENABLED)
+vector_index_cache = VectorIndexCache(
+    max_age=VECTOR_INDEX_REFRESH_SECONDS,
+    load=lambda: load_vector_index(supabase_admin)
+)
+
 # Image cache directory
 CACHE_DIR = os.path.join(os.path.dirname(__file__), "cached_images")
 Path(CACHE_DIR).mkdir(parents=True, exist_ok=True)
@@ -92,8 +126,7 @@ def create_user_embedding(user_profile: dict, user_id: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        import google.generativeai as genai
-        from config import GEMINI_API_KEY, EMBEDDING_MODEL
+        from services.llm_client import llm_client
 
         # Build profile text for embedding
         parts = []
@@ -117,14 +150,8 @@ def create_user_embedding(user_profile: dict, user_id: str) -> bool:
 
         profile_text = '\n'.join(parts) if parts else f"Alumni: {name}"
 
-        # Generate embedding
-        genai.configure(api_key=GEMINI_API_KEY)
-        result = genai.embed_content(
-            model=EMBEDDING_MODEL,
-            content=profile_text,
-            task_type="retrieval_document"
-        )
-        embedding = result['embedding']
+        # Generate embedding (cached, so re-saving an unchanged profile skips the API)
+        embedding = llm_client.embed(profile_text, "retrieval_document")
 
         # Generate unique ID for this user
         embedding_id = user_id_to_embedding_id(user_id)
@@ -138,6 +165,7 @@ def create_user_embedding(user_profile: dict, user_id: str) -> bool:
             'updated_at': 'now()'
         }, on_conflict='csv_row_id').execute()
 
+        vector_index_cache.upsert(embedding_id, name, embedding)
         print(f"✓ Created embedding for user {user_id} (embedding_id: {embedding_id})")
         return True
 
@@ -146,6 +174,28 @@ def create_user_embedding(user_profile: dict, user_id: str) -> bool:
         return False
 
 
+def match_alumni_embeddings(query_embedding, match_count: int, exclude_ids=()) -> list:
+    """Most similar alumni embeddings, shaped like the match_alumni RPC result.
+
+    Uses the in-process vector index when enabled and loadable, otherwise
+    (or if the index fails) calls the RPC.
+    """
+    if VECTOR_INDEX_ENABLED:
+        try:
+            index = vector_index_cache.get()
+            if len(index):
+                return index.search(query_embedding, match_count, exclude_ids)
+        except Exception as e:
+            print(f"Vector index unavailable, using match_alumni RPC: {e}")
+
+    response = supabase.rpc('match_alumni', {
+        'query_embedding': query_embedding,
+        'match_count': match_count,
+        'exclude_ids': list(exclude_ids)
+    }).execute()
+    return response.data
+
+
 def delete_user_embedding(user_id: str, csv_source_id: int = None) -> bool:
     """Delete a user's embedding from alumni_embeddings.
 
@@ -163,6 +213,7 @@ def delete_user_embedding(user_id: str, csv_source_id: int = None) -> bool:
 
         # Try to delete the user's own embedding
         supabase_admin.table('alumni_embeddings').delete().eq('csv_row_id', embedding_id).execute()
+        vector_index_cache.remove(embedding_id)
         print(f"✓ Deleted embedding for user {user_id} (embedding_id: {embedding_id})")
 
         return True
@@ -206,18 +257,6 @@ SEED = [
 ]
 
 
-def download_csv_from_google_drive(url):
-    """Download CSV from Google Drive and return as DataFrame."""
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        csv_data = StringIO(response.text)
-        return pd.read_csv(csv_data)
-    except Exception as e:
-        print(f"Failed to download CSV from Google Drive: {e}")
-        return None
-
-
 def get_image_hash(url):
     """Generate a unique filename from image URL."""
     return hashlib.md5(url.encode()).hexdigest()
@@ -278,140 +317,72 @@ def download_and_cache_image(image_url, person_name=""):
         return None
 
 
-def process_linkedin_csv(df):
-    """Process LinkedIn CSV format into standard format."""
-    df["name"] = df["Name"].fillna("") if "Name" in df.columns else ""
+def resolve_cached_image_urls(image_urls):
+    """Map LinkedIn image URLs to cached image URLs (legacy CSVs without supabaseProfileImageUrl)."""
+    image_hashes = image_url_hashes(image_urls)
 
-    if "linkedinProfileUrl" in df.columns:
-        df["linkedin"] = df["linkedinProfileUrl"].fillna("")
-    elif "Linkedin" in df.columns:
-        df["linkedin"] = df["Linkedin"].fillna("")
-    else:
-        df["linkedin"] = ""
+    # Use Supabase Storage - fast path (no verification to avoid 640+ API calls)
+    # The caching script pre-populates Supabase, frontend handles fallback
+    if SUPABASE_STORAGE_ENABLED:
+        public_urls = {h: get_public_url(f"{h}.jpg") if h else "" for h in image_hashes.unique()}
+        return image_hashes.map(public_urls)
 
-    df["email"] = df["Personal Gmail"].fillna("") if "Personal Gmail" in df.columns else ""
-    df["professional_email"] = df["professionalEmail"].fillna("") if "professionalEmail" in df.columns else ""
-    # Convert grad year to int string (removes .0 from float values like 2026.0)
-    if "Grad Yr" in df.columns:
-        df["grad_year"] = df["Grad Yr"].apply(lambda x: str(int(float(x))) if pd.notna(x) and str(x).strip() and str(x) != 'nan' else "")
-    else:
-        df["grad_year"] = ""
-    df["major"] = df["Major"].fillna("") if "Major" in df.columns else ""
-
-    if "linkedinJobTitle" in df.columns:
-        df["role_title"] = df["linkedinJobTitle"].fillna("")
-        if df["role_title"].str.strip().eq("").all() and "linkedinHeadline" in df.columns:
-            df["role_title"] = df["linkedinHeadline"].fillna("")
-    elif "linkedinHeadline" in df.columns:
-        df["role_title"] = df["linkedinHeadline"].fillna("")
-    else:
-        df["role_title"] = ""
+    # Fallback to local cache (legacy)
+    return cached_image_filenames(image_hashes, CACHE_DIR)
 
-    df["company"] = df["companyName"].fillna("") if "companyName" in df.columns else ""
-    df["company_industry"] = df["companyIndustry"].fillna("") if "companyIndustry" in df.columns else ""
 
-    if "location" in df.columns:
-        df["location"] = df["location"].fillna("")
-    elif "linkedinJobLocation" in df.columns:
-        df["location"] = df["linkedinJobLocation"].fillna("")
-    else:
-        df["location"] = ""
+def get_alumni_snapshot(refresh_in_background=True):
+    """Get the shared alumni snapshot, re-parsing the source only when it changes.
 
-    df["headline"] = df["linkedinHeadline"].fillna("") if "linkedinHeadline" in df.columns else ""
+    Sources are tried in order: local CSV, the local copy of the Google Drive
+    CSV (refreshed by drive_refresher, never fetched in the request path once
+    a copy exists), then seed data. CSVs are keyed on path + mtime + size.
+    """
+    # Try local CSV first (has stable URLs for cached images)
+    source_key = file_source_key(ALUMNI_CSV)
+    if source_key is not None:
+        return alumni_snapshots.get(source_key, lambda: build_alumni_data(load_alumni_frame(ALUMNI_CSV)))
 
-    # Store original LinkedIn image URLs
-    if "linkedinProfileImageUrl" in df.columns:
-        df["linkedin_image_url"] = df["linkedinProfileImageUrl"].fillna("")
-    else:
-        df["linkedin_image_url"] = ""
-
-    # Initialize profile_image_url column and populate with cached image URLs
-    df["profile_image_url"] = ""
-
-    # Use pre-computed Supabase URLs from CSV if available (preferred method)
-    # This ensures consistent URLs regardless of which CSV source is used
-    if "supabaseProfileImageUrl" in df.columns:
-        df["profile_image_url"] = df["supabaseProfileImageUrl"].fillna("")
-    elif "linkedinProfileImageUrl" in df.columns:
-        # Fallback: compute Supabase URL from LinkedIn URL (legacy method)
-        def get_cached_image_url(image_url):
-            if not image_url or str(image_url).strip() in ['', 'nan', 'null', 'None']:
-                return ""
+    # Fall back to Google Drive if local CSV not available
+    if GOOGLE_DRIVE_FILE_ID:
+        if refresh_in_background:
+            drive_refresher.start()
+        drive_refresher.ensure_local_copy()
 
-            # Use Supabase Storage - fast path (no verification to avoid 640+ API calls)
-            # The caching script pre-populates Supabase, frontend handles fallback
-            if SUPABASE_STORAGE_ENABLED:
-                # verify_exists=False is fast - just generates expected URL
-                supabase_url = get_supabase_image_url(str(image_url), verify_exists=False)
-                if supabase_url:
-                    return supabase_url
-
-            # Fallback to local cache (legacy)
-            image_hash = get_image_hash(str(image_url))
-            for ext in ['.jpg', '.jpeg', '.png', '.webp']:
-                cached_path = os.path.join(CACHE_DIR, f"{image_hash}{ext}")
-                if os.path.exists(cached_path):
-                    return f"{image_hash}{ext}"
-            return ""
-
-        df["profile_image_url"] = df["linkedinProfileImageUrl"].apply(get_cached_image_url)
-
-    def build_companies_list(row):
-        companies = []
-        if "companyName" in row and row["companyName"] and str(row["companyName"]).strip():
-            companies.append(str(row["companyName"]).strip())
-        if "previousCompanyName" in row and row["previousCompanyName"] and str(row["previousCompanyName"]).strip():
-            companies.append(str(row["previousCompanyName"]).strip())
-        return companies
-
-    df["companies_list"] = df.apply(build_companies_list, axis=1)
-
-    def build_roles_list(row):
-        roles = []
-        # Current job title
-        if "linkedinJobTitle" in row and row["linkedinJobTitle"] and str(row["linkedinJobTitle"]).strip():
-            roles.append(str(row["linkedinJobTitle"]).strip())
-        # Previous job title
-        if "linkedinPreviousJobTitle" in row and row["linkedinPreviousJobTitle"] and str(row["linkedinPreviousJobTitle"]).strip():
-            roles.append(str(row["linkedinPreviousJobTitle"]).strip())
-        # If no job titles found but we have headline, use that
-        if not roles and "linkedinHeadline" in row and row["linkedinHeadline"] and str(row["linkedinHeadline"]).strip():
-            roles.append(str(row["linkedinHeadline"]).strip())
-        return roles
-
-    df["roles_list"] = df.apply(build_roles_list, axis=1)
-
-    def build_schools_list(row):
-        schools = []
-        if "linkedinSchoolName" in row and row["linkedinSchoolName"] and str(row["linkedinSchoolName"]).strip():
-            schools.append(str(row["linkedinSchoolName"]).strip())
-        if "linkedinPreviousSchoolName" in row and row["linkedinPreviousSchoolName"] and str(row["linkedinPreviousSchoolName"]).strip():
-            schools.append(str(row["linkedinPreviousSchoolName"]).strip())
-        return schools
-
-    df["schools_list"] = df.apply(build_schools_list, axis=1)
-    df["phone"] = ""
+        source_key = file_source_key(DRIVE_CSV)
+        if source_key is not None:
+            return alumni_snapshots.get(source_key, lambda: build_alumni_data(load_alumni_frame(DRIVE_CSV)))
+
+    # Use seed data as last resort
+    return alumni_snapshots.get(('seed',), lambda: build_alumni_data(pd.DataFrame(SEED)))
+
+
+# Swapping in a new Drive CSV rebuilds the snapshot from the refresher's
+# thread, so requests keep using the previous one until it's ready
+drive_refresher = DriveCsvRefresher(
+    GOOGLE_DRIVE_URL, DRIVE_CSV, DRIVE_REFRESH_SECONDS,
+    on_update=lambda: get_alumni_snapshot(refresh_in_background=False)
+)
 
 
 def load_alumni_data():
-    """Load alumni data from local CSV, Google Drive, or seed data."""
-    df = None
+    """Load alumni data from local CSV, Google Drive, or seed data.
 
-    # Try local CSV first (has stable URLs for cached images)
-    if os.path.exists(ALUMNI_CSV):
-        df = pd.read_csv(ALUMNI_CSV)
+    The returned DataFrame is shared by every request; treat it as read-only.
+    """
+    return get_alumni_snapshot().df
 
-    # Fall back to Google Drive if local CSV not available
-    if df is None and GOOGLE_DRIVE_FILE_ID:
-        df = download_csv_from_google_drive(GOOGLE_DRIVE_URL)
 
-    # Use seed data as last resort
-    if df is None:
-        df = pd.DataFrame(SEED)
+def build_alumni_data(df):
+    """Finish a loaded alumni DataFrame into the format used by the API.
 
-    # Process the DataFrame
+    LinkedIn exports arrive already normalized by services.alumni_store.
+    """
     if "Name" in df.columns:
-        process_linkedin_csv(df)
+        # Cached image URLs depend on the current image cache, so they are
+        # resolved on every load rather than stored in the compiled snapshot
+        if "supabaseProfileImageUrl" not in df.columns and "linkedinProfileImageUrl" in df.columns:
+            df["profile_image_url"] = resolve_cached_image_urls(df["linkedinProfileImageUrl"])
     else:
         # Add compatibility columns for old format
         if "companies_list" not in df.columns:
@@ -469,203 +440,169 @@ def load_alumni_data():
     return df
 
 
-def clean_nan_values(data):
-    """Recursively replace NaN values with None in data structures."""
-    import math
-    if isinstance(data, list):
-        return [clean_nan_values(item) for item in data]
-    elif isinstance(data, dict):
-        return {key: clean_nan_values(value) for key, value in data.items()}
-    elif isinstance(data, float):
-        if math.isnan(data):
-            return None
-        return data
-    elif pd.isna(data):
-        return None
-    else:
-        return data
-
-
-@app.route('/api/alumni', methods=['GET'])
-def get_alumni():
-    """Get all alumni or filtered alumni, merging CSV data with user profiles."""
+def load_directory_sources():
+    """Fetch the user profiles and deleted CSV ids merged into the directory."""
+    # Load all user profiles from Supabase
     try:
-        # Load CSV data
-        csv_df = load_alumni_data()
+        profiles_response = supabase.table('user_profiles').select('*').execute()
+        user_profiles = profiles_response.data if profiles_response.data else []
+    except:
+        user_profiles = []
 
-        # Load all user profiles from Supabase
-        try:
-            profiles_response = supabase.table('user_profiles').select('*').execute()
-            user_profiles = profiles_response.data if profiles_response.data else []
-        except:
-            user_profiles = []
+    # Load deleted alumni IDs to filter them out
+    deleted_csv_ids = set()
+    try:
+        deleted_response = supabase.table('deleted_alumni').select('csv_row_id').execute()
+        if deleted_response.data:
+            deleted_csv_ids = set(d['csv_row_id'] for d in deleted_response.data)
+    except:
+        pass  # Table might not exist yet
+
+    return user_profiles, deleted_csv_ids
+
+
+def get_directory_view():
+    """Get the materialized directory for the current alumni snapshot."""
+    return directory_cache.get(get_alumni_snapshot(), load_directory_sources)
+
+
+def get_name_index(snapshot):
+    """Fuzzy name index over the snapshot's CSV names (built once per snapshot)."""
+    from services.alumni_matcher import AlumniMatcher
+    return snapshot.derived('name_index', lambda s: AlumniMatcher.build_name_index(s.df))
+
+
+def get_key_indexes(snapshot):
+    """Email / LinkedIn slug / LinkedIn id -> CSV row positions (built once per snapshot)."""
+    from services.alumni_matcher import AlumniMatcher
+    return snapshot.derived('key_indexes', lambda s: AlumniMatcher.build_key_indexes(s.df))
+
+
+def get_member_search_index(snapshot):
+    """Name / BM25 index for chat member search (built once per snapshot)."""
+    from services.member_search import MemberSearchIndex
+    return snapshot.derived('member_search', lambda s: MemberSearchIndex(s.df))
+
+
+def sse_event(event, data):
+    """One Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(clean_nan_values(data), default=str)}\n\n"
+
+
+def csv_member_card(csv_id, row, name_col, similarity):
+    """Chat member card for a CSV alumni row."""
+    company_val = row.get('company_name', row.get('company', ''))
+    return {
+        'id': f'csv_{csv_id}',  # Unique ID for frontend key
+        'csv_row_id': int(csv_id),
+        'name': row.get(name_col, ''),
+        'role_title': row.get('role_title', ''),
+        'roles_list': row.get('roles_list', []),
+        'headline': row.get('headline', row.get('linkedinHeadline', '')),
+        'company': company_val,
+        'company_name': company_val,
+        'companies_list': row.get('companies_list', []),
+        'major': row.get('major', row.get('Major', '')),
+        'grad_year': str(row.get('grad_year', row.get('Grad Yr', ''))),
+        'location': row.get('location', ''),
+        'profile_image_url': row.get('profile_image_url', ''),
+        'linkedin': row.get('linkedin', row.get('Linkedin', '')),
+        'email': row.get('email', row.get('Personal Gmail', '')),
+        'similarity': similarity
+    }
 
-        # Load deleted alumni IDs to filter them out
-        deleted_csv_ids = set()
-        try:
-            deleted_response = supabase.table('deleted_alumni').select('csv_row_id').execute()
-            if deleted_response.data:
-                deleted_csv_ids = set(d['csv_row_id'] for d in deleted_response.data)
-        except:
-            pass  # Table might not exist yet
-
-        # Create a mapping of csv_source_id -> user_profile
-        csv_links = {}
-        new_user_profiles = []
-
-        for profile in user_profiles:
-            if profile.get('is_csv_linked') and profile.get('csv_source_id') is not None:
-                # This profile is linked to a CSV record
-                csv_links[profile['csv_source_id']] = profile
-            elif profile.get('onboarding_completed'):
-                # This is a new user not in CSV
-                new_user_profiles.append(profile)
-
-        # Merge CSV data with linked profiles
-        merged_alumni = []
-
-        for idx, csv_row in csv_df.iterrows():
-            # Skip deleted alumni entries
-            if idx in deleted_csv_ids:
-                continue
 
-            if idx in csv_links:
-                # Use user profile data instead of CSV
-                profile = csv_links[idx]
-                company_val = ', '.join(profile.get('companies', [])) if profile.get('companies') else csv_row.get('company_name', csv_row.get('company', ''))
-
-                # Get profile image - prefer user's profile, fall back to CSV's cached Supabase URL
-                # csv_row['profile_image_url'] is the Supabase URL (set by load_alumni_data)
-                cached_csv_image = csv_row.get('profile_image_url', '')  # Supabase URL
-                profile_img = profile.get('profile_image_url') or cached_csv_image
-
-                merged_alumni.append({
-                    'id': f'csv_{idx}',  # Unique ID for frontend key
-                    'name': profile.get('full_name', csv_row.get('name')),
-                    'role_title': ', '.join(profile.get('roles', [])) if profile.get('roles') else csv_row.get('role_title'),
-                    'roles_list': profile.get('roles', []) if profile.get('roles') else csv_row.get('roles_list', []),
-                    'headline': profile.get('current_title') or csv_row.get('headline'),
-                    'company': company_val,
-                    'company_name': company_val,
-                    'companies_list': profile.get('companies', []) if profile.get('companies') else csv_row.get('companies_list', []),
-                    'company_industry': csv_row.get('company_industry'),
-                    'major': profile.get('major', csv_row.get('major')),
-                    'grad_year': str(profile.get('graduation_year', csv_row.get('grad_year', ''))),
-                    'location': profile.get('location', csv_row.get('location')),
-                    'profile_image': profile_img,
-                    'profile_image_url': profile_img,
-                    'linkedin_url': profile.get('linkedin_url', csv_row.get('linkedin_url')),
-                    'linkedin': profile.get('linkedin_url', csv_row.get('linkedin_url')),
-                    'email': profile.get('personal_email', csv_row.get('email')),
-                    'linkedinProfileImageUrl': '',  # Don't expose raw LinkedIn URLs
-                    'linkedin_image_url': '',  # Use Supabase instead
-                    'is_linked': True,
-                    'source': 'user_profile'
-                })
-            else:
-                # Use CSV data with normalized field names
-                # Only use Supabase-cached profile images, not raw LinkedIn URLs (which expire)
-                company_val = csv_row.get('company_name', csv_row.get('company', ''))
-                cached_image = csv_row.get('profile_image_url', '')  # This is the Supabase URL
-                merged_alumni.append({
-                    'id': f'csv_{idx}',  # Unique ID for frontend key
-                    'name': csv_row.get('name', csv_row.get('Name', '')),
-                    'role_title': csv_row.get('role_title', ''),
-                    'roles_list': csv_row.get('roles_list', []),
-                    'headline': csv_row.get('headline', csv_row.get('linkedinHeadline', '')),
-                    'company': company_val,
-                    'company_name': company_val,
-                    'companies_list': csv_row.get('companies_list', []),
-                    'company_industry': csv_row.get('company_industry', csv_row.get('companyIndustry', '')),
-                    'major': csv_row.get('major', csv_row.get('Major', '')),
-                    'grad_year': str(csv_row.get('grad_year', csv_row.get('Grad Yr', ''))),
-                    'location': csv_row.get('location', ''),
-                    'profile_image': cached_image,
-                    'profile_image_url': cached_image,
-                    'linkedin_url': csv_row.get('linkedin_url', csv_row.get('linkedin', csv_row.get('Linkedin', ''))),
-                    'linkedin': csv_row.get('linkedin', csv_row.get('Linkedin', '')),
-                    'email': csv_row.get('email', csv_row.get('Personal Gmail', '')),
-                    'linkedinProfileImageUrl': '',  # Don't expose raw LinkedIn URLs (they expire)
-                    'linkedin_image_url': '',  # Use Supabase instead
-                    'is_linked': False,
-                    'source': 'csv'
-                })
+def warm_shared_caches():
+    """Load the alumni snapshot and its derived indexes before workers fork.
 
-        # Add new user profiles (not in CSV)
-        for profile in new_user_profiles:
-            company_val = ', '.join(profile.get('companies', [])) if profile.get('companies') else ''
-            merged_alumni.append({
-                'id': f"user_{profile.get('user_id', profile.get('id', ''))}",  # Unique ID for frontend key
-                'name': profile.get('full_name', ''),
-                'role_title': ', '.join(profile.get('roles', [])) if profile.get('roles') else '',
-                'roles_list': profile.get('roles', []) if profile.get('roles') else [],  # Add roles list
-                'headline': profile.get('current_title', ''),
-                'company': company_val,  # Add 'company' field for frontend compatibility
-                'company_name': company_val,
-                'companies_list': profile.get('companies', []),
-                'company_industry': '',  # New users don't have this yet
-                'major': profile.get('major', ''),
-                'grad_year': str(profile.get('graduation_year', '')),
-                'location': profile.get('location', ''),
-                'profile_image': profile.get('profile_image_url', ''),
-                'profile_image_url': profile.get('profile_image_url', ''),
-                'linkedin_url': profile.get('linkedin_url', ''),
-                'linkedin': profile.get('linkedin_url', ''),
-                'email': profile.get('personal_email', ''),
-                'linkedinProfileImageUrl': '',
-                'linkedin_image_url': '',
-                'is_linked': False,
-                'source': 'new_user'
-            })
-
-        # Apply filters
-        name_query = request.args.get('name', '').lower()
-        title_query = request.args.get('title', '').lower()
-        major_filter = request.args.get('major', '')
-        grad_year_filter = request.args.get('grad_year', '')
-        company_filter = request.args.get('company', '')
-        industry_filter = request.args.get('industry', '')
-
-        filtered_alumni = []
-        for alumni in merged_alumni:
-            # Apply name filter
-            if name_query and name_query not in alumni.get('name', '').lower():
-                continue
+    Called from the gunicorn master (see gunicorn.conf.py, preload_app) so every
+    worker starts with the same copy-on-write pages instead of parsing its own
+    copy. Nothing here talks to Supabase: connections must not be opened in
+    the master and shared across forked workers.
+    """
+    try:
+        snapshot = get_alumni_snapshot(refresh_in_background=False)
+        snapshot.derived('directory_csv_entries', build_csv_entries)
+        get_name_index(snapshot)
+        get_key_indexes(snapshot)
+        get_member_search_index(snapshot)
+    except Exception as e:
+        print(f"Failed to warm alumni caches: {e}")
+        return
 
-            # Apply title filter
-            if title_query:
-                if (title_query not in alumni.get('role_title', '').lower() and
-                    title_query not in alumni.get('headline', '').lower()):
-                    continue
+    # Move everything allocated so far out of the collector's reach; otherwise
+    # the first GC pass in each worker writes to (and un-shares) these pages
+    gc.freeze()
+    print(f"✓ Warmed shared alumni caches (generation {snapshot.generation})")
 
-            # Apply major filter
-            if major_filter and alumni.get('major') != major_filter:
-                continue
 
-            # Apply grad year filter
-            if grad_year_filter and alumni.get('grad_year') != grad_year_filter:
-                continue
+@app.route('/api/alumni', methods=['GET'])
+def get_alumni():
+    """Get all alumni or filtered alumni, merging CSV data with user profiles.
+
+    Optional query parameters:
+        sort: name | grad_year | company (default: directory order)
+        order: asc | desc (default: asc)
+        limit: page size; enables pagination and adds next_cursor to the response
+        cursor: next_cursor from the previous page (also paginates, without limit)
+        fields: comma-separated card fields to return (id is always included)
+    """
+    try:
+        sort = request.args.get('sort', '')
+        if sort and sort not in SORT_KEYS:
+            return jsonify({
+                'success': False,
+                'error': f"Invalid sort field: {sort}. Use one of: {', '.join(SORT_KEYS)}"
+            }), 400
 
-            # Apply company filter
-            if company_filter:
-                companies = alumni.get('companies_list', [])
-                if company_filter not in companies:
-                    continue
+        order = request.args.get('order', 'asc')
+        if order not in ('asc', 'desc'):
+            return jsonify({'success': False, 'error': 'order must be asc or desc'}), 400
 
-            # Apply industry filter
-            if industry_filter and alumni.get('company_industry') != industry_filter:
-                continue
+        limit = request.args.get('limit', type=int)
+        if limit is not None and limit < 1:
+            return jsonify({'success': False, 'error': 'limit must be a positive integer'}), 400
 
-            filtered_alumni.append(alumni)
+        offset = 0
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                offset = max(0, int(decode_cursor(cursor).get('offset', 0)))
+            except (TypeError, ValueError):
+                return jsonify({'success': False, 'error': 'Invalid cursor'}), 400
+
+        fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()]
+
+        # Prebuilt cards: CSV rows merged with linked profiles, plus new users
+        directory = get_directory_view()
+
+        # Apply filters (intersections over the directory's inverted index)
+        filtered_entries = directory.search(
+            sort=sort or None,
+            descending=order == 'desc',
+            name=request.args.get('name', ''),
+            title=request.args.get('title', ''),
+            major=request.args.get('major', ''),
+            grad_year=request.args.get('grad_year', ''),
+            company=request.args.get('company', ''),
+            industry=request.args.get('industry', '')
+        )
 
-        # Clean NaN values before sending response
-        filtered_alumni = clean_nan_values(filtered_alumni)
+        page = filtered_entries
+        paginated = limit is not None or offset > 0
+        if paginated:
+            end = offset + min(limit or MAX_ALUMNI_PAGE_SIZE, MAX_ALUMNI_PAGE_SIZE)
+            page = filtered_entries[offset:end]
 
-        return jsonify({
-            'success': True,
-            'count': len(filtered_alumni),
-            'data': filtered_alumni
-        })
+        # Cards are already NaN-cleaned and JSON-encoded, so just stitch them together
+        body = '{"success": true, "count": %d, "data": [%s]' % (
+            len(filtered_entries), ','.join(entry.encode(fields) for entry in page)
+        )
+        if paginated:
+            next_cursor = encode_cursor({'offset': end}) if end < len(filtered_entries) else None
+            body += ', "next_cursor": %s' % json.dumps(next_cursor)
+        body += '}'
+        return app.response_class(body, mimetype='application/json')
 
     except Exception as e:
         import traceback
@@ -677,32 +614,45 @@ def get_alumni():
         }), 500
 
 
+# /api/filters response key -> directory facet
+FILTER_FACETS = {
+    'majors': 'major',
+    'years': 'grad_year',
+    'companies': 'company',
+    'industries': 'industry',
+}
+
+
 @app.route('/api/filters', methods=['GET'])
 def get_filters():
-    """Get available filter options."""
-    try:
-        df = load_alumni_data()
+    """Get available filter options with the number of alumni for each value.
 
-        # Get unique values for filters
-        majors = sorted([m for m in df['major'].unique() if m])
-        years = sorted([y for y in df['grad_year'].unique() if y and y != 'nan'])
-
-        # Get all unique companies
-        all_companies = set()
-        for companies_list in df['companies_list']:
-            all_companies.update(companies_list)
-        companies = sorted([c for c in all_companies if c])
+    Accepts the same filter parameters as /api/alumni. When given, counts
+    for each facet are conditioned on the other active filters.
+    """
+    try:
+        directory = get_directory_view()
+        facet_counts = directory.facet_counts(
+            name=request.args.get('name', ''),
+            title=request.args.get('title', ''),
+            major=request.args.get('major', ''),
+            grad_year=request.args.get('grad_year', ''),
+            company=request.args.get('company', ''),
+            industry=request.args.get('industry', '')
+        )
 
-        industries = sorted([i for i in df['company_industry'].unique() if i])
+        filters = {}
+        counts = {}
+        for key, facet in FILTER_FACETS.items():
+            values = {value: count for value, count in facet_counts[facet].items()
+                      if value and value not in ('nan', 'None')}
+            filters[key] = sorted(values)
+            counts[key] = values
 
         return jsonify({
             'success': True,
-            'filters': {
-                'majors': majors,
-                'years': years,
-                'companies': companies,
-                'industries': industries
-            }
+            'filters': filters,
+            'counts': counts
         })
 
     except Exception as e:
@@ -757,13 +707,11 @@ def proxy_image():
 def cache_all_images():
     """Upload all LinkedIn profile images to Supabase Storage. Call this to refresh the image cache."""
     try:
-        # Load the CSV directly
-        if os.path.exists(ALUMNI_CSV):
-            df = pd.read_csv(ALUMNI_CSV)
-        else:
-            df = download_csv_from_google_drive(GOOGLE_DRIVE_URL)
-            if df is None:
-                return jsonify({'error': 'Could not load CSV data'}), 500
+        # Load the CSV directly (local file, else the Google Drive copy)
+        csv_path = ALUMNI_CSV if os.path.exists(ALUMNI_CSV) else DRIVE_CSV
+        if not os.path.exists(csv_path):
+            return jsonify({'error': 'Could not load CSV data'}), 500
+        df = pd.read_csv(csv_path)
 
         if 'linkedinProfileImageUrl' not in df.columns:
             return jsonify({'error': 'No linkedinProfileImageUrl column found'}), 400
@@ -1133,13 +1081,27 @@ if AUTH_ENABLED:
     # RESUME & PROFILE ENDPOINTS
     # ============================================================================
 
+    def parse_resume_text(resume_text):
+        from services.gemini_service import parse_resume
+        return parse_resume(resume_text)
+
+    resume_jobs = ResumeJobRunner(
+        supabase_admin,
+        parse=parse_resume_text,
+        on_profile_updated=directory_cache.apply_profile,
+        workers=RESUME_JOB_WORKERS,
+        stale_after=RESUME_JOB_STALE_SECONDS
+    )
+
     @app.route('/api/resume/upload', methods=['POST'])
     @require_auth
     def upload_resume(current_user):
-        """Upload and parse resume PDF"""
+        """Accept a resume PDF and queue it for processing.
+
+        Text extraction, parsing, the storage upload and the profile update run
+        in the background; poll /api/resume/jobs/<job_id> for the result.
+        """
         try:
-            from services.gemini_service import parse_resume
-            import PyPDF2
             from werkzeug.utils import secure_filename
 
             # Check if file was uploaded
@@ -1163,82 +1125,15 @@ if AUTH_ENABLED:
             if file_size > 5 * 1024 * 1024:  # 5MB
                 return jsonify({'error': 'File size exceeds 5MB limit'}), 400
 
-            # Extract text from PDF
-            pdf_reader = PyPDF2.PdfReader(file)
-            resume_text = ""
-
-            for page in pdf_reader.pages:
-                resume_text += page.extract_text() + "\n"
-
-            if not resume_text.strip():
-                return jsonify({'error': 'Could not extract text from PDF'}), 400
-
-            # Parse resume with Gemini
-            parsed_data = parse_resume(resume_text)
-
-            # Upload PDF to Supabase Storage
-            file.seek(0)  # Reset file pointer
             filename = secure_filename(f"{current_user['user_id']}_{file.filename}")
-
-            # Upload to Supabase storage bucket 'resumes'
-            storage_response = supabase.storage.from_('resumes').upload(
-                filename,
-                file.read(),
-                file_options={"content-type": "application/pdf"}
-            )
-
-            # Get public URL
-            resume_url = supabase.storage.from_('resumes').get_public_url(filename)
-
-            # Update user profile with resume data
-            update_data = {
-                'raw_resume_text': resume_text[:5000],  # Store first 5000 chars
-                'resume_url': resume_url,
-            }
-
-            # Add parsed fields if available
-            if parsed_data.get('major'):
-                update_data['major'] = parsed_data['major']
-            if parsed_data.get('graduation_year'):
-                update_data['graduation_year'] = parsed_data['graduation_year']
-            if parsed_data.get('linkedin_url'):
-                update_data['linkedin_url'] = parsed_data['linkedin_url']
-            if parsed_data.get('location'):
-                update_data['location'] = parsed_data['location']
-            if parsed_data.get('email'):
-                update_data['personal_email'] = parsed_data['email']
-            if parsed_data.get('phone'):
-                update_data['phone'] = parsed_data['phone']
-            if parsed_data.get('skills'):
-                # Store as bio for now (can expand schema later)
-                skills_text = ', '.join(parsed_data['skills'][:20])
-                update_data['bio'] = f"Skills: {skills_text}"
-
-            # Extract work experience - get all companies and roles
-            if parsed_data.get('work_experience') and len(parsed_data['work_experience']) > 0:
-                companies = [job.get('company') for job in parsed_data['work_experience'] if job.get('company')]
-                roles = [job.get('title') for job in parsed_data['work_experience'] if job.get('title')]
-
-                if companies:
-                    update_data['companies'] = companies
-                if roles:
-                    update_data['roles'] = roles
-
-            # Extract industries
-            if parsed_data.get('industries'):
-                update_data['career_interests'] = parsed_data['industries']
-
-            # Update profile
-            supabase.table('user_profiles').update(update_data).eq(
-                'user_id', current_user['user_id']
-            ).execute()
+            job_id = resume_jobs.submit(current_user['user_id'], filename, file.read())
 
             return jsonify({
                 'success': True,
-                'message': 'Resume uploaded and parsed successfully',
-                'parsed_data': parsed_data,
-                'resume_url': resume_url
-            }), 200
+                'message': 'Resume received and queued for processing',
+                'job_id': job_id,
+                'status': 'queued'
+            }), 202
 
         except Exception as e:
             import traceback
@@ -1246,6 +1141,25 @@ if AUTH_ENABLED:
             print(f"Traceback: {traceback.format_exc()}")
             return jsonify({'success': False, 'error': f'Failed to upload resume: {str(e)}'}), 500
 
+    @app.route('/api/resume/jobs/<job_id>', methods=['GET'])
+    @require_auth
+    def get_resume_job(current_user, job_id):
+        """Status of a resume upload job.
+
+        status is queued, extracting, parsing, saving, done (with parsed_data
+        and resume_url) or failed (with error).
+        """
+        try:
+            job = resume_jobs.get(job_id, current_user['user_id'])
+            if job is None:
+                return jsonify({'error': 'Resume job not found'}), 404
+
+            return jsonify({'success': True, **job}), 200
+
+        except Exception as e:
+            print(f"Error getting resume job {job_id}: {e}")
+            return jsonify({'success': False, 'error': f'Failed to get resume job: {str(e)}'}), 500
+
 
     @app.route('/api/profile/upload-image', methods=['POST'])
     @require_auth
@@ -1341,6 +1255,7 @@ if AUTH_ENABLED:
                 print(f"[PROFILE IMAGE UPLOAD] Warning: Profile update returned no data")
             else:
                 print(f"[PROFILE IMAGE UPLOAD] Profile updated successfully")
+                directory_cache.apply_profile(update_result.data[0])
 
             print(f"[PROFILE IMAGE UPLOAD] Success!")
             return jsonify({
@@ -1378,62 +1293,51 @@ if AUTH_ENABLED:
                     'error': 'Full name is required'
                 }), 400
 
-            # Load CSV data
-            csv_df = load_alumni_data()
+            # Top 5 candidates: email matches first, then name similarity > 0.6
+            snapshot = get_alumni_snapshot()
+            csv_df = snapshot.df
+            candidates = AlumniMatcher.search(
+                full_name, email, csv_df, k=5,
+                name_index=get_name_index(snapshot),
+                email_index=get_key_indexes(snapshot)['email']
+            )
 
-            # Find potential matches with lower threshold (0.7) to show more candidates
             potential_matches = []
-
-            for idx, row in csv_df.iterrows():
-                csv_name = str(row.get('Name', row.get('name', '')))
-                csv_email = str(row.get('Personal Gmail', row.get('email', ''))).lower().strip()
-
-                # Calculate name similarity
-                similarity = AlumniMatcher.name_similarity(full_name, csv_name)
-
-                # Check for email match (high confidence)
-                email_match = email and csv_email and email == csv_email
-
-                # Include if name similarity > 0.6 or email matches
-                if similarity > 0.6 or email_match:
-                    # Build card data for display
-                    profile_image = row.get('profile_image_url', '')
-
-                    # Get companies and roles
-                    companies_list = row.get('companies_list', [])
-                    if not companies_list or not isinstance(companies_list, list):
-                        company = row.get('company', row.get('company_name', ''))
-                        companies_list = [company] if company else []
-
-                    roles_list = row.get('roles_list', [])
-                    if not roles_list or not isinstance(roles_list, list):
-                        role = row.get('role_title', row.get('linkedinJobTitle', ''))
-                        roles_list = [role] if role else []
-
-                    potential_matches.append({
-                        'csv_index': int(idx),
-                        'name': csv_name,
-                        'email': csv_email,
-                        'similarity': round(similarity, 2),
-                        'email_match': email_match,
-                        'confidence': 1.0 if email_match else similarity,
-                        # Card display data
-                        'profile_image_url': profile_image,
-                        'role_title': row.get('role_title', row.get('linkedinHeadline', '')),
-                        'roles_list': roles_list,
-                        'company': row.get('company', row.get('company_name', '')),
-                        'companies_list': companies_list,
-                        'major': row.get('major', row.get('Major', '')),
-                        'grad_year': str(row.get('grad_year', row.get('Grad Yr', ''))),
-                        'location': row.get('location', ''),
-                        'linkedin': row.get('linkedin', row.get('linkedinProfileUrl', '')),
-                    })
-
-            # Sort by confidence (email match first, then by similarity)
-            potential_matches.sort(key=lambda x: (-x['email_match'], -x['confidence']))
-
-            # Limit to top 5 matches
-            potential_matches = potential_matches[:5]
+            for candidate in candidates:
+                row = csv_df.iloc[candidate['position']]
+
+                # Build card data for display
+                profile_image = row.get('profile_image_url', '')
+
+                # Get companies and roles
+                companies_list = row.get('companies_list', [])
+                if not companies_list or not isinstance(companies_list, list):
+                    company = row.get('company', row.get('company_name', ''))
+                    companies_list = [company] if company else []
+
+                roles_list = row.get('roles_list', [])
+                if not roles_list or not isinstance(roles_list, list):
+                    role = row.get('role_title', row.get('linkedinJobTitle', ''))
+                    roles_list = [role] if role else []
+
+                potential_matches.append({
+                    'csv_index': int(candidate['index']),
+                    'name': candidate['name'],
+                    'email': candidate['email'],
+                    'similarity': round(candidate['similarity'], 2),
+                    'email_match': candidate['email_match'],
+                    'confidence': candidate['confidence'],
+                    # Card display data
+                    'profile_image_url': profile_image,
+                    'role_title': row.get('role_title', row.get('linkedinHeadline', '')),
+                    'roles_list': roles_list,
+                    'company': row.get('company', row.get('company_name', '')),
+                    'companies_list': companies_list,
+                    'major': row.get('major', row.get('Major', '')),
+                    'grad_year': str(row.get('grad_year', row.get('Grad Yr', ''))),
+                    'location': row.get('location', ''),
+                    'linkedin': row.get('linkedin', row.get('linkedinProfileUrl', '')),
+                })
 
             return jsonify({
                 'success': True,
@@ -1526,6 +1430,7 @@ if AUTH_ENABLED:
             ).execute()
 
             if response.data:
+                directory_cache.apply_profile(response.data[0])
                 return jsonify({
                     'success': True,
                     'message': 'Profile linked successfully',
@@ -1619,8 +1524,10 @@ if AUTH_ENABLED:
                         matching_data = {**current_profile, **update_data}
 
                         # Load CSV and try to find match
-                        csv_df = load_alumni_data()
-                        match_result = AlumniMatcher.find_csv_match(matching_data, csv_df)
+                        snapshot = get_alumni_snapshot()
+                        match_result = AlumniMatcher.find_csv_match(
+                            matching_data, snapshot.df, get_name_index(snapshot), get_key_indexes(snapshot)
+                        )
 
                         if match_result:
                             linking_data = AlumniMatcher.get_csv_linking_data(match_result)
@@ -1650,6 +1557,7 @@ if AUTH_ENABLED:
             ).execute()
 
             if response.data:
+                directory_cache.apply_profile(response.data[0])
                 return jsonify({
                     'success': True,
                     'message': 'Profile updated successfully',
@@ -1779,6 +1687,8 @@ if AUTH_ENABLED:
                 except Exception as e:
                     print(f"Warning: Could not mark CSV as deleted (table may not exist): {e}")
 
+            directory_cache.remove_user(user_id, csv_source_id)
+
             print(f"=== ACCOUNT DELETION COMPLETE for {user_id} ===")
 
             return jsonify({
@@ -2039,6 +1949,8 @@ if AUTH_ENABLED:
             except Exception as embed_error:
                 print(f"Warning: Could not delete embedding: {embed_error}")
 
+            directory_cache.remove_user(user_id, csv_source_id)
+
             # Log the action with details of what was deleted
             log_admin_action(
                 director_user_id=current_user['user_id'],
@@ -2203,25 +2115,53 @@ if AUTH_ENABLED:
                 'error': str(e)
             }), 500
 
+    @app.route('/admin/llm-metrics', methods=['GET'])
+    @require_auth
+    @require_director
+    def get_llm_metrics(current_user):
+        """Get Gemini call counts, errors, cache hits and latency for this worker"""
+        try:
+            from services.llm_client import llm_client
+
+            return jsonify({
+                'success': True,
+                'metrics': llm_client.metrics()
+            }), 200
+
+        except Exception as e:
+            print(f"Error fetching LLM metrics: {str(e)}")
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+
 
     # ============================================================================
     # AI RECOMMENDATIONS ENDPOINT
     # ============================================================================
 
+    # Ranked recommendations per user, reused for later pages until the
+    # profile (or the alumni data) changes
+    recommendation_cache = RecommendationCache(ttl=config.SUGGESTION_CACHE_TTL)
+
     @app.route('/api/recommendations', methods=['POST'])
     @require_auth
     def get_recommendations(current_user):
         """Get AI-powered alumni recommendations based on user's profile.
 
         Request body:
-            exclude_ids: list[int] - CSV row IDs to exclude (already shown)
+            cursor: str (optional) - next_cursor from the previous page
+            exclude_ids: list[int] (optional, legacy) - CSV row IDs already shown
             count: int - Number of recommendations (default 10)
 
-        Returns top matching alumni based on profile similarity.
+        Returns top matching alumni based on profile similarity, plus a
+        next_cursor for the following page. The cursor carries the ranked
+        ids, so later pages make no Supabase or Gemini calls on whichever
+        worker serves them; repeat first-page requests reuse this worker's
+        ranking for the same profile version (SUGGESTION_CACHE_TTL).
         """
         try:
-            import google.generativeai as genai
-            from config import GEMINI_API_KEY, EMBEDDING_MODEL
+            from services.llm_client import llm_client
 
             from datetime import datetime
             current_year = datetime.now().year
@@ -2229,125 +2169,132 @@ if AUTH_ENABLED:
             data = request.get_json() or {}
             exclude_ids = data.get('exclude_ids', [])
             count = min(data.get('count', 10), 20)  # Max 20
+            user_id = current_user['user_id']
 
-            # Get user's profile
-            profile_response = supabase.table('user_profiles').select('*').eq(
-                'user_id', current_user['user_id']
-            ).execute()
-
-            if not profile_response.data:
-                return jsonify({'error': 'User profile not found'}), 404
-
-            user_profile = profile_response.data[0]
-
-            # Exclude user's own CSV record if linked
-            if user_profile.get('csv_source_id') is not None:
-                if user_profile['csv_source_id'] not in exclude_ids:
-                    exclude_ids = list(exclude_ids) + [user_profile['csv_source_id']]
-
-            # Build profile text for embedding
-            profile_parts = []
-            if user_profile.get('full_name'):
-                profile_parts.append(f"Name: {user_profile['full_name']}")
-            if user_profile.get('major'):
-                profile_parts.append(f"Major: {user_profile['major']}")
-            if user_profile.get('roles'):
-                profile_parts.append(f"Roles: {', '.join(user_profile['roles'])}")
-            if user_profile.get('companies'):
-                profile_parts.append(f"Companies: {', '.join(user_profile['companies'])}")
-            if user_profile.get('current_title'):
-                profile_parts.append(f"Title: {user_profile['current_title']}")
-            if user_profile.get('current_company'):
-                profile_parts.append(f"Company: {user_profile['current_company']}")
-            if user_profile.get('career_interests'):
-                profile_parts.append(f"Interests: {', '.join(user_profile['career_interests'])}")
-            if user_profile.get('target_industries'):
-                profile_parts.append(f"Target Industries: {', '.join(user_profile['target_industries'])}")
-            if user_profile.get('bio'):
-                profile_parts.append(f"Bio: {user_profile['bio'][:500]}")
-            if user_profile.get('location'):
-                profile_parts.append(f"Location: {user_profile['location']}")
-
-            profile_text = '\n'.join(profile_parts) if profile_parts else "Alumni member"
-
-            # Generate embedding for user's profile
-            genai.configure(api_key=GEMINI_API_KEY)
-            result = genai.embed_content(
-                model=EMBEDDING_MODEL,
-                content=profile_text,
-                task_type="retrieval_query"
-            )
-            query_embedding = result['embedding']
-
-            # Query Supabase for similar alumni using RPC function
-            # Fetch a larger pool (50+) to allow filtering while minimizing repetition
-            try:
-                # Get a large pool of matches (don't exclude in RPC - we'll filter in Python)
-                match_response = supabase.rpc('match_alumni', {
-                    'query_embedding': query_embedding,
-                    'match_count': 100,  # Fetch many candidates
-                    'exclude_ids': [user_profile.get('csv_source_id')] if user_profile.get('csv_source_id') else []  # Only exclude self
-                }).execute()
-
-                all_matches = match_response.data
-            except Exception as rpc_error:
-                print(f"RPC error (table may not exist yet): {rpc_error}")
-                # Fallback: return empty recommendations if table doesn't exist
-                return jsonify({
-                    'success': True,
-                    'recommendations': [],
-                    'message': 'Recommendations not available yet. Run build_alumni_embeddings.py first.'
-                }), 200
+            offset = 0
+            version = None
+            cursor_ids = []
+            if data.get('cursor'):
+                try:
+                    state = decode_cursor(data['cursor'])
+                    offset = max(0, int(state.get('offset', 0)))
+                    version = state.get('v')
+                    cursor_ids = [int(i) for i in state.get('ids') or []]
+                except (ValueError, TypeError):
+                    return jsonify({'success': False, 'error': 'Invalid cursor'}), 400
+
+            snapshot = get_alumni_snapshot()
+            csv_df = snapshot.df
+
+            # Page 2+: the cursor carries the ranking (minus rows dropped from the CSV since)
+            ranked = [i for i in cursor_ids if i in csv_df.index] or None
+            if ranked is None and version:
+                ranked = recommendation_cache.get(user_id, version, snapshot.generation)
+
+            if ranked is None:
+                # Get user's profile
+                profile_response = supabase.table('user_profiles').select('*').eq(
+                    'user_id', user_id
+                ).execute()
+
+                if not profile_response.data:
+                    return jsonify({'error': 'User profile not found'}), 404
+
+                user_profile = profile_response.data[0]
+
+                # Build profile text for embedding
+                profile_parts = []
+                if user_profile.get('full_name'):
+                    profile_parts.append(f"Name: {user_profile['full_name']}")
+                if user_profile.get('major'):
+                    profile_parts.append(f"Major: {user_profile['major']}")
+                if user_profile.get('roles'):
+                    profile_parts.append(f"Roles: {', '.join(user_profile['roles'])}")
+                if user_profile.get('companies'):
+                    profile_parts.append(f"Companies: {', '.join(user_profile['companies'])}")
+                if user_profile.get('current_title'):
+                    profile_parts.append(f"Title: {user_profile['current_title']}")
+                if user_profile.get('current_company'):
+                    profile_parts.append(f"Company: {user_profile['current_company']}")
+                if user_profile.get('career_interests'):
+                    profile_parts.append(f"Interests: {', '.join(user_profile['career_interests'])}")
+                if user_profile.get('target_industries'):
+                    profile_parts.append(f"Target Industries: {', '.join(user_profile['target_industries'])}")
+                if user_profile.get('bio'):
+                    profile_parts.append(f"Bio: {user_profile['bio'][:500]}")
+                if user_profile.get('location'):
+                    profile_parts.append(f"Location: {user_profile['location']}")
+
+                profile_text = '\n'.join(profile_parts) if profile_parts else "Alumni member"
+
+                version = profile_version(profile_text, user_profile.get('csv_source_id'))
+                ranked = recommendation_cache.get(user_id, version, snapshot.generation)
+
+            if ranked is None:
+                # Generate embedding for user's profile (cached until the profile text changes)
+                query_embedding = llm_client.embed(profile_text, "retrieval_query")
+
+                # Find similar alumni (in-process vector index, or the match_alumni RPC)
+                # Fetch a larger pool to rank from, excluding only the user's own record
+                try:
+                    all_matches = match_alumni_embeddings(
+                        query_embedding,
+                        match_count=100,  # Fetch many candidates
+                        exclude_ids=[user_profile.get('csv_source_id')] if user_profile.get('csv_source_id') else []  # Only exclude self
+                    )
+                except Exception as rpc_error:
+                    print(f"Embedding search error (table may not exist yet): {rpc_error}")
+                    # Fallback: return empty recommendations if table doesn't exist
+                    return jsonify({
+                        'success': True,
+                        'recommendations': [],
+                        'message': 'Recommendations not available yet. Run build_alumni_embeddings.py first.'
+                    }), 200
 
-            if not all_matches:
+                # Rank = search order, minus rows not in the CSV and future graduates
+                ranked = []
+                for m in all_matches or []:
+                    csv_id = m['csv_row_id']
+                    if csv_id not in csv_df.index:
+                        continue
+                    row = csv_df.loc[csv_id]
+                    grad_year_str = str(row.get('grad_year', row.get('Grad Yr', ''))).strip()
+                    if grad_year_str and grad_year_str not in ['', 'nan', 'None']:
+                        try:
+                            grad_year_int = int(float(grad_year_str))
+                            if grad_year_int > current_year:
+                                continue  # Skip future graduates
+                        except (ValueError, TypeError):
+                            pass  # If can't parse, include them
+                    ranked.append(csv_id)
+
+                recommendation_cache.put(user_id, version, snapshot.generation, ranked)
+
+            if not ranked:
                 return jsonify({
                     'success': True,
                     'recommendations': [],
                     'message': 'No recommendations available'
                 }), 200
 
-            # Load CSV first to filter by grad_year BEFORE selecting
-            csv_df = load_alumni_data()
+            if exclude_ids and not data.get('cursor'):
+                # Legacy clients: the top unseen matches, topped up with the best seen ones
+                excluded = set(exclude_ids)
+                matched_csv_ids = [i for i in ranked if i not in excluded][:count]
+                if len(matched_csv_ids) < count:
+                    matched_csv_ids.extend([i for i in ranked if i in excluded][:count - len(matched_csv_ids)])
+                next_offset = 0
+            else:
+                # Pages walk down the ranking and wrap around to the best matches at the end
+                offset = offset if offset < len(ranked) else 0
+                matched_csv_ids = ranked[offset:offset + count]
+                if len(matched_csv_ids) < count:
+                    matched_csv_ids += ranked[:min(offset, count - len(matched_csv_ids))]
+                next_offset = (offset + count) % len(ranked)
 
-            # Filter matches by grad_year first (remove future graduates)
-            valid_matches = []
-            for m in all_matches:
-                csv_id = m['csv_row_id']
-                if csv_id not in csv_df.index:
-                    continue
-                row = csv_df.loc[csv_id]
-                grad_year_str = str(row.get('grad_year', row.get('Grad Yr', ''))).strip()
-                if grad_year_str and grad_year_str not in ['', 'nan', 'None']:
-                    try:
-                        grad_year_int = int(float(grad_year_str))
-                        if grad_year_int > current_year:
-                            continue  # Skip future graduates
-                    except (ValueError, TypeError):
-                        pass  # If can't parse, include them
-                valid_matches.append(m)
-
-            # Separate into new (not yet seen) and already seen
-            # Both lists stay sorted by similarity score (best first from RPC)
-            new_matches = [m for m in valid_matches if m['csv_row_id'] not in exclude_ids]
-            seen_matches = [m for m in valid_matches if m['csv_row_id'] in exclude_ids]
-
-            # Always return the TOP best matches that haven't been seen yet
-            # Frontend auto-clears exclude_ids at 80 to cycle back to best matches
-            selected_matches = new_matches[:count]
-
-            if len(selected_matches) < count:
-                # Not enough unseen matches - fill with top seen matches
-                needed = count - len(selected_matches)
-                selected_matches.extend(seen_matches[:needed])
-
-            matched_csv_ids = [m['csv_row_id'] for m in selected_matches]
-
-            if not matched_csv_ids:
-                return jsonify({
-                    'success': True,
-                    'recommendations': [],
-                    'message': 'No recommendations available'
-                }), 200
+            next_cursor = encode_cursor(
+                {'v': version, 'offset': next_offset, 'ids': [int(i) for i in ranked]}
+            ) if len(ranked) > count else None
 
             # Build recommendation cards
             recommendations = []
@@ -2381,7 +2328,8 @@ if AUTH_ENABLED:
             return jsonify({
                 'success': True,
                 'recommendations': recommendations,
-                'count': len(recommendations)
+                'count': len(recommendations),
+                'next_cursor': next_cursor
             }), 200
 
         except Exception as e:
@@ -2396,44 +2344,26 @@ if AUTH_ENABLED:
     # ============================================================================
     # AI Email Writer Endpoint
     # ============================================================================
-    @app.route('/api/generate-email', methods=['POST'])
-    @require_auth
-    def generate_email(current_user):
-        """Generate a personalized networking email using AI.
-
-        Request body:
-            alumni: dict - Alumni data (name, company, role, etc.)
+    def prepare_email_draft(current_user, alumni_data):
+        """Build the email-writing prompt for alumni_data from the user's profile.
 
-        Returns generated email text.
+        Returns (prompt, subject), or None if the user has no profile.
         """
-        try:
-            import sys
-            import google.generativeai as genai
-            from config import GEMINI_API_KEY, GEMINI_MODEL
-
-            print(f"[DEBUG] generate_email called, GEMINI_MODEL={GEMINI_MODEL}", flush=True)
-
-            data = request.get_json() or {}
-            alumni_data = data.get('alumni', {})
-
-            if not alumni_data:
-                return jsonify({'error': 'Alumni data required'}), 400
-
-            # Get user's profile
-            profile_response = supabase.table('user_profiles').select('*').eq(
-                'user_id', current_user['user_id']
-            ).execute()
+        # Get user's profile
+        profile_response = supabase.table('user_profiles').select('*').eq(
+            'user_id', current_user['user_id']
+        ).execute()
 
-            if not profile_response.data:
-                return jsonify({'error': 'User profile not found'}), 404
+        if not profile_response.data:
+            return None
 
-            user_profile = profile_response.data[0]
+        user_profile = profile_response.data[0]
 
-            # Get user's custom template or use default
-            custom_template = (user_profile.get('email_template') or '').strip()
+        # Get user's custom template or use default
+        custom_template = (user_profile.get('email_template') or '').strip()
 
-            # Default template structure
-            default_template = """Hi {alumni_name},
+        # Default template structure
+        default_template = """Hi {alumni_name},
 
 I'm {user_name}, a {user_major} student at Purdue University. I came across your profile through THINK and was excited to see your work at {company}.
 
@@ -2442,29 +2372,25 @@ I'm really interested in learning more about your career path and any advice you
 Thanks so much,
 {user_name}"""
 
-            # Build context for the AI
-            alumni_name = alumni_data.get('name', 'there')
-            alumni_first_name = alumni_name.split()[0] if alumni_name else 'there'
-            company = alumni_data.get('company') or alumni_data.get('company_name') or 'your company'
-            role = alumni_data.get('role_title') or alumni_data.get('headline') or ''
-            industry = alumni_data.get('company_industry') or ''
-
-            user_name = user_profile.get('full_name', 'A THINK Member')
-            user_first_name = user_name.split()[0] if user_name else 'A THINK Member'
-            user_major = user_profile.get('major', 'a student')
-            user_grad_year = user_profile.get('graduation_year')
-            user_interests = user_profile.get('career_interests', [])
-            user_target_industries = user_profile.get('target_industries', [])
-            user_bio = user_profile.get('bio', '')
-
-            # Configure Gemini
-            genai.configure(api_key=GEMINI_API_KEY)
-            model = genai.GenerativeModel(GEMINI_MODEL)
-
-            # Build the prompt
-            if custom_template:
-                # User has custom template - use it as the base
-                prompt = f"""You are helping write a professional networking email. The user has provided a custom template.
+        # Build context for the AI
+        alumni_name = alumni_data.get('name', 'there')
+        alumni_first_name = alumni_name.split()[0] if alumni_name else 'there'
+        company = alumni_data.get('company') or alumni_data.get('company_name') or 'your company'
+        role = alumni_data.get('role_title') or alumni_data.get('headline') or ''
+        industry = alumni_data.get('company_industry') or ''
+
+        user_name = user_profile.get('full_name', 'A THINK Member')
+        user_first_name = user_name.split()[0] if user_name else 'A THINK Member'
+        user_major = user_profile.get('major', 'a student')
+        user_grad_year = user_profile.get('graduation_year')
+        user_interests = user_profile.get('career_interests', [])
+        user_target_industries = user_profile.get('target_industries', [])
+        user_bio = user_profile.get('bio', '')
+
+        # Build the prompt
+        if custom_template:
+            # User has custom template - use it as the base
+            prompt = f"""You are helping write a professional networking email. The user has provided a custom template.
 Use their template as a guide but personalize it with the specific details provided.
 
 USER'S CUSTOM TEMPLATE:
@@ -2486,9 +2412,9 @@ RECIPIENT INFO:
 Write a personalized email based on the template. Replace placeholders like NAME with actual names.
 Keep it professional but warm. Make it feel genuine, not generic.
 Output ONLY the email text, no explanations or markdown."""
-            else:
-                # Use default template with AI enhancement
-                prompt = f"""Write a professional networking email from a college student to an alumni.
+        else:
+            # Use default template with AI enhancement
+            prompt = f"""Write a professional networking email from a college student to an alumni.
 
 SENDER INFO:
 - Name: {user_name}
@@ -2518,18 +2444,47 @@ Instructions:
 
 Output ONLY the email text, no explanations or markdown."""
 
-            # Generate the email
-            response = model.generate_content(prompt)
-            generated_email = response.text.strip()
+        return prompt, f"Connecting from Purdue THINK - {user_first_name}"
+
+    @app.route('/api/generate-email', methods=['POST'])
+    @require_auth
+    def generate_email(current_user):
+        """Generate a personalized networking email using AI.
+
+        Request body:
+            alumni: dict - Alumni data (name, company, role, etc.)
+            regenerate: bool (optional) - Write a fresh draft instead of reusing an identical earlier one
+
+        Returns generated email text.
+        """
+        try:
+            import sys
+            from config import GEMINI_MODEL
+            from services.llm_client import llm_client
+
+            print(f"[DEBUG] generate_email called, GEMINI_MODEL={GEMINI_MODEL}", flush=True)
+
+            data = request.get_json() or {}
+            alumni_data = data.get('alumni', {})
+
+            if not alumni_data:
+                return jsonify({'error': 'Alumni data required'}), 400
+
+            draft = prepare_email_draft(current_user, alumni_data)
+            if draft is None:
+                return jsonify({'error': 'User profile not found'}), 404
+            prompt, subject = draft
+
+            # Generate the email (an identical earlier draft is reused unless regenerating)
+            generated_email = llm_client.generate(prompt, use_cache=not data.get('regenerate'))
 
             # Clean up any markdown artifacts
-            if generated_email.startswith('```'):
-                generated_email = '\n'.join(generated_email.split('\n')[1:-1])
+            generated_email = strip_code_fence(generated_email)
 
             return jsonify({
                 'success': True,
                 'email': generated_email,
-                'subject': f"Connecting from Purdue THINK - {user_first_name}"
+                'subject': subject
             }), 200
 
         except Exception as e:
@@ -2541,240 +2496,164 @@ Output ONLY the email text, no explanations or markdown."""
                 'error': f'Failed to generate email: {str(e)}'
             }), 500
 
-    # ============================================================================
-    # AI Networking Advisor Chatbot Endpoint
-    # ============================================================================
-    @app.route('/api/chat', methods=['POST'])
+    @app.route('/api/generate-email/stream', methods=['POST'])
     @require_auth
-    def chat_advisor(current_user):
-        """AI Networking Advisor Chatbot.
+    def generate_email_stream(current_user):
+        """Generate a networking email, streamed as Server-Sent Events.
 
-        Request body:
-            message: str - User's message
-            session_id: str (optional) - Existing session ID to continue conversation
+        Request body: same as /api/generate-email.
 
-        Returns AI response and optionally member cards if user asks to find someone.
+        Events, in order:
+            meta: {subject} - right away, before generation starts
+            token: {text} - email text as it is generated
+            done: {email, subject} - the full email
+        or error: {error} if generation fails part way.
         """
         try:
-            import google.generativeai as genai
-            from config import GEMINI_API_KEY, GEMINI_MODEL, EMBEDDING_MODEL
+            from services.llm_client import llm_client
 
             data = request.get_json() or {}
-            user_message = data.get('message', '').strip()
-            session_id = data.get('session_id')
+            alumni_data = data.get('alumni', {})
 
-            if not user_message:
-                return jsonify({'error': 'Message is required'}), 400
+            if not alumni_data:
+                return jsonify({'error': 'Alumni data required'}), 400
 
-            # Get or create chat session
-            if session_id:
-                # Verify session belongs to user
-                session_check = supabase.table('chat_sessions').select('id').eq(
-                    'id', session_id
-                ).eq('user_id', current_user['user_id']).execute()
-                if not session_check.data:
-                    session_id = None  # Invalid session, create new one
-
-            if not session_id:
-                # Create new session
-                new_session = supabase.table('chat_sessions').insert({
-                    'user_id': current_user['user_id']
-                }).execute()
-                session_id = new_session.data[0]['id']
-
-            # Get conversation history (last 10 messages)
-            history_response = supabase.table('chat_messages').select(
-                'role, content'
-            ).eq('session_id', session_id).order(
-                'created_at', desc=False
-            ).limit(10).execute()
-            conversation_history = history_response.data if history_response.data else []
-
-            # Get user's profile for context
-            profile_response = supabase.table('user_profiles').select('*').eq(
-                'user_id', current_user['user_id']
-            ).execute()
-            user_profile = profile_response.data[0] if profile_response.data else {}
-
-            # Check if user is asking to find/search for members
-            # Be very lenient - trigger search on many common phrases
-            search_keywords = [
-                # Direct search commands
-                'find', 'search', 'show me', 'show', 'get me', 'give me', 'gimme',
-                # Looking/asking for someone
-                'looking for', 'looking', 'who works', 'who is', 'who should', 'who can',
-                'anyone at', 'anyone in', 'anyone who', 'someone at', 'someone in', 'someone who',
-                'people at', 'people in', 'people who', 'members at', 'members in', 'alumni at',
-                # Recommendations/suggestions
-                'recommend', 'suggest', 'advice', 'help me', 'help with',
-                'contact for', 'contact about', 'talk to', 'speak to', 'reach out',
-                'connect with', 'connect me', 'introduce me',
-                # Industry/role searches
-                'works in', 'works at', 'working in', 'working at', 'work in', 'work at',
-                'consultant', 'consulting', 'finance', 'technology', 'engineering',
-                'software', 'product', 'analyst', 'manager', 'intern',
-                # Generic asks
-                'names', 'list', 'members', 'alumni', 'people'
+            draft = prepare_email_draft(current_user, alumni_data)
+            if draft is None:
+                return jsonify({'error': 'User profile not found'}), 404
+            prompt, subject = draft
+        except Exception as e:
+            import traceback
+            print(f"Error in generate_email_stream: {e}", flush=True)
+            print(traceback.format_exc(), flush=True)
+            return jsonify({
+                'success': False,
+                'error': f'Failed to generate email: {str(e)}'
+            }), 500
+
+        use_cache = not data.get('regenerate')
+
+        def events():
+            yield sse_event('meta', {'subject': subject})
+
+            # Markdown fences are dropped as the text arrives, so tokens are already clean
+            stripper = CodeFenceStripper()
+            chunks = []
+            try:
+                for text in llm_client.generate_stream(prompt, use_cache=use_cache):
+                    text = stripper.feed(text)
+                    if text:
+                        chunks.append(text)
+                        yield sse_event('token', {'text': text})
+            except Exception as e:
+                print(f"Error streaming email: {e}", flush=True)
+                yield sse_event('error', {'error': f'Failed to generate email: {str(e)}'})
+                return
+
+            text = stripper.finish()
+            if text:
+                chunks.append(text)
+                yield sse_event('token', {'text': text})
+            yield sse_event('done', {'email': ''.join(chunks), 'subject': subject})
+
+        return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Keep proxies from buffering the stream
+        })
+
+    # ============================================================================
+    # AI Networking Advisor Chatbot Endpoint
+    # ============================================================================
+    def prepare_chat_turn(current_user, user_message, session_id=None):
+        """Resolve the chat session, search members and build the prompt for one message.
+
+        Returns (session_id, member_cards, full_prompt).
+        """
+        from services.llm_client import llm_client
+
+        # Get or create chat session
+        if session_id:
+            # Verify session belongs to user
+            session_check = supabase.table('chat_sessions').select('id').eq(
+                'id', session_id
+            ).eq('user_id', current_user['user_id']).execute()
+            if not session_check.data:
+                session_id = None  # Invalid session, create new one
+
+        if not session_id:
+            # Create new session
+            new_session = supabase.table('chat_sessions').insert({
+                'user_id': current_user['user_id']
+            }).execute()
+            session_id = new_session.data[0]['id']
+
+        # Get conversation history (last 10 messages)
+        history_response = supabase.table('chat_messages').select(
+            'role, content'
+        ).eq('session_id', session_id).order(
+            'created_at', desc=False
+        ).limit(10).execute()
+        conversation_history = history_response.data if history_response.data else []
+
+        # Get user's profile for context
+        profile_response = supabase.table('user_profiles').select('*').eq(
+            'user_id', current_user['user_id']
+        ).execute()
+        user_profile = profile_response.data[0] if profile_response.data else {}
+
+        # Check if user is asking to find/search for members
+        # Be very lenient - trigger search on many common phrases
+        search_keywords = [
+            # Direct search commands
+            'find', 'search', 'show me', 'show', 'get me', 'give me', 'gimme',
+            # Looking/asking for someone
+            'looking for', 'looking', 'who works', 'who is', 'who should', 'who can',
+            'anyone at', 'anyone in', 'anyone who', 'someone at', 'someone in', 'someone who',
+            'people at', 'people in', 'people who', 'members at', 'members in', 'alumni at',
+            # Recommendations/suggestions
+            'recommend', 'suggest', 'advice', 'help me', 'help with',
+            'contact for', 'contact about', 'talk to', 'speak to', 'reach out',
+            'connect with', 'connect me', 'introduce me',
+            # Industry/role searches
+            'works in', 'works at', 'working in', 'working at', 'work in', 'work at',
+            'consultant', 'consulting', 'finance', 'technology', 'engineering',
+            'software', 'product', 'analyst', 'manager', 'intern',
+            # Generic asks
+            'names', 'list', 'members', 'alumni', 'people'
+        ]
+        msg_lower = user_message.lower()
+        is_member_search = any(kw in msg_lower for kw in search_keywords)
+
+        member_cards = []
+
+        if is_member_search:
+            snapshot = get_alumni_snapshot()
+            csv_df = snapshot.df
+            name_col = 'name' if 'name' in csv_df.columns else 'Name'
+            exclude_ids = [user_profile.get('csv_source_id')] if user_profile.get('csv_source_id') else []
+
+            # Semantic candidates; lexical search still runs if the embedding call fails
+            vector_ids = []
+            try:
+                query_embedding = llm_client.embed(user_message, "retrieval_query")
+                matches = match_alumni_embeddings(
+                    query_embedding, match_count=MEMBER_SEARCH_CANDIDATES, exclude_ids=exclude_ids
+                )
+                vector_ids = [match['csv_row_id'] for match in matches or []]
+            except Exception as embed_error:
+                print(f"Embedding search failed: {embed_error}")
+
+            # Name mentions, BM25 over profile fields and the embedding ranking in one query
+            results = get_member_search_index(snapshot).search(
+                user_message, k=10, vector_ids=vector_ids, exclude_ids=exclude_ids
+            )
+            member_cards = [
+                csv_member_card(csv_id, csv_df.loc[csv_id], name_col, score)
+                for csv_id, score in results
             ]
-            msg_lower = user_message.lower()
-            is_member_search = any(kw in msg_lower for kw in search_keywords)
-
-            member_cards = []
-
-            if is_member_search:
-                # Load CSV for searching
-                csv_df = load_alumni_data()
-
-                # First, try direct name search (case-insensitive)
-                # msg_lower already defined above
-                name_found = False
-
-                # Get the name column
-                name_col = 'name' if 'name' in csv_df.columns else 'Name'
-
-                # Search for any name in the CSV that appears in the user's message
-                for idx, row in csv_df.iterrows():
-                    alumni_name = str(row.get(name_col, '')).lower()
-                    first_name = alumni_name.split()[0] if alumni_name else ''
-                    last_name = alumni_name.split()[-1] if alumni_name and len(alumni_name.split()) > 1 else ''
-
-                    # Check if first name, last name, or full name is mentioned
-                    if (first_name and first_name in msg_lower) or \
-                       (last_name and last_name in msg_lower) or \
-                       (alumni_name and alumni_name in msg_lower):
-                        cached_image = row.get('profile_image_url', '')
-                        company_val = row.get('company_name', row.get('company', ''))
-
-                        member_cards.append({
-                            'id': f'csv_{idx}',  # Unique ID for frontend key
-                            'csv_row_id': int(idx),
-                            'name': row.get(name_col, ''),
-                            'role_title': row.get('role_title', ''),
-                            'roles_list': row.get('roles_list', []),
-                            'headline': row.get('headline', row.get('linkedinHeadline', '')),
-                            'company': company_val,
-                            'company_name': company_val,
-                            'companies_list': row.get('companies_list', []),
-                            'major': row.get('major', row.get('Major', '')),
-                            'grad_year': str(row.get('grad_year', row.get('Grad Yr', ''))),
-                            'location': row.get('location', ''),
-                            'profile_image_url': cached_image,
-                            'linkedin': row.get('linkedin', row.get('Linkedin', '')),
-                            'email': row.get('email', row.get('Personal Gmail', '')),
-                            'similarity': 1.0  # Direct match
-                        })
-                        name_found = True
-
-                # If no direct name match, try role/title/company/industry search
-                if not member_cards:
-                    # Extract search terms (remove common words - be comprehensive)
-                    stop_words = {'find', 'search', 'looking', 'for', 'who', 'works', 'at', 'anyone',
-                                  'members', 'alumni', 'someone', 'people', 'show', 'me', 'recommend',
-                                  'suggest', 'in', 'the', 'a', 'an', 'is', 'are', 'can', 'you', 'i',
-                                  'want', 'need', 'like', 'similar', 'to', 'else', 'give', 'get', 'gimme',
-                                  'contact', 'talk', 'speak', 'reach', 'connect', 'introduce', 'help',
-                                  'advice', 'about', 'with', 'should', 'could', 'would', 'names', 'list',
-                                  'some', 'any', 'all', 'more', 'other', 'out'}
-                    search_terms = [word for word in msg_lower.split() if word not in stop_words and len(word) > 2]
-
-                    # Search by role, headline, company, major, OR industry
-                    for idx, row in csv_df.iterrows():
-                        role = str(row.get('role_title', '') or row.get('linkedinJobTitle', '')).lower()
-                        headline = str(row.get('headline', '') or row.get('linkedinHeadline', '')).lower()
-                        company = str(row.get('company_name', '') or row.get('company', '')).lower()
-                        major = str(row.get('major', '') or row.get('Major', '')).lower()
-                        industry = str(row.get('company_industry', '') or row.get('companyIndustry', '')).lower()
-
-                        # Check if any search term matches role, headline, company, major, or industry
-                        match_score = 0
-                        for term in search_terms:
-                            if term in role:
-                                match_score += 3  # Role match is most important
-                            if term in headline:
-                                match_score += 2
-                            if term in company:
-                                match_score += 2
-                            if term in industry:
-                                match_score += 3  # Industry is important for "consulting" type queries
-                            if term in major:
-                                match_score += 1
-
-                        if match_score > 0:
-                            cached_image = row.get('profile_image_url', '')
-                            company_val = row.get('company_name', row.get('company', ''))
-
-                            member_cards.append({
-                                'id': f'csv_{idx}',  # Unique ID for frontend key
-                                'csv_row_id': int(idx),
-                                'name': row.get(name_col, ''),
-                                'role_title': row.get('role_title', ''),
-                                'roles_list': row.get('roles_list', []),
-                                'headline': row.get('headline', row.get('linkedinHeadline', '')),
-                                'company': company_val,
-                                'company_name': company_val,
-                                'companies_list': row.get('companies_list', []),
-                                'major': row.get('major', row.get('Major', '')),
-                                'grad_year': str(row.get('grad_year', row.get('Grad Yr', ''))),
-                                'location': row.get('location', ''),
-                                'profile_image_url': cached_image,
-                                'linkedin': row.get('linkedin', row.get('Linkedin', '')),
-                                'email': row.get('email', row.get('Personal Gmail', '')),
-                                'similarity': match_score / 10.0  # Normalize score
-                            })
-
-                    # Sort by match score (highest first) and limit to top 10
-                    member_cards.sort(key=lambda x: x['similarity'], reverse=True)
-                    member_cards = member_cards[:10]
-
-                # If still no matches, fall back to embeddings for semantic search
-                if not member_cards:
-                    genai.configure(api_key=GEMINI_API_KEY)
-                    try:
-                        result = genai.embed_content(
-                            model=EMBEDDING_MODEL,
-                            content=user_message,
-                            task_type="retrieval_query"
-                        )
-                        query_embedding = result['embedding']
-
-                        # Query for similar alumni
-                        match_response = supabase.rpc('match_alumni', {
-                            'query_embedding': query_embedding,
-                            'match_count': 10,
-                            'exclude_ids': [user_profile.get('csv_source_id')] if user_profile.get('csv_source_id') else []
-                        }).execute()
-
-                        if match_response.data:
-                            for match in match_response.data[:10]:
-                                csv_id = match['csv_row_id']
-                                if csv_id in csv_df.index:
-                                    row = csv_df.loc[csv_id]
-                                    cached_image = row.get('profile_image_url', '')
-                                    company_val = row.get('company_name', row.get('company', ''))
-
-                                    member_cards.append({
-                                        'id': f'csv_{csv_id}',  # Unique ID for frontend key
-                                        'csv_row_id': int(csv_id),
-                                        'name': row.get(name_col, ''),
-                                        'role_title': row.get('role_title', ''),
-                                        'roles_list': row.get('roles_list', []),
-                                        'headline': row.get('headline', row.get('linkedinHeadline', '')),
-                                        'company': company_val,
-                                        'company_name': company_val,
-                                        'companies_list': row.get('companies_list', []),
-                                        'major': row.get('major', row.get('Major', '')),
-                                        'grad_year': str(row.get('grad_year', row.get('Grad Yr', ''))),
-                                        'location': row.get('location', ''),
-                                        'profile_image_url': cached_image,
-                                        'linkedin': row.get('linkedin', row.get('Linkedin', '')),
-                                        'email': row.get('email', row.get('Personal Gmail', '')),
-                                        'similarity': match.get('similarity', 0)
-                                    })
-                    except Exception as embed_error:
-                        print(f"Embedding search failed: {embed_error}")
-
-            # Build system prompt with THINK info and networking advice
-            system_prompt = f"""You are the THINK Networking Advisor, an AI assistant for Purdue THINK members.
+
+        # Build system prompt with THINK info and networking advice
+        system_prompt = f"""You are the THINK Networking Advisor, an AI assistant for Purdue THINK members.
 
 ABOUT THINK:
 - THINK is a selective business organization at Purdue University
@@ -2822,33 +2701,74 @@ CRITICAL - MEMBER SEARCH RULES:
 
 {("MEMBER SEARCH RESULTS:" + chr(10) + chr(10).join([f"- {m['name']} ({m['role_title']} at {m['company']})" for m in member_cards])) if member_cards else "MEMBER SEARCH RESULTS: No members found matching this query."}"""
 
-            # Build conversation for Gemini
-            messages = [system_prompt]
-            for msg in conversation_history[-8:]:  # Last 8 messages for context
-                if msg['role'] == 'user':
-                    messages.append(f"User: {msg['content']}")
-                else:
-                    messages.append(f"Assistant: {msg['content']}")
-            messages.append(f"User: {user_message}")
+        # Build conversation for Gemini
+        messages = [system_prompt]
+        for msg in conversation_history[-8:]:  # Last 8 messages for context
+            if msg['role'] == 'user':
+                messages.append(f"User: {msg['content']}")
+            else:
+                messages.append(f"Assistant: {msg['content']}")
+        messages.append(f"User: {user_message}")
+
+        full_prompt = '\n\n'.join(messages) + '\n\nAssistant:'
+
+        return session_id, member_cards, full_prompt
+
+    def save_chat_turn(session_id, user_message, ai_response):
+        """Store a user message and the advisor's reply, and bump the session.
+
+        session_id must come from prepare_chat_turn, which checked that it belongs
+        to the user. Writes use the service-role client: the streaming endpoint
+        saves after its response ends, when the request client's session may
+        already belong to the worker's next user.
+        """
+        supabase_admin.table('chat_messages').insert([
+            {'session_id': session_id, 'role': 'user', 'content': user_message},
+            {'session_id': session_id, 'role': 'assistant', 'content': ai_response}
+        ]).execute()
+
+        # Update session timestamp
+        supabase_admin.table('chat_sessions').update({
+            'updated_at': 'now()'
+        }).eq('id', session_id).execute()
+
+    def save_chat_turn_safely(session_id, user_message, ai_response):
+        """save_chat_turn for background threads, where nobody else would see the error."""
+        try:
+            save_chat_turn(session_id, user_message, ai_response)
+        except Exception as e:
+            print(f"Failed to save chat messages for session {session_id}: {e}", flush=True)
+
+    @app.route('/api/chat', methods=['POST'])
+    @require_auth
+    def chat_advisor(current_user):
+        """AI Networking Advisor Chatbot.
+
+        Request body:
+            message: str - User's message
+            session_id: str (optional) - Existing session ID to continue conversation
+            regenerate: bool (optional) - Skip the response cache for this message
 
-            full_prompt = '\n\n'.join(messages) + '\n\nAssistant:'
+        Returns AI response and optionally member cards if user asks to find someone.
+        """
+        try:
+            from services.llm_client import llm_client
+
+            data = request.get_json() or {}
+            user_message = data.get('message', '').strip()
+
+            if not user_message:
+                return jsonify({'error': 'Message is required'}), 400
+
+            session_id, member_cards, full_prompt = prepare_chat_turn(
+                current_user, user_message, data.get('session_id')
+            )
 
             # Generate response
-            genai.configure(api_key=GEMINI_API_KEY)
-            model = genai.GenerativeModel(GEMINI_MODEL)
-            response = model.generate_content(full_prompt)
-            ai_response = response.text.strip()
+            ai_response = llm_client.generate(full_prompt, use_cache=not data.get('regenerate')).strip()
 
             # Save messages to database
-            supabase.table('chat_messages').insert([
-                {'session_id': session_id, 'role': 'user', 'content': user_message},
-                {'session_id': session_id, 'role': 'assistant', 'content': ai_response}
-            ]).execute()
-
-            # Update session timestamp
-            supabase.table('chat_sessions').update({
-                'updated_at': 'now()'
-            }).eq('id', session_id).execute()
+            save_chat_turn(session_id, user_message, ai_response)
 
             return jsonify({
                 'success': True,
@@ -2866,6 +2786,72 @@ CRITICAL - MEMBER SEARCH RULES:
                 'error': f'Chat failed: {str(e)}'
             }), 500
 
+    @app.route('/api/chat/stream', methods=['POST'])
+    @require_auth
+    def chat_advisor_stream(current_user):
+        """AI Networking Advisor Chatbot, streamed as Server-Sent Events.
+
+        Request body: same as /api/chat.
+
+        Events, in order:
+            meta: {session_id, member_cards} - as soon as the member search is done
+            token: {text} - response text as it is generated
+            done: {response} - the full response
+        or error: {error} if generation fails part way. The messages are
+        saved after the stream ends, off the response path.
+        """
+        try:
+            from services.llm_client import llm_client
+
+            data = request.get_json() or {}
+            user_message = data.get('message', '').strip()
+
+            if not user_message:
+                return jsonify({'error': 'Message is required'}), 400
+
+            session_id, member_cards, full_prompt = prepare_chat_turn(
+                current_user, user_message, data.get('session_id')
+            )
+        except Exception as e:
+            import traceback
+            print(f"Error in chat_advisor_stream: {e}", flush=True)
+            print(traceback.format_exc(), flush=True)
+            return jsonify({
+                'success': False,
+                'error': f'Chat failed: {str(e)}'
+            }), 500
+
+        use_cache = not data.get('regenerate')
+
+        def events():
+            yield sse_event('meta', {
+                'session_id': session_id,
+                'member_cards': member_cards if member_cards else None
+            })
+
+            chunks = []
+            try:
+                for text in llm_client.generate_stream(full_prompt, use_cache=use_cache):
+                    chunks.append(text)
+                    yield sse_event('token', {'text': text})
+            except Exception as e:
+                print(f"Error streaming chat response: {e}", flush=True)
+                yield sse_event('error', {'error': f'Chat failed: {str(e)}'})
+                return
+
+            ai_response = ''.join(chunks).strip()
+            yield sse_event('done', {'response': ai_response})
+
+            # The client has everything; persist without holding up the response
+            threading.Thread(
+                target=save_chat_turn_safely, args=(session_id, user_message, ai_response),
+                name='chat-save', daemon=True
+            ).start()
+
+        return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Keep proxies from buffering the stream
+        })
 
     @app.route('/api/chat/history', methods=['GET'])
     @require_auth
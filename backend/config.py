@@ -33,15 +33,40 @@ FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True') == 'True'
 MAX_RESUME_SIZE_MB = 5
 ALLOWED_RESUME_EXTENSIONS = {'pdf', 'docx'}
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
+# Resume uploads are processed off the request by this many threads per worker
+# process; a job not updated for RESUME_JOB_STALE_SECONDS is reported as failed
+RESUME_JOB_WORKERS = 2
+RESUME_JOB_STALE_SECONDS = 600
 
 # AI Configuration
 GEMINI_MODEL = 'gemini-2.5-flash'  # Gemini 2.5 Flash
 EMBEDDING_MODEL = 'models/text-embedding-004'
+LLM_GENERATE_TIMEOUT = 60  # Seconds before a generation call is abandoned
+LLM_EMBED_TIMEOUT = 20  # Seconds before an embedding call is abandoned
 MAX_EMAIL_DRAFTS_PER_DAY = 10
 MAX_CHAT_MESSAGES_PER_DAY = 50
+MEMBER_SEARCH_CANDIDATES = 50  # Embedding matches fused with the lexical rankings in chat member search
 
 # Cache Configuration
 SUGGESTION_CACHE_TTL = 86400  # 24 hours in seconds
+EMBEDDING_CACHE_SIZE = 2048  # Embeddings kept in memory per process
+# SQLite file shared by all workers for cached embeddings (empty = memory only)
+EMBEDDING_CACHE_DB = os.getenv('EMBEDDING_CACHE_DB', os.path.join(os.path.dirname(__file__), 'embedding_cache.sqlite3'))
+LLM_RESPONSE_CACHE_TTL = 3600  # Identical generation requests reuse the response for 1 hour
+LLM_RESPONSE_CACHE_SIZE = 256  # Responses kept in memory per process
+# File every worker stats per directory request; replaced after each profile write
+# so the other workers rebuild their cached directory (empty = max age only)
+DIRECTORY_VERSION_FILE = os.getenv('DIRECTORY_VERSION_FILE', os.path.join(os.path.dirname(__file__), 'directory.version'))
+DIRECTORY_REFRESH_SECONDS = 300  # Merged directory re-fetches profiles at least this often
+# Embedding searches run against an in-process copy of alumni_embeddings,
+# reloaded in the background (VECTOR_INDEX_ENABLED=0 sends them all to the
+# match_alumni RPC instead)
+VECTOR_INDEX_ENABLED = os.getenv('VECTOR_INDEX_ENABLED', '1') != '0'
+VECTOR_INDEX_REFRESH_SECONDS = 300
+DRIVE_REFRESH_SECONDS = 300  # How often the Google Drive alumni CSV is polled for changes
+
+# API Configuration
+MAX_ALUMNI_PAGE_SIZE = 500  # Largest page /api/alumni returns when a limit is requested
 
 def validate_config():
     """Validate that all required environment variables are set"""
@@ -0,0 +1,15 @@
+"""
+Gunicorn configuration (used by the Procfile)
+
+The app is imported once in the master and the alumni data is loaded there
+before workers are forked, so all workers share one copy of it.
+"""
+
+# Import app.py in the master so forked workers inherit its memory
+preload_app = True
+
+
+def when_ready(server):
+    """Runs in the master after the app is preloaded, before any worker forks"""
+    from app import warm_shared_caches
+    warm_shared_caches()
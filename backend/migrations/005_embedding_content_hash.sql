@@ -0,0 +1,16 @@
+-- Migration: Track what each alumni embedding was built from
+-- Lets build_alumni_embeddings.py re-embed only rows whose profile text or
+-- embedding model changed, and reuse embeddings when CSV rows move
+
+ALTER TABLE alumni_embeddings
+ADD COLUMN IF NOT EXISTS content_hash TEXT,
+ADD COLUMN IF NOT EXISTS embedding_model TEXT,
+ADD COLUMN IF NOT EXISTS source_key TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_alumni_embeddings_source_key
+  ON alumni_embeddings(source_key);
+
+-- Add comments for documentation
+COMMENT ON COLUMN alumni_embeddings.content_hash IS 'SHA-256 of the profile text that was embedded';
+COMMENT ON COLUMN alumni_embeddings.embedding_model IS 'Embedding model that produced the vector';
+COMMENT ON COLUMN alumni_embeddings.source_key IS 'Stable alumni identity (LinkedIn id, slug or email) that survives CSV row shifts';
@@ -0,0 +1,28 @@
+-- Migration: Resume processing jobs
+-- /api/resume/upload acknowledges with a job id and processes the resume in
+-- the background; any worker process can report a job's status from here
+
+CREATE TABLE IF NOT EXISTS resume_jobs (
+  id UUID PRIMARY KEY,
+  user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  status TEXT NOT NULL DEFAULT 'queued',  -- queued, extracting, parsing, saving, done, failed
+  error TEXT,
+  parsed_data JSONB,
+  resume_url TEXT,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_resume_jobs_user_id
+  ON resume_jobs(user_id);
+
+-- Only the backend (service role) reads and writes jobs
+ALTER TABLE resume_jobs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow service role full access" ON resume_jobs
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- Add comments for documentation
+COMMENT ON COLUMN resume_jobs.status IS 'Pipeline stage; done and failed are final';
+COMMENT ON COLUMN resume_jobs.parsed_data IS 'Structured resume fields from the LLM parser, once done';
@@ -0,0 +1,21 @@
+-- Migration: Shared stable alumni id mapping
+-- Every process that imports the alumni CSV resolves row ids from this one
+-- row (key -> ids), so ids given to new alumni survive restarts and
+-- redeploys. Seeded from the committed alumni_ids.json on first import.
+
+CREATE TABLE IF NOT EXISTS alumni_id_mapping (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  mapping JSONB NOT NULL,  -- {"next_id": int, "ids": {key: [id, ...]}}
+  version INTEGER NOT NULL DEFAULT 1,  -- Bumped on every save (optimistic concurrency)
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Only the backend (service role) reads and writes the mapping
+ALTER TABLE alumni_id_mapping ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow service role full access" ON alumni_id_mapping
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- Add comments for documentation
+COMMENT ON COLUMN alumni_id_mapping.mapping IS 'Alumni identity keys (LinkedIn id, slug, email, name hash) to the ids that held them';
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Alumni Processing Benchmark
+Times process_linkedin_csv against the previous row-wise implementation on a
+synthetic LinkedIn export and checks that both produce identical output.
+
+Usage:
+  python3 scripts/benchmark_alumni_processing.py                 # 10k rows
+  python3 scripts/benchmark_alumni_processing.py --rows 50000
+  python3 scripts/benchmark_alumni_processing.py --legacy-images # no supabaseProfileImageUrl column
+"""
+
+import sys
+import os
+import io
+import time
+import hashlib
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from services.alumni_columns import process_linkedin_csv, image_url_hashes, cached_image_filenames
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Jordan', 'Miguel', 'Sofia', 'Ethan', 'Maya', 'Noah', 'Ava', 'Liam']
+LAST_NAMES = ['Shah', 'Kim', 'Torres', 'Patel', 'Nguyen', 'Smith', 'Garcia', 'Chen', 'Lee', 'Brown']
+MAJORS = ['Computer Science', 'Data Science', 'Industrial Engineering', 'Economics', 'Finance']
+COMPANIES = ['Google', 'Amazon', 'Capital One', 'Microsoft', 'Deloitte', 'McKinsey', ' Stripe ']
+TITLES = ['Software Engineer', 'Data Scientist', 'Product Manager', 'Analyst', 'Consultant', '  ']
+SCHOOLS = ['Purdue University', 'Stanford University', 'MIT']
+INDUSTRIES = ['Technology', 'Finance', 'Consulting']
+
+
+def make_synthetic_csv(rows: int, legacy_images: bool, seed: int = 0) -> str:
+    """Build a LinkedIn-export style CSV with blanks and NaNs sprinkled in"""
+    rng = np.random.default_rng(seed)
+
+    def pick(values, missing=0.15):
+        column = rng.choice(np.array(values, dtype=object), rows)
+        column[rng.random(rows) < missing] = None
+        return column
+
+    first, last = pick(FIRST_NAMES, 0.0), pick(LAST_NAMES, 0.0)
+    slugs = [f"{f.lower()}-{l.lower()}-{i}" for i, (f, l) in enumerate(zip(first, last))]
+    image_urls = [f"https://media.licdn.com/dms/image/{i % (rows // 2 or 1)}/profile.jpg" for i in range(rows)]
+
+    data = {
+        'Name': [f"{f} {l}" for f, l in zip(first, last)],
+        'Linkedin': [f"https://www.linkedin.com/in/{s}" for s in slugs],
+        'Major': pick(MAJORS),
+        'companyIndustry': pick(INDUSTRIES),
+        'companyName': pick(COMPANIES),
+        'linkedinHeadline': pick(TITLES, 0.1),
+        'linkedinJobDescription': ['Built and shipped things. ' * 20] * rows,
+        'linkedinJobLocation': pick(['West Lafayette, IN', 'Seattle, WA', 'New York, NY']),
+        'linkedinJobTitle': pick(TITLES),
+        'linkedinPreviousJobTitle': pick(TITLES, 0.5),
+        'linkedinProfileSlug': slugs,
+        'linkedinProfileImageUrl': pick(image_urls + ['null', ''], 0.1),
+        'linkedinSchoolName': pick(SCHOOLS),
+        'linkedinPreviousSchoolName': pick(SCHOOLS, 0.6),
+        'previousCompanyName': pick(COMPANIES, 0.4),
+        'Grad Yr': pick([2021.0, 2022.0, 2023.0, 2024.0, 2025.0, 2026.0], 0.05),
+        'professionalEmail': pick(['work@example.com'], 0.7),
+        'Personal Gmail': [f"{s}@gmail.com" for s in slugs],
+    }
+    if not legacy_images:
+        data['supabaseProfileImageUrl'] = [
+            f"https://example.supabase.co/storage/v1/object/public/profile-images/{i}.jpg" for i in range(rows)
+        ]
+
+    buffer = io.StringIO()
+    pd.DataFrame(data).to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+def legacy_process_linkedin_csv(df, cache_dir):
+    """The previous row-wise implementation (local image cache only)"""
+    df["name"] = df["Name"].fillna("") if "Name" in df.columns else ""
+
+    if "linkedinProfileUrl" in df.columns:
+        df["linkedin"] = df["linkedinProfileUrl"].fillna("")
+    elif "Linkedin" in df.columns:
+        df["linkedin"] = df["Linkedin"].fillna("")
+    else:
+        df["linkedin"] = ""
+
+    df["email"] = df["Personal Gmail"].fillna("") if "Personal Gmail" in df.columns else ""
+    df["professional_email"] = df["professionalEmail"].fillna("") if "professionalEmail" in df.columns else ""
+    if "Grad Yr" in df.columns:
+        df["grad_year"] = df["Grad Yr"].apply(lambda x: str(int(float(x))) if pd.notna(x) and str(x).strip() and str(x) != 'nan' else "")
+    else:
+        df["grad_year"] = ""
+    df["major"] = df["Major"].fillna("") if "Major" in df.columns else ""
+
+    if "linkedinJobTitle" in df.columns:
+        df["role_title"] = df["linkedinJobTitle"].fillna("")
+        if df["role_title"].str.strip().eq("").all() and "linkedinHeadline" in df.columns:
+            df["role_title"] = df["linkedinHeadline"].fillna("")
+    elif "linkedinHeadline" in df.columns:
+        df["role_title"] = df["linkedinHeadline"].fillna("")
+    else:
+        df["role_title"] = ""
+
+    df["company"] = df["companyName"].fillna("") if "companyName" in df.columns else ""
+    df["company_industry"] = df["companyIndustry"].fillna("") if "companyIndustry" in df.columns else ""
+
+    if "location" in df.columns:
+        df["location"] = df["location"].fillna("")
+    elif "linkedinJobLocation" in df.columns:
+        df["location"] = df["linkedinJobLocation"].fillna("")
+    else:
+        df["location"] = ""
+
+    df["headline"] = df["linkedinHeadline"].fillna("") if "linkedinHeadline" in df.columns else ""
+
+    if "linkedinProfileImageUrl" in df.columns:
+        df["linkedin_image_url"] = df["linkedinProfileImageUrl"].fillna("")
+    else:
+        df["linkedin_image_url"] = ""
+
+    df["profile_image_url"] = ""
+
+    if "supabaseProfileImageUrl" in df.columns:
+        df["profile_image_url"] = df["supabaseProfileImageUrl"].fillna("")
+    elif "linkedinProfileImageUrl" in df.columns:
+        def get_cached_image_url(image_url):
+            if not image_url or str(image_url).strip() in ['', 'nan', 'null', 'None']:
+                return ""
+            image_hash = hashlib.md5(str(image_url).encode()).hexdigest()
+            for ext in ['.jpg', '.jpeg', '.png', '.webp']:
+                if os.path.exists(os.path.join(cache_dir, f"{image_hash}{ext}")):
+                    return f"{image_hash}{ext}"
+            return ""
+
+        df["profile_image_url"] = df["linkedinProfileImageUrl"].apply(get_cached_image_url)
+
+    def build_companies_list(row):
+        companies = []
+        if "companyName" in row and row["companyName"] and str(row["companyName"]).strip():
+            companies.append(str(row["companyName"]).strip())
+        if "previousCompanyName" in row and row["previousCompanyName"] and str(row["previousCompanyName"]).strip():
+            companies.append(str(row["previousCompanyName"]).strip())
+        return companies
+
+    df["companies_list"] = df.apply(build_companies_list, axis=1)
+
+    def build_roles_list(row):
+        roles = []
+        if "linkedinJobTitle" in row and row["linkedinJobTitle"] and str(row["linkedinJobTitle"]).strip():
+            roles.append(str(row["linkedinJobTitle"]).strip())
+        if "linkedinPreviousJobTitle" in row and row["linkedinPreviousJobTitle"] and str(row["linkedinPreviousJobTitle"]).strip():
+            roles.append(str(row["linkedinPreviousJobTitle"]).strip())
+        if not roles and "linkedinHeadline" in row and row["linkedinHeadline"] and str(row["linkedinHeadline"]).strip():
+            roles.append(str(row["linkedinHeadline"]).strip())
+        return roles
+
+    df["roles_list"] = df.apply(build_roles_list, axis=1)
+
+    def build_schools_list(row):
+        schools = []
+        if "linkedinSchoolName" in row and row["linkedinSchoolName"] and str(row["linkedinSchoolName"]).strip():
+            schools.append(str(row["linkedinSchoolName"]).strip())
+        if "linkedinPreviousSchoolName" in row and row["linkedinPreviousSchoolName"] and str(row["linkedinPreviousSchoolName"]).strip():
+            schools.append(str(row["linkedinPreviousSchoolName"]).strip())
+        return schools
+
+    df["schools_list"] = df.apply(build_schools_list, axis=1)
+    df["phone"] = ""
+
+
+def assert_identical(expected: pd.DataFrame, actual: pd.DataFrame):
+    """Fail unless both frames have the same columns, dtypes, values and value types"""
+    assert list(expected.columns) == list(actual.columns), "column order differs"
+    for column in expected.columns:
+        a, b = expected[column], actual[column]
+        assert a.dtype == b.dtype, f"{column}: dtype {a.dtype} != {b.dtype}"
+        assert a.index.equals(b.index), f"{column}: index differs"
+        for x, y in zip(a.tolist(), b.tolist()):
+            same = (x != x and y != y) or (type(x) is type(y) and x == y)
+            assert same, f"{column}: {x!r} != {y!r}"
+
+
+def best_of(repeat, fn):
+    """Fastest wall time of fn() over repeat runs"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark alumni CSV processing')
+    parser.add_argument('--rows', type=int, default=10000, help='Synthetic rows (default 10000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per implementation')
+    parser.add_argument('--legacy-images', action='store_true',
+                        help='Omit supabaseProfileImageUrl so image URLs are hashed')
+    args = parser.parse_args()
+
+    csv_text = make_synthetic_csv(args.rows, args.legacy_images)
+    raw = pd.read_csv(io.StringIO(csv_text))
+    print(f"Synthetic CSV: {len(raw)} rows, {len(raw.columns)} columns, {len(csv_text) / 1e6:.1f} MB")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Pretend a third of the images are already cached locally
+        for url in raw['linkedinProfileImageUrl'].dropna().unique()[::3]:
+            open(os.path.join(cache_dir, hashlib.md5(url.encode()).hexdigest() + '.png'), 'w').close()
+
+        def process(df):
+            process_linkedin_csv(df)
+            if "supabaseProfileImageUrl" not in df.columns:
+                df["profile_image_url"] = cached_image_filenames(
+                    image_url_hashes(df["linkedinProfileImageUrl"]), cache_dir
+                )
+
+        expected, actual = raw.copy(), raw.copy()
+        legacy_process_linkedin_csv(expected, cache_dir)
+        process(actual)
+        assert_identical(expected, actual)
+        print("✓ Output identical to the row-wise implementation")
+
+        legacy = best_of(args.repeat, lambda: legacy_process_linkedin_csv(raw.copy(), cache_dir))
+        vectorized = best_of(args.repeat, lambda: process(raw.copy()))
+
+    print(f"Row-wise:   {legacy * 1000:8.1f} ms")
+    print(f"Vectorized: {vectorized * 1000:8.1f} ms")
+    print(f"Speedup:    {legacy / vectorized:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,30 +3,62 @@
 Build Alumni Embeddings
 Generates embeddings for all alumni in the CSV and stores them in Supabase.
 
+Only rows whose profile text or embedding model changed since they were
+embedded are sent to the API (each stored embedding records a hash of its
+text and the model). Rows that merely moved to another CSV position are
+matched by LinkedIn id / slug / email and reuse their stored embedding.
+
+Profiles are embedded in batches (one API call per EMBED_BATCH_SIZE
+profiles) paced by a token bucket sized to the embedding quota, and written
+to Supabase in bulk by a separate writer thread. A --rebuild checkpoints the
+rows it has written, so an interrupted rebuild picks up where it stopped.
+
 Usage:
   python3 scripts/build_alumni_embeddings.py           # Build all
   python3 scripts/build_alumni_embeddings.py --check   # Check status only
-  python3 scripts/build_alumni_embeddings.py --rebuild # Force rebuild all
+  python3 scripts/build_alumni_embeddings.py --rebuild # Force rebuild all (resumes an interrupted rebuild)
+  python3 scripts/build_alumni_embeddings.py --rebuild --restart   # Rebuild from scratch
+  python3 scripts/build_alumni_embeddings.py --requests-per-minute 1500 --workers 8
 """
 
 import sys
 import os
+import json
+import hashlib
 import time
+import queue
 import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import pandas as pd
-import google.generativeai as genai
 from supabase import create_client
-from config import GEMINI_API_KEY, SUPABASE_URL, SUPABASE_SERVICE_KEY, EMBEDDING_MODEL
+from config import SUPABASE_URL, SUPABASE_SERVICE_KEY, EMBEDDING_MODEL
+from services.alumni_matcher import AlumniMatcher
+from services.alumni_store import load_alumni_frame
+from services.llm_client import EMBED_BATCH_LIMIT, llm_client
+from services.rate_limiter import TokenBucket
 
 # Initialize clients
-genai.configure(api_key=GEMINI_API_KEY)
 supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
-# Rate limiting for Gemini API (free tier: 15 requests/min for embeddings)
-RATE_LIMIT_DELAY = 0.5  # seconds between requests (conservative)
+# Embedding API quota in requests per minute (a batch call is one request);
+# raise with --requests-per-minute on a paid tier
+REQUESTS_PER_MINUTE = 100
+
+# Profiles per embedding call (the most the batch API accepts)
+EMBED_BATCH_SIZE = EMBED_BATCH_LIMIT
+
+# Rows per Supabase upsert
+UPSERT_CHUNK_SIZE = 200
+
+# Attempts per embedding batch before its rows are counted as errors
+EMBED_ATTEMPTS = 4
+
+# Rows read per request when listing existing embeddings
+PAGE_SIZE = 1000
 
 def get_csv_path():
     """Get path to alumni CSV"""
@@ -36,9 +68,9 @@ def get_csv_path():
     )
 
 def load_alumni_csv():
-    """Load alumni from CSV"""
+    """Load alumni from the compiled snapshot (or the CSV if it changed)"""
     csv_path = get_csv_path()
-    df = pd.read_csv(csv_path)
+    df = load_alumni_frame(csv_path)
     print(f"Loaded {len(df)} alumni from CSV")
     return df
 
@@ -102,89 +134,253 @@ def create_profile_text(row):
 def generate_embedding(text):
     """Generate embedding for text using Gemini"""
     try:
-        result = genai.embed_content(
-            model=EMBEDDING_MODEL,
-            content=text,
-            task_type="retrieval_document"
-        )
-        return result['embedding']
+        return llm_client.embed(text, "retrieval_document", use_cache=False)
     except Exception as e:
         print(f"  Error generating embedding: {e}")
         return None
 
+def generate_embeddings(texts, bucket):
+    """Embed a batch of texts in one call, retrying with backoff (None if it keeps failing)"""
+    for attempt in range(EMBED_ATTEMPTS):
+        bucket.acquire()
+        try:
+            # Stored embeddings are already deduplicated by content hash
+            return llm_client.embed_batch(texts, "retrieval_document", use_cache=False)
+        except Exception as e:
+            if attempt == EMBED_ATTEMPTS - 1:
+                print(f"  Error generating embeddings for a batch of {len(texts)}: {e}")
+                return None
+            time.sleep(2 ** attempt)
+
+def content_hash(text):
+    """Fingerprint of the text an embedding was built from"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
 def get_existing_embeddings():
-    """Get list of csv_row_ids that already have embeddings"""
+    """Map csv_row_id -> {content_hash, embedding_model, source_key} for stored alumni embeddings"""
     try:
-        response = supabase.table('alumni_embeddings').select('csv_row_id').execute()
-        return set(row['csv_row_id'] for row in response.data)
+        existing = {}
+        start = 0
+        while True:
+            response = supabase.table('alumni_embeddings').select(
+                'csv_row_id, content_hash, embedding_model, source_key'
+            ).gte('csv_row_id', 0).order('csv_row_id').range(start, start + PAGE_SIZE - 1).execute()
+            page = response.data or []
+            existing.update((row['csv_row_id'], row) for row in page)
+            if len(page) < PAGE_SIZE:
+                return existing
+            start += PAGE_SIZE
     except Exception as e:
-        print(f"Note: Could not fetch existing embeddings: {e}")
-        return set()
+        print(f"Note: Could not fetch existing embeddings (has migrations/005_embedding_content_hash.sql been run?): {e}")
+        return {}
+
+def fetch_embeddings(csv_row_ids):
+    """Stored embedding vectors for the given csv_row_ids"""
+    embeddings = {}
+    for i in range(0, len(csv_row_ids), PAGE_SIZE):
+        response = supabase.table('alumni_embeddings').select('csv_row_id, embedding').in_(
+            'csv_row_id', csv_row_ids[i:i + PAGE_SIZE]
+        ).execute()
+        embeddings.update((row['csv_row_id'], row['embedding']) for row in response.data or [])
+    return embeddings
+
+def delete_embeddings(csv_row_ids):
+    """Remove embeddings for rows that are no longer in the CSV"""
+    for i in range(0, len(csv_row_ids), PAGE_SIZE):
+        supabase.table('alumni_embeddings').delete().in_('csv_row_id', csv_row_ids[i:i + PAGE_SIZE]).execute()
+
+def plan_changes(rows, existing):
+    """
+    Diff the CSV against the stored embeddings.
+
+    rows are (csv_row_id, name, text, content_hash, source_key). Returns
+    (to_embed, to_copy, stale): rows that need the API, (row, old csv_row_id)
+    pairs whose unchanged embedding is stored under another row, and stored
+    csv_row_ids that are no longer in the CSV.
+    """
+    def is_current(stored, text_hash):
+        return (stored is not None
+                and stored.get('content_hash') == text_hash
+                and stored.get('embedding_model') == EMBEDDING_MODEL)
+
+    by_source = {
+        stored['source_key']: csv_row_id
+        for csv_row_id, stored in existing.items() if stored.get('source_key')
+    }
+
+    to_embed, to_copy = [], []
+    for row in rows:
+        csv_row_id, _, _, text_hash, source_key = row
+        stored = existing.get(csv_row_id)
+        if is_current(stored, text_hash) and (stored.get('source_key') or '') == source_key:
+            continue
+        old_id = by_source.get(source_key) if source_key else None
+        if old_id is not None and old_id != csv_row_id and is_current(existing[old_id], text_hash):
+            to_copy.append((row, old_id))
+        else:
+            to_embed.append(row)
+
+    current_ids = {row[0] for row in rows}
+    stale = sorted(csv_row_id for csv_row_id in existing if csv_row_id not in current_ids)
+    return to_embed, to_copy, stale
 
-def upsert_embedding(csv_row_id, name, embedding, profile_text):
-    """Insert or update embedding in Supabase"""
+def upsert_embeddings(rows):
+    """Insert or update a chunk of embedding rows in Supabase in one request"""
     try:
-        supabase.table('alumni_embeddings').upsert({
-            'csv_row_id': csv_row_id,
-            'name': name,
-            'embedding': embedding,
-            'profile_text': profile_text[:1000],  # Truncate for storage
-            'updated_at': 'now()'
-        }, on_conflict='csv_row_id').execute()
+        supabase.table('alumni_embeddings').upsert(rows, on_conflict='csv_row_id').execute()
         return True
     except Exception as e:
-        print(f"  Error upserting embedding: {e}")
+        print(f"  Error upserting {len(rows)} embeddings: {e}")
         return False
 
-def build_embeddings(force_rebuild=False):
-    """Build embeddings for all alumni"""
-    df = load_alumni_csv()
+def get_checkpoint_path():
+    """Rebuild progress file, stored next to the CSV"""
+    return os.path.splitext(get_csv_path())[0] + '.embeddings-checkpoint.json'
 
-    # Check existing embeddings
-    existing = get_existing_embeddings() if not force_rebuild else set()
-    print(f"Existing embeddings: {len(existing)}")
+def load_checkpoint():
+    """csv_row_ids written by an interrupted rebuild"""
+    try:
+        with open(get_checkpoint_path()) as f:
+            return set(json.load(f).get('done', []))
+    except (OSError, ValueError):
+        return set()
 
-    # Filter to only new alumni
-    to_process = []
-    for idx, row in df.iterrows():
-        if idx not in existing:
-            to_process.append((idx, row))
+def save_checkpoint(done):
+    """Record written csv_row_ids (temp file + rename, so a crash never leaves half a file)"""
+    path = get_checkpoint_path()
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump({'done': sorted(done)}, f)
+    os.replace(tmp_path, path)
+
+def clear_checkpoint():
+    if os.path.exists(get_checkpoint_path()):
+        os.remove(get_checkpoint_path())
+
+
+class EmbeddingWriter(threading.Thread):
+    """Drains embedded rows from a queue and upserts them in chunks"""
+
+    def __init__(self, checkpoint=None):
+        super().__init__(name='embedding-writer', daemon=True)
+        self.rows = queue.Queue()
+        self.checkpoint = checkpoint  # set of written ids to persist, or None
+        self.written = 0
+        self.errors = 0
+
+    def _flush(self, chunk):
+        if upsert_embeddings(chunk):
+            self.written += len(chunk)
+            if self.checkpoint is not None:
+                self.checkpoint.update(row['csv_row_id'] for row in chunk)
+                save_checkpoint(self.checkpoint)
+        else:
+            self.errors += len(chunk)
+
+    def run(self):
+        chunk = []
+        while True:
+            row = self.rows.get()
+            if row is not None:
+                chunk.append(row)
+            # Write full chunks, and whatever is pending once the queue runs dry
+            if chunk and (row is None or len(chunk) >= UPSERT_CHUNK_SIZE or self.rows.empty()):
+                self._flush(chunk)
+                chunk = []
+            if row is None:
+                return
+
+def build_embeddings(force_rebuild=False, restart=False,
+                     requests_per_minute=REQUESTS_PER_MINUTE, workers=4):
+    """Build embeddings for alumni whose profile changed (or all, with force_rebuild)"""
+    df = load_alumni_csv()
 
-    if not to_process:
-        print("All alumni already have embeddings!")
+    rows = []
+    for idx, row in df.iterrows():
+        name = str(row.get('Name', f'Row {idx}')).strip()
+        text = create_profile_text(row)
+        rows.append((int(idx), name, text, content_hash(text), AlumniMatcher.identity_key(row)))
+
+    checkpoint = None
+    to_copy, stale = [], []
+    if force_rebuild:
+        # A rebuild re-embeds everything, skipping only what it already rewrote
+        if restart:
+            clear_checkpoint()
+        checkpoint = load_checkpoint()
+        if checkpoint:
+            print(f"Resuming rebuild: {len(checkpoint)} alumni already done")
+        to_process = [row for row in rows if row[0] not in checkpoint]
+    else:
+        existing = get_existing_embeddings()
+        to_process, to_copy, stale = plan_changes(rows, existing)
+        unchanged = len(rows) - len(to_process) - len(to_copy)
+        print(f"Existing embeddings: {len(existing)} ({unchanged} up to date, {len(to_copy)} moved, "
+              f"{len(to_process)} new or changed, {len(stale)} no longer in the CSV)")
+
+    if stale:
+        delete_embeddings(stale)
+        print(f"Removed {len(stale)} embeddings for rows no longer in the CSV")
+
+    if not to_process and not to_copy:
+        print("All alumni embeddings are up to date!")
+        if force_rebuild:
+            clear_checkpoint()
         return
 
-    print(f"\nProcessing {len(to_process)} alumni...")
+    def embedding_row(row, embedding):
+        csv_row_id, name, text, text_hash, source_key = row
+        return {
+            'csv_row_id': csv_row_id,
+            'name': name,
+            'embedding': embedding,
+            'profile_text': text[:1000],  # Truncate for storage
+            'content_hash': text_hash,
+            'embedding_model': EMBEDDING_MODEL,
+            'source_key': source_key or None,
+            'updated_at': 'now()'
+        }
 
-    success_count = 0
-    error_count = 0
+    # Read moved embeddings before anything is written over their old rows
+    copied = fetch_embeddings(sorted({old_id for _, old_id in to_copy})) if to_copy else {}
 
-    for i, (idx, row) in enumerate(to_process):
-        name = str(row.get('Name', f'Row {idx}')).strip()
+    bucket = TokenBucket(requests_per_minute, period=60.0, capacity=max(1, workers))
+    writer = EmbeddingWriter(checkpoint)
+    writer.start()
+    embed_errors = 0
+    started = time.perf_counter()
 
-        # Create profile text
-        profile_text = create_profile_text(row)
-
-        # Generate embedding
-        print(f"[{i+1}/{len(to_process)}] {name}...", end=' ', flush=True)
-        embedding = generate_embedding(profile_text)
-
-        if embedding:
-            # Store in Supabase
-            if upsert_embedding(idx, name, embedding, profile_text):
-                print("✓")
-                success_count += 1
-            else:
-                print("✗ (db error)")
-                error_count += 1
+    for row, old_id in to_copy:
+        if old_id in copied:
+            writer.rows.put(embedding_row(row, copied[old_id]))
         else:
-            print("✗ (embedding error)")
-            error_count += 1
-
-        # Rate limiting
-        time.sleep(RATE_LIMIT_DELAY)
-
-    print(f"\nDone! Success: {success_count}, Errors: {error_count}")
+            to_process.append(row)
+    batches = [to_process[i:i + EMBED_BATCH_SIZE] for i in range(0, len(to_process), EMBED_BATCH_SIZE)]
+    print(f"\nProcessing {len(to_process)} alumni in {len(batches)} batches "
+          f"({requests_per_minute} requests/min, {workers} workers)...")
+
+    def embed_batch(batch):
+        return batch, generate_embeddings([row[2] for row in batch], bucket)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for done, (batch, embeddings) in enumerate(pool.map(embed_batch, batches), start=1):
+            if embeddings is None:
+                embed_errors += len(batch)
+                print(f"[{done}/{len(batches)}] ✗ (embedding error)")
+                continue
+            for row, embedding in zip(batch, embeddings):
+                writer.rows.put(embedding_row(row, embedding))
+            print(f"[{done}/{len(batches)}] ✓ {len(batch)} embedded")
+
+    writer.rows.put(None)
+    writer.join()
+
+    errors = embed_errors + writer.errors
+    if force_rebuild and not errors:
+        clear_checkpoint()
+    print(f"\nDone in {time.perf_counter() - started:.1f}s! Success: {writer.written}, Errors: {errors}")
+    if errors and force_rebuild:
+        print("Re-run with --rebuild to retry the failed alumni")
 
 def check_status():
     """Check embedding status"""
@@ -219,12 +415,17 @@ def main():
     parser = argparse.ArgumentParser(description='Build alumni embeddings')
     parser.add_argument('--check', action='store_true', help='Check status only')
     parser.add_argument('--rebuild', action='store_true', help='Force rebuild all')
+    parser.add_argument('--restart', action='store_true', help='With --rebuild, ignore the saved progress')
+    parser.add_argument('--requests-per-minute', type=int, default=REQUESTS_PER_MINUTE,
+                        help=f'Embedding API quota (default {REQUESTS_PER_MINUTE})')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent embedding requests')
     args = parser.parse_args()
 
     if args.check:
         check_status()
     else:
-        build_embeddings(force_rebuild=args.rebuild)
+        build_embeddings(force_rebuild=args.rebuild, restart=args.restart,
+                         requests_per_minute=args.requests_per_minute, workers=args.workers)
 
 if __name__ == "__main__":
     main()
@@ -44,7 +44,6 @@ import os
 import sys
 import time
 import argparse
-import pandas as pd
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add parent directory to path to import config and services
@@ -57,6 +56,7 @@ from services.storage import (
     get_image_hash,
     get_public_url
 )
+from services.alumni_store import load_alumni_frame
 
 # Path to the CSV file (relative to project root)
 CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "gdrive_alumni.csv")
@@ -68,7 +68,7 @@ def load_alumni_data():
         print(f"Error: CSV file not found at {CSV_PATH}")
         sys.exit(1)
 
-    df = pd.read_csv(CSV_PATH)
+    df = load_alumni_frame(CSV_PATH)
 
     # Normalize column names
     column_mapping = {
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Compile Alumni Snapshot
+Converts gdrive_alumni.csv into the binary snapshot that the backend and the
+other scripts load instead of parsing the CSV.
+
+The snapshot is also rebuilt automatically the first time the CSV is loaded
+after it changes; run this after replacing the CSV (e.g. during deploy) so
+no worker pays that cost.
+
+Compiling is also the import step for stable alumni ids, and the only place
+they are assigned: rows are labelled with ids from the shared mapping in
+Supabase (LinkedIn id / slug / email / name hash -> id, seeded from
+alumni_ids.json), and new alumni are added to it. The mapping is saved in
+the snapshot, so the backend reads ids from there and never writes them.
+
+Usage:
+  python3 scripts/compile_alumni_snapshot.py
+  python3 scripts/compile_alumni_snapshot.py --csv path/to/alumni.csv
+  python3 scripts/compile_alumni_snapshot.py --read-only-ids  # no Supabase
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.alumni_store import compile_alumni_snapshot, read_alumni_snapshot
+
+CSV_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'gdrive_alumni.csv'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile the alumni CSV into a binary snapshot')
+    parser.add_argument('--csv', default=CSV_PATH, help='Path to the alumni CSV')
+    parser.add_argument('--read-only-ids', action='store_true',
+                        help='Use the stored id mapping without updating it in Supabase')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        print(f"Error: CSV file not found at {args.csv}")
+        sys.exit(1)
+
+    id_client = None
+    if not args.read_only_ids:
+        from supabase import create_client
+        from config import SUPABASE_URL, SUPABASE_SERVICE_KEY
+        id_client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+
+    start = time.perf_counter()
+    path = compile_alumni_snapshot(args.csv, id_client=id_client)
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df = read_alumni_snapshot(args.csv)
+    loaded = time.perf_counter() - start
+
+    print(f"✓ Wrote {path} ({len(df)} rows, {os.path.getsize(path) / 1024:.0f} KB)")
+    print(f"  Parse + compile: {compiled * 1000:.1f} ms, snapshot load: {loaded * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Re-link Alumni Profiles
+Matches every onboarded, unlinked user profile against the alumni CSV in one
+batch (e.g. after a roster import) and links the clear matches.
+
+Usage:
+  python3 scripts/relink_alumni_profiles.py                 # Dry run: show what would be linked
+  python3 scripts/relink_alumni_profiles.py --apply         # Write the links
+  python3 scripts/relink_alumni_profiles.py --processes 4   # Score names in a process pool
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supabase import create_client
+from config import SUPABASE_URL, SUPABASE_SERVICE_KEY
+from services.alumni_matcher import AlumniMatcher
+from services.alumni_store import load_alumni_frame
+
+CSV_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'gdrive_alumni.csv'
+)
+
+
+def load_profiles(supabase):
+    """All onboarded profiles, split into (unlinked, csv ids already claimed)"""
+    response = supabase.table('user_profiles').select(
+        'user_id, full_name, personal_email, linkedin_url, is_csv_linked, csv_source_id'
+    ).eq('onboarding_completed', True).execute()
+
+    unlinked = []
+    claimed = set()
+    for profile in response.data or []:
+        if profile.get('is_csv_linked') and profile.get('csv_source_id') is not None:
+            claimed.add(profile['csv_source_id'])
+        else:
+            unlinked.append(profile)
+    return unlinked, claimed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch re-link user profiles to alumni CSV records')
+    parser.add_argument('--apply', action='store_true', help='Write links (default is a dry run)')
+    parser.add_argument('--processes', type=int, default=None, help='Process pool size for name scoring')
+    args = parser.parse_args()
+
+    supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    csv_df = load_alumni_frame(CSV_PATH)
+    profiles, claimed = load_profiles(supabase)
+    print(f"Loaded {len(csv_df)} alumni and {len(profiles)} unlinked profiles")
+
+    start = time.perf_counter()
+    results = AlumniMatcher.find_csv_matches(profiles, csv_df, processes=args.processes)
+    print(f"Matched in {time.perf_counter() - start:.2f}s")
+
+    linked = skipped = 0
+    for profile, match_result in zip(profiles, results):
+        linking_data = AlumniMatcher.get_csv_linking_data(match_result)
+        if not linking_data:
+            continue
+
+        csv_id = linking_data['csv_source_id']
+        if csv_id in claimed:
+            print(f"⊙ Skipping {profile.get('full_name')}: CSV record #{csv_id} is already linked")
+            skipped += 1
+            continue
+        claimed.add(csv_id)
+
+        print(f"✓ {profile.get('full_name')} → CSV record #{csv_id} ({match_result['match_type']})")
+        if args.apply:
+            supabase.table('user_profiles').update(linking_data).eq('user_id', profile['user_id']).execute()
+        linked += 1
+
+    action = 'Linked' if args.apply else 'Would link'
+    print(f"\n{action} {linked} profiles ({skipped} skipped, {len(profiles) - linked - skipped} unmatched)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Alumni Column Pipeline
+Vectorized normalization of the LinkedIn-export alumni CSV
+"""
+import hashlib
+import os
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# Image URL values treated as "no image"
+INVALID_IMAGE_URLS = ('', 'nan', 'null', 'None')
+
+CACHED_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def _text_column(df: pd.DataFrame, *sources: str):
+    """First present source column with NaN as "" (or "" if none exist)"""
+    for source in sources:
+        if source in df.columns:
+            return df[source].fillna("")
+    return ""
+
+
+def _nonblank(df: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Stripped string value of column per row, or None where the value is
+    falsy or blank. Missing NaN cells are truthy, so they come through as
+    'nan' (this matches how the lists have always been built).
+    """
+    if column not in df.columns:
+        return np.full(len(df), None, dtype=object)
+
+    stripped = df[column].astype(str).str.strip().to_numpy(dtype=object)
+    keep = df[column].to_numpy().astype(bool) & (stripped != '')
+    return np.where(keep, stripped, None)
+
+
+def _collect(*columns: np.ndarray) -> List[List[str]]:
+    """Row-wise lists of the non-None values across columns"""
+    return [[value for value in values if value is not None] for values in zip(*columns)]
+
+
+def grad_year_column(values: pd.Series) -> pd.Series:
+    """Graduation years as int strings ('2026.0' -> '2026'), "" when missing"""
+    text = values.astype(str)
+    valid = (values.notna() & (text.str.strip() != '') & (text != 'nan')).to_numpy()
+
+    years = np.full(len(values), "", dtype=object)
+    if valid.any():
+        numbers = values.to_numpy(dtype=object)[valid].astype(float)
+        years[valid] = numbers.astype(np.int64).astype(str).astype(object)
+    return pd.Series(years, index=values.index)
+
+
+def image_url_hashes(image_urls: pd.Series) -> pd.Series:
+    """
+    MD5 cache key for each image URL ("" for blank or placeholder values).
+
+    Every distinct URL is hashed once, however many rows share it.
+    """
+    text = image_urls.astype(str)
+    valid = image_urls.to_numpy().astype(bool) & ~text.str.strip().isin(INVALID_IMAGE_URLS).to_numpy()
+    text = text.where(valid, "")
+
+    digests = {url: hashlib.md5(url.encode()).hexdigest() for url in pd.unique(text[valid])}
+    digests[""] = ""
+    return text.map(digests)
+
+
+def cached_image_filenames(image_hashes: pd.Series, cache_dir: str) -> pd.Series:
+    """Locally cached filename for each image hash ("" if not cached)"""
+    try:
+        cached = set(os.listdir(cache_dir))
+    except OSError:
+        cached = set()
+
+    def filename(image_hash):
+        if image_hash:
+            for ext in CACHED_IMAGE_EXTENSIONS:
+                if f"{image_hash}{ext}" in cached:
+                    return f"{image_hash}{ext}"
+        return ""
+
+    return image_hashes.map({h: filename(h) for h in pd.unique(image_hashes)})
+
+
+def process_linkedin_csv(df: pd.DataFrame):
+    """
+    Process LinkedIn CSV format into standard format (in place).
+
+    Without a precomputed supabaseProfileImageUrl column, profile_image_url is
+    left blank: cached image URLs depend on the current image cache, so the
+    caller resolves them (see image_url_hashes) each time the data is loaded.
+    """
+    df["name"] = _text_column(df, "Name")
+    df["linkedin"] = _text_column(df, "linkedinProfileUrl", "Linkedin")
+    df["email"] = _text_column(df, "Personal Gmail")
+    df["professional_email"] = _text_column(df, "professionalEmail")
+    df["grad_year"] = grad_year_column(df["Grad Yr"]) if "Grad Yr" in df.columns else ""
+    df["major"] = _text_column(df, "Major")
+
+    if "linkedinJobTitle" in df.columns:
+        df["role_title"] = df["linkedinJobTitle"].fillna("")
+        if df["role_title"].str.strip().eq("").all() and "linkedinHeadline" in df.columns:
+            df["role_title"] = df["linkedinHeadline"].fillna("")
+    else:
+        df["role_title"] = _text_column(df, "linkedinHeadline")
+
+    df["company"] = _text_column(df, "companyName")
+    df["company_industry"] = _text_column(df, "companyIndustry")
+    df["location"] = _text_column(df, "location", "linkedinJobLocation")
+    df["headline"] = _text_column(df, "linkedinHeadline")
+
+    # Store original LinkedIn image URLs
+    df["linkedin_image_url"] = _text_column(df, "linkedinProfileImageUrl")
+
+    # Use pre-computed Supabase URLs from CSV if available (preferred method)
+    # This ensures consistent URLs regardless of which CSV source is used
+    if "supabaseProfileImageUrl" in df.columns:
+        df["profile_image_url"] = df["supabaseProfileImageUrl"].fillna("")
+    else:
+        df["profile_image_url"] = ""
+
+    index = df.index
+    df["companies_list"] = pd.Series(
+        _collect(_nonblank(df, "companyName"), _nonblank(df, "previousCompanyName")),
+        index=index, dtype=object
+    )
+
+    # Current and previous job title, falling back to the headline
+    roles = _collect(_nonblank(df, "linkedinJobTitle"), _nonblank(df, "linkedinPreviousJobTitle"))
+    headlines = _nonblank(df, "linkedinHeadline")
+    df["roles_list"] = pd.Series(
+        [titles if titles or headline is None else [headline] for titles, headline in zip(roles, headlines)],
+        index=index, dtype=object
+    )
+
+    df["schools_list"] = pd.Series(
+        _collect(_nonblank(df, "linkedinSchoolName"), _nonblank(df, "linkedinPreviousSchoolName")),
+        index=index, dtype=object
+    )
+    df["phone"] = ""
@@ -0,0 +1,191 @@
+"""
+Alumni IDs
+Stable alumni ids that survive reordered, inserted and removed CSV rows
+"""
+import copy
+import hashlib
+import json
+import os
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from services.alumni_matcher import AlumniMatcher
+
+# Committed key -> id mapping the shared one was seeded from. Read-only: the
+# live mapping is the alumni_id_mapping row in Supabase (migration 007),
+# which only the compile step (scripts/compile_alumni_snapshot.py) updates
+ALUMNI_IDS_FILE = os.environ.get('ALUMNI_IDS_FILE') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'alumni_ids.json'
+)
+
+# Supabase table holding the mapping as a single versioned row
+MAPPING_TABLE = 'alumni_id_mapping'
+# Lost optimistic-update races tolerated before giving up
+SAVE_ATTEMPTS = 5
+
+# Key kinds from strongest to weakest: every row is placed by its LinkedIn id
+# before any row is placed by a slug, and so on
+KEY_KINDS = ('linkedin_id:', 'linkedin_slug:', 'email:', 'name:', 'row:')
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def _cell_text(value) -> str:
+    """A cell as text independent of the dtype pandas inferred for its column"""
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def row_keys(row) -> List[str]:
+    """
+    Durable keys of a CSV row, strongest first: its LinkedIn / email identity
+    keys, then a hash of the normalized name (or, for a nameless row, of the
+    whole row).
+    """
+    keys = AlumniMatcher.identity_keys(row)
+    name = row.get('Name', row.get('name'))
+    if name is not None and not pd.isna(name) and AlumniMatcher.normalize_name(str(name)):
+        keys.append('name:' + _digest(AlumniMatcher.normalize_name(str(name))))
+    elif not keys:
+        keys.append('row:' + _digest('\x1f'.join(_cell_text(v) for v in row.tolist())))
+    return keys
+
+
+def load_id_mapping(path: str = ALUMNI_IDS_FILE) -> Optional[Dict]:
+    """The committed seed mapping ({'next_id': int, 'ids': {key: [id, ...]}}), or None if there is none"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _fetch_mapping(client) -> Tuple[Optional[Dict], Optional[int]]:
+    """(mapping, version) stored in Supabase, or (None, None) before the first import"""
+    response = client.table(MAPPING_TABLE).select('mapping, version').eq('id', 1).execute()
+    if not response.data:
+        return None, None
+    return response.data[0]['mapping'], response.data[0]['version']
+
+
+def _store_mapping(client, mapping: Dict, version: Optional[int]) -> bool:
+    """
+    Save mapping over the stored one if that is still at version (None:
+    create the row). False if another process saved first.
+    """
+    if version is None:
+        try:
+            client.table(MAPPING_TABLE).insert({'id': 1, 'mapping': mapping, 'version': 1}).execute()
+        except Exception as e:  # Row created concurrently (or the insert failed): re-read and retry
+            print(f"Could not create alumni id mapping: {e}")
+            return False
+        return True
+    response = client.table(MAPPING_TABLE).update({'mapping': mapping, 'version': version + 1}).eq(
+        'id', 1
+    ).eq('version', version).execute()
+    return bool(response.data)
+
+
+def _resolve_ids(frame_keys: List[List[str]], mapping: Dict) -> List[int]:
+    """
+    Known id for each row, else a new one. Rows are matched one key kind at a
+    time, strongest first; a key shared by several rows (the same person
+    exported twice) lists every id that held it, and each row takes the
+    first one still free.
+    """
+    known = mapping['ids']
+    ids: List[Optional[int]] = [None] * len(frame_keys)
+    taken = set()
+
+    for kind in KEY_KINDS:
+        for pos, keys in enumerate(frame_keys):
+            if ids[pos] is not None:
+                continue
+            key = next((key for key in keys if key.startswith(kind)), None)
+            for alumni_id in known.get(key, ()):
+                if alumni_id not in taken:
+                    ids[pos] = alumni_id
+                    taken.add(alumni_id)
+                    break
+
+    for pos in range(len(ids)):
+        if ids[pos] is None:
+            ids[pos] = mapping['next_id']
+            mapping['next_id'] += 1
+    return ids
+
+
+def _assign(frame_keys: List[List[str]], mapping: Optional[Dict]) -> Tuple[List[int], Dict, bool]:
+    """
+    (ids, updated mapping, whether it changed) for the rows' keys. With no
+    mapping yet, the current row positions seed it, so ids already stored in
+    Supabase (embeddings, deleted_alumni, csv_source_id) stay valid.
+    """
+    if mapping is None:
+        ids = list(range(len(frame_keys)))
+        mapping = {'next_id': len(frame_keys), 'ids': {}}
+        changed = True
+    else:
+        mapping = copy.deepcopy(mapping)
+        next_id = mapping['next_id']
+        ids = _resolve_ids(frame_keys, mapping)
+        changed = mapping['next_id'] != next_id
+
+    # Each key lists the rows holding it in this export first, then older holders
+    holders = defaultdict(list)
+    for keys, alumni_id in zip(frame_keys, ids):
+        for key in keys:
+            holders[key].append(alumni_id)
+    known = mapping['ids']
+    for key, current in holders.items():
+        merged = current + [i for i in known.get(key, ()) if i not in current]
+        if known.get(key) != merged:
+            known[key] = merged
+            changed = True
+    return ids, mapping, changed
+
+
+def resolve_alumni_ids(df: pd.DataFrame, mapping: Optional[Dict]) -> Tuple[pd.Index, Dict, int]:
+    """
+    Ids for df from mapping without saving anything: (ids, mapping extended
+    with the rows it lacked, how many that was). Those rows get provisional
+    ids after mapping's next_id, which last until the compile step records
+    them in the shared mapping.
+    """
+    frame_keys = [row_keys(row) for _, row in df.iterrows()]
+    ids, updated, _ = _assign(frame_keys, mapping)
+    unknown = updated['next_id'] - mapping['next_id'] if mapping is not None else 0
+    return pd.Index(ids, dtype='int64'), updated, unknown
+
+
+def assign_alumni_ids(df: pd.DataFrame, client, seed_path: str = ALUMNI_IDS_FILE) -> Tuple[pd.Index, Dict]:
+    """
+    Stable alumni id for every row of df, recording new rows in the shared
+    mapping; returns (ids, the saved mapping). For the compile step only:
+    client is the service-role Supabase client, and errors are raised.
+
+    A row keeps the id its strongest known key (LinkedIn id, LinkedIn slug,
+    email, then name hash) points at; rows nobody has seen get fresh ids,
+    which are never reused. Keys of rows missing from this export stay in
+    the mapping, so a returning row gets its old id back.
+
+    The mapping is updated optimistically (a save only lands if nobody saved
+    since it was read), so concurrent compiles agree on new ids. It starts
+    from the committed seed file.
+    """
+    frame_keys = [row_keys(row) for _, row in df.iterrows()]
+
+    for _ in range(SAVE_ATTEMPTS):
+        stored, version = _fetch_mapping(client)
+        mapping = stored if stored is not None else load_id_mapping(seed_path)
+        ids, mapping, changed = _assign(frame_keys, mapping)
+        if (stored is not None and not changed) or _store_mapping(client, mapping, version):
+            return pd.Index(ids, dtype='int64'), mapping
+    raise RuntimeError(f'Could not save the alumni id mapping after {SAVE_ATTEMPTS} attempts')
@@ -2,10 +2,43 @@
 Alumni Matching Service
 Matches new user signups with existing CSV alumni data
 """
-from typing import Dict, List, Optional
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote
 import pandas as pd
 from difflib import SequenceMatcher
 
+from services.name_index import NameIndex
+
+# Minimum name similarity for find_csv_match to treat a CSV row as a match
+NAME_MATCH_THRESHOLD = 0.85
+
+# Minimum name similarity for search() (lower, to show more candidates)
+SEARCH_THRESHOLD = 0.6
+
+# Exact keys find_csv_match tries before fuzzy name matching, most specific
+# first: (key in build_key_indexes, match_type reported for a hit)
+EXACT_MATCH_KEYS = (
+    ('linkedin_id', 'linkedin_id_match'),
+    ('linkedin_slug', 'linkedin_slug_match'),
+    ('email', 'email_match'),
+)
+
+_LINKEDIN_SLUG = re.compile(r'linkedin\.com/in/([^/?#]+)', re.IGNORECASE)
+
+# Name index shared with process pool workers by find_csv_matches
+_pool_index: Optional[NameIndex] = None
+
+
+def _init_pool_index(name_index: NameIndex):
+    global _pool_index
+    _pool_index = name_index
+
+
+def _match_names(names: List[str]) -> List[List[Tuple[int, float]]]:
+    return [_pool_index.matches(name, NAME_MATCH_THRESHOLD) for name in names]
+
 
 class AlumniMatcher:
     """Service to match new users with existing CSV alumni records"""
@@ -20,6 +53,31 @@ class AlumniMatcher:
         """Normalize email for comparison"""
         return email.lower().strip()
 
+    @staticmethod
+    def normalize_linkedin_slug(value) -> str:
+        """Profile slug from a linkedin.com/in/... URL or a bare slug, lowercased"""
+        text = str(value).strip() if value is not None else ''
+        if text.lower() in ('', 'nan', 'none', 'null'):
+            return ''
+        match = _LINKEDIN_SLUG.search(text)
+        if match:
+            text = match.group(1)
+        elif '/' in text:
+            return ''
+        slug = unquote(text).strip().lower()
+        # Placeholders like '-' are not profiles
+        return slug if any(c.isalnum() for c in slug) else ''
+
+    @staticmethod
+    def normalize_linkedin_id(value) -> str:
+        """Numeric LinkedIn profile id as text (the CSV stores it as a float)"""
+        text = str(value).strip() if value is not None else ''
+        if text.lower() in ('', 'nan', 'none', 'null'):
+            return ''
+        if text.endswith('.0') and text[:-2].isdigit():
+            return text[:-2]
+        return text
+
     @staticmethod
     def name_similarity(name1: str, name2: str) -> float:
         """Calculate similarity between two names (0-1)"""
@@ -28,21 +86,190 @@ class AlumniMatcher:
         return SequenceMatcher(None, norm1, norm2).ratio()
 
     @staticmethod
-    def find_csv_match(user_data: Dict, csv_df: pd.DataFrame) -> Optional[Dict]:
+    def _column(csv_df: pd.DataFrame, *names: str) -> List:
+        """Values of the first present column (LinkedIn export name, then processed name)"""
+        for name in names:
+            if name in csv_df.columns:
+                return csv_df[name].tolist()
+        return [''] * len(csv_df)
+
+    @staticmethod
+    def build_name_index(csv_df: pd.DataFrame) -> NameIndex:
+        """Index the normalized CSV names (build once per alumni snapshot)"""
+        return NameIndex([
+            AlumniMatcher.normalize_name(str(name))
+            for name in AlumniMatcher._column(csv_df, 'Name', 'name')
+        ])
+
+    @staticmethod
+    def identity_keys(row) -> List[str]:
+        """
+        Durable keys of a CSV row that survive row shifts between exports,
+        strongest first: 'linkedin_id:...', 'linkedin_slug:...', 'email:...'.
+        """
+        keys = []
+        linkedin_id = AlumniMatcher.normalize_linkedin_id(row.get('linkedinProfileId'))
+        if linkedin_id:
+            keys.append(f'linkedin_id:{linkedin_id}')
+
+        for column in ('linkedinProfileSlug', 'linkedinProfileUrl', 'Linkedin', 'linkedin'):
+            slug = AlumniMatcher.normalize_linkedin_slug(row.get(column))
+            if slug:
+                keys.append(f'linkedin_slug:{slug}')
+                break
+
+        email = row.get('Personal Gmail', row.get('email'))
+        if email is not None and not pd.isna(email) and AlumniMatcher.normalize_email(str(email)):
+            keys.append(f'email:{AlumniMatcher.normalize_email(str(email))}')
+        return keys
+
+    @staticmethod
+    def identity_key(row) -> str:
+        """The strongest of identity_keys(row) ('' if none)"""
+        keys = AlumniMatcher.identity_keys(row)
+        return keys[0] if keys else ''
+
+    @staticmethod
+    def _key_index(values: List, normalize: Callable) -> Dict[str, List[int]]:
+        index: Dict[str, List[int]] = {}
+        for pos, value in enumerate(values):
+            key = normalize(value)
+            if key:
+                index.setdefault(key, []).append(pos)
+        return index
+
+    @staticmethod
+    def build_email_index(csv_df: pd.DataFrame) -> Dict[str, List[int]]:
+        """Map normalized personal email -> row positions (build once per alumni snapshot)"""
+        return AlumniMatcher._key_index(
+            AlumniMatcher._column(csv_df, 'Personal Gmail', 'email'),
+            lambda email: '' if pd.isna(email) else AlumniMatcher.normalize_email(str(email))
+        )
+
+    @staticmethod
+    def build_key_indexes(csv_df: pd.DataFrame) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Hash indexes for the EXACT_MATCH_KEYS (build once per alumni snapshot).
+
+        Maps 'email', 'linkedin_slug' and 'linkedin_id' to {normalized key:
+        row positions}. Rows without a slug column value fall back to the slug
+        in their profile URL.
+        """
+        slugs = [
+            AlumniMatcher.normalize_linkedin_slug(slug) or AlumniMatcher.normalize_linkedin_slug(url)
+            for slug, url in zip(AlumniMatcher._column(csv_df, 'linkedinProfileSlug'),
+                                 AlumniMatcher._column(csv_df, 'linkedinProfileUrl', 'Linkedin', 'linkedin'))
+        ]
+        return {
+            'email': AlumniMatcher.build_email_index(csv_df),
+            'linkedin_slug': AlumniMatcher._key_index(slugs, lambda slug: slug),
+            'linkedin_id': AlumniMatcher._key_index(
+                AlumniMatcher._column(csv_df, 'linkedinProfileId'), AlumniMatcher.normalize_linkedin_id
+            ),
+        }
+
+    @staticmethod
+    def exact_match(user_data: Dict, csv_df: pd.DataFrame,
+                    key_indexes: Dict[str, Dict[str, List[int]]]) -> Optional[Dict]:
+        """
+        Link by LinkedIn profile id, LinkedIn slug or personal email, in that order.
+
+        A key only counts if exactly one CSV row has it; duplicates are left
+        to fuzzy name matching. Returns a find_csv_match result or None.
+        """
+        user_keys = {
+            'linkedin_id': AlumniMatcher.normalize_linkedin_id(user_data.get('linkedin_profile_id')),
+            'linkedin_slug': AlumniMatcher.normalize_linkedin_slug(user_data.get('linkedin_url')),
+            'email': AlumniMatcher.normalize_email(user_data.get('personal_email') or ''),
+        }
+        for key, match_type in EXACT_MATCH_KEYS:
+            positions = key_indexes.get(key, {}).get(user_keys[key]) if user_keys[key] else None
+            if positions and len(positions) == 1:
+                pos = positions[0]
+                return {
+                    'csv_index': int(csv_df.index[pos]),
+                    'match_type': match_type,
+                    'confidence': 1.0,
+                    'csv_data': csv_df.iloc[pos].to_dict()
+                }
+        return None
+
+    @staticmethod
+    def search(name: str, email: str, csv_df: pd.DataFrame, k: int = 5,
+               threshold: float = SEARCH_THRESHOLD,
+               name_index: Optional[NameIndex] = None,
+               email_index: Optional[Dict[str, List[int]]] = None) -> List[Dict]:
+        """
+        Top-k CSV rows for a name (similarity > threshold) or exact personal email.
+
+        Email matches rank first, then rows by name similarity; ties keep CSV
+        order. Only rows that make the cut are looked at, so weak candidates
+        cost nothing beyond the index lookup.
+
+        Returns dicts with position, index, name, email, similarity,
+        email_match and confidence.
+        """
+        if name_index is None:
+            name_index = AlumniMatcher.build_name_index(csv_df)
+        if email_index is None:
+            email_index = AlumniMatcher.build_email_index(csv_df)
+
+        norm_name = AlumniMatcher.normalize_name(name)
+        email = AlumniMatcher.normalize_email(email) if email else ''
+
+        # Email matches outrank every name-only match, in CSV order
+        email_positions = sorted(email_index.get(email, [])) if email else []
+        ranked = [
+            (pos, SequenceMatcher(None, norm_name, name_index.names[pos]).ratio(), True)
+            for pos in email_positions[:k]
+        ]
+        ranked += [
+            (pos, similarity, False)
+            for pos, similarity in name_index.top(norm_name, k - len(ranked), threshold,
+                                                  exclude=email_positions)
+        ]
+
+        results = []
+        for pos, similarity, email_match in ranked:
+            row = csv_df.iloc[pos]
+            results.append({
+                'position': pos,
+                'index': csv_df.index[pos],
+                'name': str(row.get('Name', row.get('name', ''))),
+                'email': AlumniMatcher.normalize_email(str(row.get('Personal Gmail', row.get('email', '')))),
+                'similarity': similarity,
+                'email_match': email_match,
+                'confidence': 1.0 if email_match else similarity,
+            })
+        return results
+
+    @staticmethod
+    def find_csv_match(user_data: Dict, csv_df: pd.DataFrame,
+                       name_index: Optional[NameIndex] = None,
+                       key_indexes: Optional[Dict[str, Dict[str, List[int]]]] = None) -> Optional[Dict]:
         """
         Find matching CSV record for a new user.
 
+        name_index and key_indexes should come from build_name_index(csv_df)
+        and build_key_indexes(csv_df); they are built on the fly if not given.
+
         Returns:
             - Dict with match info if found
             - None if no match
 
         Match priority:
-            1. Exact name match (single) → return match
-            2. Multiple name matches → try email match
-            3. No name match → return None
+            1. LinkedIn id / LinkedIn slug / email unique to one row → return match
+            2. Exact name match (single) → return match
+            3. Multiple name matches → try email match
+            4. No name match → return None
         """
-        user_name = user_data.get('full_name', '').strip()
-        user_email = user_data.get('personal_email', '').strip().lower()
+        if key_indexes is None:
+            key_indexes = AlumniMatcher.build_key_indexes(csv_df)
+        exact = AlumniMatcher.exact_match(user_data, csv_df, key_indexes)
+        if exact:
+            return exact
+
+        user_name = (user_data.get('full_name') or '').strip()
 
         if not user_name:
             return None
@@ -50,19 +277,80 @@ class AlumniMatcher:
         # Normalize user name for comparison
         norm_user_name = AlumniMatcher.normalize_name(user_name)
 
+        if name_index is None:
+            name_index = AlumniMatcher.build_name_index(csv_df)
+
         # Find potential name matches (similarity > 0.85)
+        matches = name_index.matches(norm_user_name, NAME_MATCH_THRESHOLD)
+        return AlumniMatcher._resolve_match(
+            user_data, csv_df, matches,
+            AlumniMatcher._column(csv_df, 'Name'), AlumniMatcher._column(csv_df, 'Personal Gmail')
+        )
+
+    @staticmethod
+    def find_csv_matches(users: List[Dict], csv_df: pd.DataFrame,
+                         name_index: Optional[NameIndex] = None,
+                         key_indexes: Optional[Dict[str, Dict[str, List[int]]]] = None,
+                         processes: Optional[int] = None) -> List[Optional[Dict]]:
+        """
+        Batch version of find_csv_match: one result per user, in order.
+
+        Users with an exact key match skip name matching; the rest are grouped
+        by normalized name so each distinct name is scored once. With
+        processes > 1, the name scoring is spread over a process pool (worth
+        it for thousands of distinct names).
+        """
+        if name_index is None:
+            name_index = AlumniMatcher.build_name_index(csv_df)
+        if key_indexes is None:
+            key_indexes = AlumniMatcher.build_key_indexes(csv_df)
+
+        exact = [AlumniMatcher.exact_match(user, csv_df, key_indexes) for user in users]
+        norm_names = []
+        for user, exact_result in zip(users, exact):
+            user_name = (user.get('full_name') or '').strip()
+            norm_names.append(AlumniMatcher.normalize_name(user_name) if user_name and not exact_result else '')
+
+        distinct = sorted({name for name in norm_names if name})
+        if processes and processes > 1 and len(distinct) > 1:
+            chunk_size = max(1, len(distinct) // (processes * 4))
+            chunks = [distinct[i:i + chunk_size] for i in range(0, len(distinct), chunk_size)]
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_pool_index,
+                                     initargs=(name_index,)) as pool:
+                scored = [matches for chunk in pool.map(_match_names, chunks) for matches in chunk]
+        else:
+            scored = [name_index.matches(name, NAME_MATCH_THRESHOLD) for name in distinct]
+        name_matches = dict(zip(distinct, scored))
+
+        csv_names = AlumniMatcher._column(csv_df, 'Name')
+        csv_emails = AlumniMatcher._column(csv_df, 'Personal Gmail')
+        return [
+            exact_result or (
+                AlumniMatcher._resolve_match(user, csv_df, name_matches[name], csv_names, csv_emails)
+                if name else None
+            )
+            for user, name, exact_result in zip(users, norm_names, exact)
+        ]
+
+    @staticmethod
+    def _resolve_match(user_data: Dict, csv_df: pd.DataFrame, matches: List[Tuple[int, float]],
+                       csv_names: List, csv_emails: List) -> Optional[Dict]:
+        """
+        Turn (position, similarity) name matches into a find_csv_match result.
+
+        csv_names / csv_emails are the Name and Personal Gmail columns as lists;
+        only the row that is finally linked gets materialized.
+        """
+        user_email = (user_data.get('personal_email') or '').strip().lower()
+
         name_matches = []
-        for idx, row in csv_df.iterrows():
-            csv_name = str(row.get('Name', ''))
-            similarity = AlumniMatcher.name_similarity(user_name, csv_name)
-
-            if similarity > 0.85:  # High similarity threshold
-                name_matches.append({
-                    'index': idx,
-                    'row': row,
-                    'similarity': similarity,
-                    'name': csv_name
-                })
+        for pos, similarity in matches:
+            name_matches.append({
+                'position': pos,
+                'index': csv_df.index[pos],
+                'similarity': similarity,
+                'name': str(csv_names[pos])
+            })
 
         # Case 1: Single exact/near-exact name match
         if len(name_matches) == 1:
@@ -71,23 +359,21 @@ class AlumniMatcher:
                 'csv_index': int(match['index']),
                 'match_type': 'single_name_match',
                 'confidence': match['similarity'],
-                'csv_data': match['row'].to_dict()
+                'csv_data': csv_df.iloc[match['position']].to_dict()
             }
 
         # Case 2: Multiple name matches - try email disambiguation
         if len(name_matches) > 1:
             if user_email:
                 for match in name_matches:
-                    csv_email = AlumniMatcher.normalize_email(
-                        str(match['row'].get('Personal Gmail', ''))
-                    )
+                    csv_email = AlumniMatcher.normalize_email(str(csv_emails[match['position']]))
 
                     if csv_email and csv_email == user_email:
                         return {
                             'csv_index': int(match['index']),
                             'match_type': 'name_and_email_match',
                             'confidence': 1.0,  # High confidence with email match
-                            'csv_data': match['row'].to_dict()
+                            'csv_data': csv_df.iloc[match['position']].to_dict()
                         }
 
             # Multiple name matches but no email match - don't auto-link
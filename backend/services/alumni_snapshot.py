@@ -0,0 +1,96 @@
+"""
+Alumni Snapshot Cache
+Parses the alumni roster once per source version and shares it across requests
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+
+class AlumniSnapshot:
+    """A processed, read-only view of the alumni roster for one source version.
+
+    Handlers share the same DataFrame, so they must never modify it in place.
+    Structures derived from the roster (indexes, materialized views) are built
+    at most once per snapshot through derived().
+    """
+
+    def __init__(self, df: pd.DataFrame, source_key: Hashable, generation: int):
+        self.df = df
+        self.source_key = source_key
+        self.generation = generation
+        self._derived: Dict[str, Any] = {}
+        # Re-entrant so one derived structure can be built from another
+        self._lock = threading.RLock()
+
+    def derived(self, name: str, builder: Callable[['AlumniSnapshot'], Any]) -> Any:
+        """Return the structure registered under name, building it on first use"""
+        if name in self._derived:
+            return self._derived[name]
+
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = builder(self)
+            return self._derived[name]
+
+
+class SnapshotCache:
+    """Process-wide holder for the current AlumniSnapshot.
+
+    A snapshot is keyed by its source (file path + mtime + size, or a remote
+    ETag). As long as the key is unchanged, get() is a single comparison.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[AlumniSnapshot] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> Optional[AlumniSnapshot]:
+        """The most recently built snapshot, if any"""
+        return self._snapshot
+
+    def get(self, source_key: Hashable, build: Callable[[], Optional[pd.DataFrame]]) -> Optional[AlumniSnapshot]:
+        """
+        Return the snapshot for source_key, building it if the source changed.
+
+        Returns None (and caches nothing) if build() returns None.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.source_key == source_key:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.source_key == source_key:
+                return snapshot
+
+            df = build()
+            if df is None:
+                return None
+
+            self._generation += 1
+            self._snapshot = AlumniSnapshot(df, source_key, self._generation)
+            print(f"✓ Loaded alumni snapshot generation {self._generation} ({len(df)} rows)")
+            return self._snapshot
+
+    def invalidate(self):
+        """Drop the current snapshot so the next get() rebuilds it"""
+        with self._lock:
+            self._snapshot = None
+
+
+def file_source_key(path: str) -> Optional[tuple]:
+    """Build a cache key from a file's path, mtime and size (None if missing)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return ('file', os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+# Shared by every request handler in the process
+alumni_snapshots = SnapshotCache()
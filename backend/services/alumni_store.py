@@ -0,0 +1,160 @@
+"""
+Alumni Snapshot Store
+Compiles the alumni CSV into a binary snapshot so loaders skip CSV parsing
+"""
+import os
+import pickle
+import tempfile
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from services.alumni_columns import process_linkedin_csv
+from services.alumni_ids import assign_alumni_ids, load_id_mapping, resolve_alumni_ids
+
+# Bump whenever the compiled frame changes (process_linkedin_csv output, row
+# labels, the alumni id keys) so stale snapshots are rebuilt instead of loaded
+SNAPSHOT_VERSION = 3
+
+SNAPSHOT_SUFFIX = '.snapshot.pkl'
+
+# Long free-text export columns that nothing in the backend or scripts reads
+UNUSED_COLUMNS = (
+    'linkedinDescription',
+    'linkedinPreviousJobDescription',
+    'linkedinSchoolDescription',
+    'linkedinPreviousSchoolDescription',
+    'mutualConnectionsUrl',
+    'connectionsUrl',
+)
+
+
+def snapshot_path(csv_path: str) -> str:
+    """Snapshot file stored next to the CSV it was compiled from"""
+    return os.path.splitext(csv_path)[0] + SNAPSHOT_SUFFIX
+
+
+def _source_stat(csv_path: str) -> tuple:
+    stat = os.stat(csv_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def normalize_alumni_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Derive the normalized columns for a raw LinkedIn export and drop unused text"""
+    if "Name" in df.columns:
+        process_linkedin_csv(df)
+    return df.drop(columns=[c for c in UNUSED_COLUMNS if c in df.columns])
+
+
+def import_alumni_csv(csv_path: str, id_client=None) -> Tuple[pd.DataFrame, Optional[Dict]]:
+    """
+    Parse and normalize the CSV, labelling each row with its stable alumni
+    id (see services.alumni_ids) instead of its position, so df.loc[id]
+    finds the same person across exports. Returns (df, the id mapping used).
+
+    With id_client (the compile step's service-role client) new rows are
+    recorded in the shared mapping. Without one nothing talks to Supabase:
+    ids come from the mapping saved in the last snapshot, or the seed file,
+    and rows neither knows get provisional ids until the next compile.
+    """
+    df = normalize_alumni_frame(pd.read_csv(csv_path))
+    if id_client is not None:
+        df.index, mapping = assign_alumni_ids(df, id_client)
+        return df, mapping
+
+    mapping = stored_id_mapping(csv_path)
+    if mapping is None:
+        mapping = load_id_mapping()
+    if mapping is None:
+        print("Warning: no alumni id mapping found; rows are labelled by position "
+              "until scripts/compile_alumni_snapshot.py is run")
+    df.index, mapping, unknown = resolve_alumni_ids(df, mapping)
+    if unknown:
+        print(f"Warning: {unknown} alumni rows have provisional ids "
+              "until scripts/compile_alumni_snapshot.py is run")
+    return df, mapping
+
+
+def compile_alumni_snapshot(csv_path: str, df: Optional[pd.DataFrame] = None,
+                            source: Optional[tuple] = None,
+                            id_mapping: Optional[Dict] = None, id_client=None) -> str:
+    """
+    Write the snapshot for csv_path and return its path.
+
+    df is the already-normalized frame (and source the CSV stat taken before
+    it was read, id_mapping the mapping its ids came from), if the caller
+    has one; otherwise the CSV is imported with id_client. The file is
+    written to a temp file and renamed into place, so concurrent workers
+    never read a partial one.
+    """
+    if df is None or source is None:
+        source = _source_stat(csv_path)
+    if df is None:
+        df, id_mapping = import_alumni_csv(csv_path, id_client)
+
+    path = snapshot_path(csv_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'version': SNAPSHOT_VERSION, 'source': source, 'df': df,
+                         'id_mapping': id_mapping},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def _load_snapshot(csv_path: str) -> Optional[dict]:
+    path = snapshot_path(csv_path)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"Ignoring unreadable alumni snapshot {path}: {e}")
+        return None
+
+
+def read_alumni_snapshot(csv_path: str) -> Optional[pd.DataFrame]:
+    """Return the compiled frame for csv_path, or None if missing or stale"""
+    snapshot = _load_snapshot(csv_path)
+    if not isinstance(snapshot, dict):
+        return None
+    if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('source') != _source_stat(csv_path):
+        return None
+    return snapshot.get('df')
+
+
+def stored_id_mapping(csv_path: str) -> Optional[Dict]:
+    """The alumni id mapping saved with csv_path's last snapshot, even a stale one"""
+    snapshot = _load_snapshot(csv_path)
+    if not isinstance(snapshot, dict):
+        return None
+    return snapshot.get('id_mapping')
+
+
+def load_alumni_frame(csv_path: str, compile_missing: bool = True) -> pd.DataFrame:
+    """
+    Load the normalized alumni frame for csv_path.
+
+    Uses the compiled snapshot when it matches the CSV; otherwise parses the
+    CSV and (if compile_missing) writes a fresh snapshot for the next load.
+    Row labels are stable alumni ids either way.
+    """
+    df = read_alumni_snapshot(csv_path)
+    if df is not None:
+        return df
+
+    source = _source_stat(csv_path)
+    df, id_mapping = import_alumni_csv(csv_path)
+    if compile_missing:
+        try:
+            compile_alumni_snapshot(csv_path, df, source, id_mapping)
+        except Exception as e:
+            print(f"Could not write alumni snapshot: {e}")
+    return df
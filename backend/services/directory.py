@@ -0,0 +1,442 @@
+"""
+Alumni Directory Service
+Materialized view of the merged alumni directory (CSV rows + user profiles)
+"""
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from services.directory_index import DirectoryIndex
+
+
+def clean_nan_values(data):
+    """Recursively replace NaN values with None in data structures."""
+    if isinstance(data, list):
+        return [clean_nan_values(item) for item in data]
+    elif isinstance(data, dict):
+        return {key: clean_nan_values(value) for key, value in data.items()}
+    elif isinstance(data, float):
+        if math.isnan(data):
+            return None
+        return data
+    elif pd.isna(data):
+        return None
+    else:
+        return data
+
+
+def build_csv_record(idx, csv_row) -> Dict:
+    """Build a directory card from a CSV row with normalized field names"""
+    # Only use Supabase-cached profile images, not raw LinkedIn URLs (which expire)
+    company_val = csv_row.get('company_name', csv_row.get('company', ''))
+    cached_image = csv_row.get('profile_image_url', '')  # This is the Supabase URL
+    return {
+        'id': f'csv_{idx}',  # Unique ID for frontend key
+        'name': csv_row.get('name', csv_row.get('Name', '')),
+        'role_title': csv_row.get('role_title', ''),
+        'roles_list': csv_row.get('roles_list', []),
+        'headline': csv_row.get('headline', csv_row.get('linkedinHeadline', '')),
+        'company': company_val,
+        'company_name': company_val,
+        'companies_list': csv_row.get('companies_list', []),
+        'company_industry': csv_row.get('company_industry', csv_row.get('companyIndustry', '')),
+        'major': csv_row.get('major', csv_row.get('Major', '')),
+        'grad_year': str(csv_row.get('grad_year', csv_row.get('Grad Yr', ''))),
+        'location': csv_row.get('location', ''),
+        'profile_image': cached_image,
+        'profile_image_url': cached_image,
+        'linkedin_url': csv_row.get('linkedin_url', csv_row.get('linkedin', csv_row.get('Linkedin', ''))),
+        'linkedin': csv_row.get('linkedin', csv_row.get('Linkedin', '')),
+        'email': csv_row.get('email', csv_row.get('Personal Gmail', '')),
+        'linkedinProfileImageUrl': '',  # Don't expose raw LinkedIn URLs (they expire)
+        'linkedin_image_url': '',  # Use Supabase instead
+        'is_linked': False,
+        'source': 'csv'
+    }
+
+
+def build_linked_record(idx, csv_row, profile: Dict) -> Dict:
+    """Build a directory card for a CSV row, using the linked user profile's data"""
+    company_val = ', '.join(profile.get('companies', [])) if profile.get('companies') else csv_row.get('company_name', csv_row.get('company', ''))
+
+    # Get profile image - prefer user's profile, fall back to CSV's cached Supabase URL
+    # csv_row['profile_image_url'] is the Supabase URL (set by load_alumni_data)
+    cached_csv_image = csv_row.get('profile_image_url', '')  # Supabase URL
+    profile_img = profile.get('profile_image_url') or cached_csv_image
+
+    return {
+        'id': f'csv_{idx}',  # Unique ID for frontend key
+        'name': profile.get('full_name', csv_row.get('name')),
+        'role_title': ', '.join(profile.get('roles', [])) if profile.get('roles') else csv_row.get('role_title'),
+        'roles_list': profile.get('roles', []) if profile.get('roles') else csv_row.get('roles_list', []),
+        'headline': profile.get('current_title') or csv_row.get('headline'),
+        'company': company_val,
+        'company_name': company_val,
+        'companies_list': profile.get('companies', []) if profile.get('companies') else csv_row.get('companies_list', []),
+        'company_industry': csv_row.get('company_industry'),
+        'major': profile.get('major', csv_row.get('major')),
+        'grad_year': str(profile.get('graduation_year', csv_row.get('grad_year', ''))),
+        'location': profile.get('location', csv_row.get('location')),
+        'profile_image': profile_img,
+        'profile_image_url': profile_img,
+        'linkedin_url': profile.get('linkedin_url', csv_row.get('linkedin_url')),
+        'linkedin': profile.get('linkedin_url', csv_row.get('linkedin_url')),
+        'email': profile.get('personal_email', csv_row.get('email')),
+        'linkedinProfileImageUrl': '',  # Don't expose raw LinkedIn URLs
+        'linkedin_image_url': '',  # Use Supabase instead
+        'is_linked': True,
+        'source': 'user_profile'
+    }
+
+
+def build_new_user_record(profile: Dict) -> Dict:
+    """Build a directory card for a user who is not in the CSV"""
+    company_val = ', '.join(profile.get('companies', [])) if profile.get('companies') else ''
+    return {
+        'id': f"user_{profile.get('user_id', profile.get('id', ''))}",  # Unique ID for frontend key
+        'name': profile.get('full_name', ''),
+        'role_title': ', '.join(profile.get('roles', [])) if profile.get('roles') else '',
+        'roles_list': profile.get('roles', []) if profile.get('roles') else [],  # Add roles list
+        'headline': profile.get('current_title', ''),
+        'company': company_val,  # Add 'company' field for frontend compatibility
+        'company_name': company_val,
+        'companies_list': profile.get('companies', []),
+        'company_industry': '',  # New users don't have this yet
+        'major': profile.get('major', ''),
+        'grad_year': str(profile.get('graduation_year', '')),
+        'location': profile.get('location', ''),
+        'profile_image': profile.get('profile_image_url', ''),
+        'profile_image_url': profile.get('profile_image_url', ''),
+        'linkedin_url': profile.get('linkedin_url', ''),
+        'linkedin': profile.get('linkedin_url', ''),
+        'email': profile.get('personal_email', ''),
+        'linkedinProfileImageUrl': '',
+        'linkedin_image_url': '',
+        'is_linked': False,
+        'source': 'new_user'
+    }
+
+
+def _grad_year_sort_key(record: Dict) -> int:
+    try:
+        return int(float(record.get('grad_year') or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+# Sort orders supported by /api/alumni (same rules as the directory page)
+SORT_KEYS = {
+    'name': lambda record: str(record.get('name') or '').lower(),
+    'company': lambda record: str(record.get('company') or '').lower(),
+    'grad_year': _grad_year_sort_key,
+}
+
+
+def _profile_user_id(profile: Dict) -> str:
+    return str(profile.get('user_id', profile.get('id', '')))
+
+
+def _linked_csv_id(profile: Dict):
+    if profile.get('is_csv_linked') and profile.get('csv_source_id') is not None:
+        return profile['csv_source_id']
+    return None
+
+
+class DirectoryEntry:
+    """A directory card plus its pre-encoded JSON form"""
+
+    __slots__ = ('record', 'encoded')
+
+    def __init__(self, record: Dict):
+        self.record = clean_nan_values(record)
+        self.encoded = json.dumps(self.record)
+
+    def encode(self, fields: Optional[List[str]] = None) -> str:
+        """JSON for the card, optionally limited to the given fields (id is always kept)"""
+        if not fields:
+            return self.encoded
+        return json.dumps({
+            field: self.record[field]
+            for field in ['id'] + [f for f in fields if f != 'id']
+            if field in self.record
+        })
+
+
+def build_csv_entries(snapshot) -> Dict:
+    """
+    Cards for every CSV row as it appears when unlinked, keyed by CSV index.
+
+    Built once per snapshot (see AlumniSnapshot.derived) and shared by every
+    DirectoryView of that snapshot; entries are never modified after this.
+    """
+    return {idx: DirectoryEntry(build_csv_record(idx, csv_row)) for idx, csv_row in snapshot.df.iterrows()}
+
+
+class DirectoryView:
+    """
+    The merged directory for one alumni snapshot, kept ready to serve.
+
+    Cards are built once from the CSV, the linked profiles and the new-user
+    profiles, and indexed for filtering. Profile changes made through the API
+    are applied in place with apply_profile() / remove_user() instead of
+    rebuilding everything.
+    """
+
+    def __init__(self, snapshot, user_profiles: Iterable[Dict], deleted_csv_ids: Iterable[int]):
+        self.generation = snapshot.generation
+        self.built_at = time.time()
+        self._df = snapshot.df
+        self._csv_entries = snapshot.derived('directory_csv_entries', build_csv_entries)
+        self._deleted: Set = set(deleted_csv_ids)
+        self._entries: Dict[str, DirectoryEntry] = {}
+        # Doc ids follow directory order; a replaced card keeps its id
+        self._doc_ids: Dict[str, int] = {}
+        self._docs: Dict[int, DirectoryEntry] = {}
+        self._next_doc_id = 0
+        self.index = DirectoryIndex()
+        self._linked_profiles: Dict = {}  # csv index -> linked profile
+        self._user_links: Dict[str, object] = {}  # user_id -> csv index
+        self._ordered: Optional[List[DirectoryEntry]] = None
+        self._ranks: Dict[str, Dict[str, int]] = {}  # sort key -> card id -> value rank
+        self._lock = threading.RLock()
+
+        # Create a mapping of csv_source_id -> user_profile
+        new_user_profiles = []
+        for profile in user_profiles:
+            csv_id = _linked_csv_id(profile)
+            if csv_id is not None:
+                # This profile is linked to a CSV record
+                self._linked_profiles[csv_id] = profile
+                self._user_links[_profile_user_id(profile)] = csv_id
+            elif profile.get('onboarding_completed'):
+                # This is a new user not in CSV
+                new_user_profiles.append(profile)
+
+        # Merge CSV data with linked profiles, skipping deleted alumni entries
+        for idx in self._csv_entries:
+            if idx in self._deleted:
+                continue
+            self._put_csv_entry(idx)
+
+        # Add new user profiles (not in CSV)
+        for profile in new_user_profiles:
+            self._set_entry(build_new_user_record(profile))
+
+    def entries(self) -> List[DirectoryEntry]:
+        """All cards in directory order (CSV rows first, then new users)"""
+        ordered = self._ordered
+        if ordered is None:
+            with self._lock:
+                if self._ordered is None:
+                    self._ordered = list(self._entries.values())
+                ordered = self._ordered
+        return ordered
+
+    def _sort(self, entries: List[DirectoryEntry], sort: str, descending: bool) -> List[DirectoryEntry]:
+        """
+        Order entries (given in directory order) by one of SORT_KEYS. Ties keep
+        directory order, so the result is stable and safe to page through.
+        """
+        # Dense ranks (equal values share a rank), computed once per version of the view
+        ranks = self._ranks.get(sort)
+        if ranks is None:
+            key = SORT_KEYS[sort]
+            values = sorted({key(entry.record) for entry in self.entries()})
+            value_ranks = {value: rank for rank, value in enumerate(values)}
+            ranks = {entry.record['id']: value_ranks[key(entry.record)] for entry in self.entries()}
+            self._ranks[sort] = ranks
+
+        sign = -1 if descending else 1
+        return sorted(entries, key=lambda entry: sign * ranks[entry.record['id']])
+
+    def search(self, sort: Optional[str] = None, descending: bool = False, **filters) -> List[DirectoryEntry]:
+        """
+        Cards matching the given DirectoryIndex.search() filters, in directory
+        order or ordered by one of SORT_KEYS.
+        """
+        with self._lock:
+            doc_ids = self.index.search(**filters)
+            if doc_ids is None:
+                entries = self.entries()
+            else:
+                entries = [self._docs[doc_id] for doc_id in sorted(doc_ids)]
+
+            if sort:
+                entries = self._sort(entries, sort, descending)
+            return entries
+
+    def facet_counts(self, **filters) -> Dict[str, Dict[str, int]]:
+        """
+        Value counts for every facet, conditioned on the active filters.
+
+        Each facet ignores its own filter (drill-down style), so the counts show
+        what selecting a different value of that facet would return.
+        """
+        counts = {}
+        with self._lock:
+            for facet in self.index.FACETS:
+                doc_ids = self.index.search(**{**filters, facet: ''})
+                counts[facet] = self.index.facet_counts(facet, doc_ids)
+        return counts
+
+    def _set_entry(self, record: Dict):
+        self._put_entry(DirectoryEntry(record))
+
+    def _put_entry(self, entry: DirectoryEntry):
+        key = entry.record['id']
+        doc_id = self._doc_ids.get(key)
+        if doc_id is None:
+            doc_id = self._next_doc_id
+            self._next_doc_id += 1
+            self._doc_ids[key] = doc_id
+        else:
+            self.index.remove(doc_id, self._docs[doc_id].record)
+
+        self._entries[key] = entry
+        self._docs[doc_id] = entry
+        self.index.add(doc_id, entry.record)
+
+    def _drop_entry(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        doc_id = self._doc_ids.pop(key)
+        del self._docs[doc_id]
+        self.index.remove(doc_id, entry.record)
+
+    def _put_csv_entry(self, idx):
+        profile = self._linked_profiles.get(idx)
+        if profile is not None:
+            self._set_entry(build_linked_record(idx, self._df.loc[idx], profile))
+        else:
+            self._put_entry(self._csv_entries[idx])
+
+    def _unlink_user(self, user_id: str):
+        csv_id = self._user_links.pop(user_id, None)
+        if csv_id is None:
+            return
+        if _profile_user_id(self._linked_profiles.get(csv_id, {})) == user_id:
+            del self._linked_profiles[csv_id]
+            if csv_id in self._csv_entries and csv_id not in self._deleted:
+                self._put_csv_entry(csv_id)
+
+    def apply_profile(self, profile: Dict):
+        """Update the cards affected by a created, edited or linked profile"""
+        user_id = _profile_user_id(profile)
+        csv_id = _linked_csv_id(profile)
+
+        with self._lock:
+            self._drop_entry(f'user_{user_id}')
+            if self._user_links.get(user_id) != csv_id:
+                self._unlink_user(user_id)
+
+            if csv_id is not None:
+                self._linked_profiles[csv_id] = profile
+                self._user_links[user_id] = csv_id
+                if csv_id in self._csv_entries and csv_id not in self._deleted:
+                    self._put_csv_entry(csv_id)
+            elif profile.get('onboarding_completed'):
+                self._set_entry(build_new_user_record(profile))
+
+            self._ordered = None
+            self._ranks = {}
+
+    def remove_user(self, user_id: str, csv_source_id=None):
+        """Drop a deleted user's card; a linked CSV card is marked deleted too"""
+        user_id = str(user_id)
+        with self._lock:
+            self._drop_entry(f'user_{user_id}')
+            self._unlink_user(user_id)
+            if csv_source_id is not None:
+                self._deleted.add(csv_source_id)
+                self._drop_entry(f'csv_{csv_source_id}')
+            self._ordered = None
+            self._ranks = {}
+
+
+class DirectoryCache:
+    """
+    Process-wide holder for the current DirectoryView.
+
+    The view is rebuilt when the alumni snapshot changes, when another
+    process records a write by replacing the marker file at marker_path
+    (checked with one stat per request), and after max_age seconds as a
+    backstop for writers that can't reach the marker (other hosts).
+    """
+
+    def __init__(self, max_age: float, marker_path: Optional[str] = None):
+        self.max_age = max_age
+        self.marker_path = marker_path or None
+        self._view: Optional[DirectoryView] = None
+        self._view_marker = None
+        self._lock = threading.Lock()
+
+    def _marker(self):
+        if not self.marker_path:
+            return None
+        try:
+            stat = os.stat(self.marker_path)
+        except OSError:
+            return None
+        # The file is replaced on every write, so its inode changes even within one mtime tick
+        return (stat.st_ino, stat.st_mtime_ns)
+
+    def _is_fresh(self, view: Optional[DirectoryView], view_marker, marker, snapshot) -> bool:
+        return (view is not None
+                and view.generation == snapshot.generation
+                and view_marker == marker
+                and time.time() - view.built_at < self.max_age)
+
+    def get(self, snapshot, load_sources: Callable[[], Tuple[List[Dict], Set]]) -> DirectoryView:
+        """
+        Return the view for snapshot, building it if needed.
+
+        load_sources() must return (user_profiles, deleted_csv_ids).
+        """
+        marker = self._marker()
+        view, view_marker = self._view, self._view_marker
+        if self._is_fresh(view, view_marker, marker, snapshot):
+            return view
+
+        with self._lock:
+            # Read before loading: a write landing mid-load triggers another rebuild
+            marker = self._marker()
+            view, view_marker = self._view, self._view_marker
+            if not self._is_fresh(view, view_marker, marker, snapshot):
+                user_profiles, deleted_csv_ids = load_sources()
+                view = DirectoryView(snapshot, user_profiles, deleted_csv_ids)
+                self._view, self._view_marker = view, marker
+            return view
+
+    def _mark_changed(self):
+        """Tell every process sharing marker_path that the directory data changed"""
+        if not self.marker_path:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.marker_path) or '.', suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write(str(time.time_ns()))
+            os.replace(tmp_path, self.marker_path)
+        except OSError as e:
+            print(f"Could not update directory marker {self.marker_path}: {e}")
+
+    def apply_profile(self, profile: Optional[Dict]):
+        """Apply a profile change to the current view (no-op if none built)"""
+        view = self._view
+        if view is not None and profile:
+            view.apply_profile(profile)
+        if profile:
+            self._mark_changed()
+
+    def remove_user(self, user_id: str, csv_source_id=None):
+        """Apply a user deletion to the current view (no-op if none built)"""
+        view = self._view
+        if view is not None:
+            view.remove_user(user_id, csv_source_id)
+        self._mark_changed()
@@ -0,0 +1,150 @@
+"""
+Directory Index
+Inverted indexes over directory cards for the /api/alumni filters
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+# Longest n-gram stored for substring search. Shorter queries are answered
+# directly from their own posting list; longer ones intersect their trigrams.
+MAX_GRAM = 3
+
+
+def _grams(text: str) -> Set[str]:
+    """All substrings of text with length 1..MAX_GRAM"""
+    grams = set()
+    for n in range(1, MAX_GRAM + 1):
+        for i in range(len(text) - n + 1):
+            grams.add(text[i:i + n])
+    return grams
+
+
+def _facet_values(record: Dict) -> Dict[str, List[str]]:
+    """Exact-match facet values for a card (company covers the whole history)"""
+    return {
+        'major': [record.get('major')],
+        'grad_year': [record.get('grad_year')],
+        'industry': [record.get('company_industry')],
+        'company': list(record.get('companies_list') or []),
+    }
+
+
+def _text_values(record: Dict) -> Dict[str, List[str]]:
+    """Lowercased fields searched by substring (title matches role or headline)"""
+    return {
+        'name': [(record.get('name') or '').lower()],
+        'title': [(record.get('role_title') or '').lower(), (record.get('headline') or '').lower()],
+    }
+
+
+class DirectoryIndex:
+    """
+    Posting lists for the exact-match facets (major, grad_year, industry,
+    company) and an n-gram index for the name/title substring queries.
+
+    Documents are integer ids; a multi-filter query is an intersection of
+    posting sets, and substring candidates are verified against the text.
+    """
+
+    FACETS = ('major', 'grad_year', 'industry', 'company')
+    TEXT_FIELDS = ('name', 'title')
+
+    def __init__(self):
+        self._facets: Dict[str, Dict[str, Set[int]]] = {f: defaultdict(set) for f in self.FACETS}
+        self._grams: Dict[str, Dict[str, Set[int]]] = {f: defaultdict(set) for f in self.TEXT_FIELDS}
+        self._texts: Dict[str, Dict[int, List[str]]] = {f: {} for f in self.TEXT_FIELDS}
+
+    def add(self, doc_id: int, record: Dict):
+        """Index a card under doc_id"""
+        for facet, values in _facet_values(record).items():
+            for value in values:
+                if value is not None:
+                    self._facets[facet][value].add(doc_id)
+
+        for field, texts in _text_values(record).items():
+            self._texts[field][doc_id] = texts
+            for text in texts:
+                for gram in _grams(text):
+                    self._grams[field][gram].add(doc_id)
+
+    def remove(self, doc_id: int, record: Dict):
+        """Remove a card previously indexed with add(doc_id, record)"""
+        for facet, values in _facet_values(record).items():
+            postings = self._facets[facet]
+            for value in values:
+                if value is not None and value in postings:
+                    postings[value].discard(doc_id)
+                    if not postings[value]:
+                        del postings[value]
+
+        for field, texts in _text_values(record).items():
+            self._texts[field].pop(doc_id, None)
+            postings = self._grams[field]
+            for text in texts:
+                for gram in _grams(text):
+                    if gram in postings:
+                        postings[gram].discard(doc_id)
+                        if not postings[gram]:
+                            del postings[gram]
+
+    def _substring_matches(self, field: str, query: str) -> Set[int]:
+        postings = self._grams[field]
+        if len(query) <= MAX_GRAM:
+            # Every n-gram up to MAX_GRAM is indexed, so this is exact
+            return set(postings.get(query, ()))
+
+        trigram_sets = sorted(
+            (postings.get(query[i:i + MAX_GRAM], set()) for i in range(len(query) - MAX_GRAM + 1)),
+            key=len
+        )
+        candidates = set(trigram_sets[0])
+        for posting in trigram_sets[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+
+        texts = self._texts[field]
+        return {doc for doc in candidates if any(query in text for text in texts[doc])}
+
+    def search(self, name: str = '', title: str = '', major: str = '', grad_year: str = '',
+               company: str = '', industry: str = '') -> Optional[Set[int]]:
+        """
+        Return the doc ids matching every non-empty filter.
+
+        name/title are case-insensitive substring matches; the others are exact.
+        Returns None when no filter is set (i.e. every document matches).
+        """
+        sets: List[Set[int]] = []
+        for facet, value in (('major', major), ('grad_year', grad_year),
+                             ('company', company), ('industry', industry)):
+            if value:
+                sets.append(self._facets[facet].get(value, set()))
+
+        if not sets and not name and not title:
+            return None
+
+        # Cheap exact-match postings first, then verify substring candidates
+        sets.sort(key=len)
+        result: Optional[Set[int]] = None
+        for posting in sets:
+            result = set(posting) if result is None else result & posting
+            if not result:
+                return set()
+
+        for field, query in (('name', name), ('title', title)):
+            if query:
+                matches = self._substring_matches(field, query.lower())
+                result = matches if result is None else result & matches
+                if not result:
+                    return set()
+
+        return result
+
+    def facet_counts(self, facet: str, doc_ids: Optional[Set[int]] = None) -> Dict[str, int]:
+        """Number of documents per value of facet, optionally within doc_ids"""
+        counts = {}
+        for value, posting in self._facets[facet].items():
+            count = len(posting) if doc_ids is None else len(posting & doc_ids)
+            if count:
+                counts[value] = count
+        return counts
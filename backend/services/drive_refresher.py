@@ -0,0 +1,213 @@
+"""
+Google Drive CSV Refresher
+Keeps a local copy of the alumni CSV in sync with Google Drive in the background
+"""
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the single-process dev server runs there
+    fcntl = None
+
+# Bytes per chunk when streaming the download to disk
+CHUNK_SIZE = 64 * 1024
+
+
+def validate_alumni_csv(path: str) -> bool:
+    """A usable alumni export parses as CSV, has a name column and some rows"""
+    try:
+        df = pd.read_csv(path)
+    except Exception as e:
+        print(f"Downloaded alumni CSV failed to parse: {e}")
+        return False
+    if not ({'Name', 'name'} & set(df.columns)) or df.empty:
+        print("Downloaded alumni CSV has no name column or no rows")
+        return False
+    return True
+
+
+class DriveCsvRefresher:
+    """
+    Polls a Google Drive download URL and mirrors it to dest_path.
+
+    Each poll is a conditional GET (If-None-Match / If-Modified-Since), so an
+    unchanged file costs a 304 and no body. A changed file is streamed to a
+    temp file, validated, then renamed over dest_path in one step; readers
+    only ever see the previous good copy or the new one. The validators are
+    kept in a small JSON file next to the copy so restarts stay conditional.
+
+    Processes sharing dest_path cooperate through lock files: every worker
+    runs a poll thread, but only the one holding the poller lock polls (the
+    first worker to reach a poll; another takes over if it exits), and
+    downloads are serialized so the copy and its validators are written by
+    one process at a time. The others pick up a new copy by its changed
+    mtime. The gunicorn master never polls: it only fetches a missing copy
+    while warming caches.
+    """
+
+    def __init__(self, url: str, dest_path: str, interval: float,
+                 validate: Callable[[str], bool] = validate_alumni_csv,
+                 on_update: Optional[Callable[[], None]] = None,
+                 timeout: float = 30):
+        self.url = url
+        self.dest_path = dest_path
+        self.interval = interval
+        self.validate = validate
+        self.on_update = on_update
+        self.timeout = timeout
+        self._meta_path = dest_path + '.meta.json'
+        self._lock_path = dest_path + '.lock'
+        self._poller_lock_path = dest_path + '.poller.lock'
+        self._poller_lock = None
+        self._poller_lock_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._bootstrapped = False
+
+    def _read_validators(self) -> Dict:
+        if not os.path.exists(self.dest_path):
+            return {}
+        try:
+            with open(self._meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_validators(self, validators: Dict):
+        try:
+            with open(self._meta_path, 'w') as f:
+                json.dump(validators, f)
+        except OSError as e:
+            print(f"Could not save Drive CSV validators: {e}")
+
+    @contextmanager
+    def _download_lock(self):
+        """Hold the threads of this process and other processes off the copy"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self._lock_path, 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _is_poller(self) -> bool:
+        """Take (or keep) the poller lock without waiting; True if this process holds it"""
+        if fcntl is None:
+            return True
+        # A lock inherited across fork belongs to the parent, not this process
+        if self._poller_lock is not None and self._poller_lock_pid == os.getpid():
+            return True
+        lock = open(self._poller_lock_path, 'a')
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return False
+        self._poller_lock, self._poller_lock_pid = lock, os.getpid()
+        return True
+
+    def refresh_once(self, if_missing: bool = False) -> bool:
+        """
+        Fetch the file if it changed (if_missing: only if there is no copy
+        yet). Returns True if a new copy was installed.
+        """
+        with self._download_lock():
+            if if_missing and os.path.exists(self.dest_path):
+                return False
+            validators = self._read_validators()
+            headers = {}
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+            tmp_path = None
+            try:
+                with requests.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+                    if response.status_code == 304:
+                        return False
+                    response.raise_for_status()
+
+                    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.dest_path) or '.', suffix='.tmp')
+                    with os.fdopen(fd, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            f.write(chunk)
+
+                    new_validators = {
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                    }
+
+                if not self.validate(tmp_path):
+                    return False
+
+                os.replace(tmp_path, self.dest_path)
+                tmp_path = None
+                self._write_validators(new_validators)
+                print(f"✓ Refreshed alumni CSV from Google Drive ({os.path.getsize(self.dest_path)} bytes)")
+            except Exception as e:
+                print(f"Failed to refresh alumni CSV from Google Drive: {e}")
+                return False
+            finally:
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        if self.on_update:
+            try:
+                self.on_update()
+            except Exception as e:
+                print(f"Failed to load refreshed alumni CSV: {e}")
+        return True
+
+    def ensure_local_copy(self):
+        """
+        Fetch the file in the calling thread if there is no local copy yet.
+
+        Only tried once per process, so a Drive outage at startup can't make
+        every request wait on it.
+        """
+        if self._bootstrapped or os.path.exists(self.dest_path):
+            return
+        self._bootstrapped = True
+        # Another worker may be fetching it already; wait for it rather than fetch again
+        self.refresh_once(if_missing=True)
+
+    def _run(self):
+        # Every process runs this loop, but only the poller lock holder polls;
+        # the others keep trying so one of them takes over if it exits
+        while not self._stop.wait(self.interval):
+            if self._is_poller():
+                self.refresh_once()
+
+    def start(self):
+        """Start polling in a daemon thread (once per process, safe after fork)"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._start_lock:
+            # Threads don't survive fork, so a forked worker starts its own
+            if self._pid != pid:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, name='drive-csv-refresher', daemon=True)
+                self._thread.start()
+                self._pid = pid
+
+    def stop(self):
+        """Stop the polling thread"""
+        self._stop.set()
@@ -0,0 +1,118 @@
+"""
+Embedding Cache
+Content-addressed cache for embedding API results (in-memory LRU + optional SQLite)
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from contextlib import closing
+from typing import Callable, List, Optional, Tuple
+
+from config import EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_DB
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Embeddings keyed by (model, task_type, sha256(text)).
+
+    The same text always embeds to the same vector, so entries never expire;
+    changing the text (or model, or task type) simply misses. Lookups try a
+    per-process LRU first, then the SQLite file at db_path (if any), which is
+    shared by every worker and survives restarts. SQLite errors are logged
+    and treated as misses, so the cache can never fail an embedding call.
+    """
+
+    def __init__(self, max_entries: int, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.db_path = db_path or None
+        self._memory: 'OrderedDict[Tuple[str, str, str], Tuple[float, ...]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call: cheap, and safe across threads and forked workers
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        if not self._schema_ready:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    task_type TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (model, task_type, text_hash)
+                )
+            ''')
+            self._schema_ready = True
+        return conn
+
+    def _remember(self, key: Tuple[str, str, str], vector: Tuple[float, ...]):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, model: str, task_type: str, text: str) -> Optional[List[float]]:
+        """Cached embedding for text, or None"""
+        key = (model, task_type, _text_hash(text))
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                return list(vector)
+
+        if not self.db_path:
+            return None
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    'SELECT embedding FROM embeddings WHERE model = ? AND task_type = ? AND text_hash = ?',
+                    key
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Embedding cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+
+        vector = tuple(array('d', row[0]))
+        self._remember(key, vector)
+        return list(vector)
+
+    def put(self, model: str, task_type: str, text: str, embedding: List[float]):
+        """Store the embedding for text in both tiers"""
+        key = (model, task_type, _text_hash(text))
+        vector = tuple(float(x) for x in embedding)
+        self._remember(key, vector)
+
+        if not self.db_path:
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)',
+                    key + (array('d', vector).tobytes(), time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"Embedding cache write failed: {e}")
+
+    def embed(self, model: str, task_type: str, text: str,
+              compute: Callable[[], List[float]]) -> List[float]:
+        """Cached embedding for text, calling compute() (the embedding API) on a miss"""
+        embedding = self.get(model, task_type, text)
+        if embedding is None:
+            embedding = compute()
+            self.put(model, task_type, text, embedding)
+        return embedding
+
+
+# Shared by every caller in this process
+embedding_cache = EmbeddingCache(EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_DB)
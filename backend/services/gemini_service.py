@@ -7,21 +7,7 @@ import os
 import json
 import time
 from typing import Dict, List, Optional
-import google.generativeai as genai
-from config import GEMINI_API_KEY, GEMINI_MODEL, EMBEDDING_MODEL
-
-# Initialize Gemini
-genai.configure(api_key=GEMINI_API_KEY)
-
-def get_chat_model():
-    """Get the chat model with current config"""
-    from config import GEMINI_MODEL
-    return genai.GenerativeModel(GEMINI_MODEL)
-
-def get_embedding_model():
-    """Get the embedding model name"""
-    from config import EMBEDDING_MODEL
-    return EMBEDDING_MODEL
+from services.llm_client import llm_client
 
 
 class GeminiService:
@@ -106,11 +92,8 @@ Important:
 """
 
         try:
-            chat_model = get_chat_model()
-            response = chat_model.generate_content(prompt)
-
             # Extract JSON from response
-            response_text = response.text.strip()
+            response_text = llm_client.generate(prompt).strip()
 
             # Remove markdown code blocks if present
             if response_text.startswith('```json'):
@@ -150,26 +133,23 @@ Important:
             raise
 
     @staticmethod
-    def generate_embedding(text: str) -> List[float]:
+    def generate_embedding(text: str, task_type: str = "retrieval_document") -> List[float]:
         """
         Generate embedding vector for text using Gemini Embedding API
 
+        Results are cached by (model, task_type, text), so unchanged text
+        never calls the API twice.
+
         Args:
             text: Text to embed (profile + resume combined)
+            task_type: "retrieval_document" for stored profiles, "retrieval_query" for searches
 
         Returns:
             List of 768 floats representing the embedding vector
         """
 
         try:
-            embedding_model = get_embedding_model()
-            result = genai.embed_content(
-                model=embedding_model,
-                content=text,
-                task_type="retrieval_document"
-            )
-
-            return result['embedding']
+            return llm_client.embed(text, task_type)
 
         except Exception as e:
             print(f"Error generating embedding: {e}")
@@ -284,9 +264,7 @@ Do not include greetings like "Dear" or "Hi" - just the body text. Do not includ
 """
 
         try:
-            chat_model = get_chat_model()
-            response = chat_model.generate_content(prompt)
-            response_text = response.text.strip()
+            response_text = llm_client.generate(prompt).strip()
 
             # Clean up response
             if response_text.startswith('```json'):
@@ -362,9 +340,7 @@ Guidelines:
         full_prompt = '\n\n'.join(messages) + '\n\nAssistant:'
 
         try:
-            chat_model = get_chat_model()
-            response = chat_model.generate_content(full_prompt)
-            return response.text.strip()
+            return llm_client.generate(full_prompt).strip()
 
         except Exception as e:
             print(f"Error generating chat response: {e}")
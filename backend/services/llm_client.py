@@ -0,0 +1,198 @@
+"""
+LLM Client
+Shared, long-lived entry point for Gemini generation and embedding calls
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import google.generativeai as genai
+
+from config import (
+    GEMINI_API_KEY, GEMINI_MODEL, EMBEDDING_MODEL,
+    LLM_RESPONSE_CACHE_TTL, LLM_RESPONSE_CACHE_SIZE,
+    LLM_GENERATE_TIMEOUT, LLM_EMBED_TIMEOUT,
+)
+from services.embedding_cache import EmbeddingCache, embedding_cache
+from services.response_cache import ResponseCache, response_key
+
+# Most texts the embedding API accepts in one batch request
+EMBED_BATCH_LIMIT = 100
+
+# Configured once per process: configure() replaces the SDK's clients (and
+# their connections), so it must not run per request
+genai.configure(api_key=GEMINI_API_KEY)
+
+
+class LLMClient:
+    """
+    Text generation and embeddings for every AI feature.
+
+    Model objects are created once per generation config and reused, so
+    calls share the SDK's connections. Every call has a timeout (seconds)
+    and is counted in metrics().
+
+    generate() and generate_stream() return the cached text for a repeated
+    (model, prompt, generation config); use_cache=False (a "regenerate" request) always
+    calls the API, and its result replaces the cached one. Embeddings go
+    through the shared EmbeddingCache.
+    """
+
+    def __init__(self, model: str, embedding_model: str, responses: ResponseCache,
+                 embeddings: EmbeddingCache, generate_timeout: float, embed_timeout: float):
+        self.model = model
+        self.embedding_model = embedding_model
+        self.responses = responses
+        self.embeddings = embeddings
+        self.generate_timeout = generate_timeout
+        self.embed_timeout = embed_timeout
+        self._models: Dict[str, 'genai.GenerativeModel'] = {}
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    def _generative_model(self, generation_config: Optional[Dict]) -> 'genai.GenerativeModel':
+        config_key = json.dumps(generation_config or {}, sort_keys=True, default=str)
+        model = self._models.get(config_key)
+        if model is None:
+            with self._lock:
+                model = self._models.get(config_key)
+                if model is None:
+                    model = genai.GenerativeModel(self.model, generation_config=generation_config)
+                    self._models[config_key] = model
+        return model
+
+    def _count(self, operation: str, field: str, amount: float = 1):
+        with self._lock:
+            stats = self._metrics.setdefault(
+                operation, {'calls': 0, 'errors': 0, 'cache_hits': 0, 'seconds': 0.0, 'max_seconds': 0.0}
+            )
+            stats[field] = stats.get(field, 0) + amount
+            if field == 'seconds':
+                stats['max_seconds'] = max(stats['max_seconds'], amount)
+
+    @contextmanager
+    def _timed(self, operation: str):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self._count(operation, 'errors')
+            raise
+        finally:
+            self._count(operation, 'calls')
+            self._count(operation, 'seconds', time.perf_counter() - start)
+
+    def generate(self, prompt: str, generation_config: Optional[Dict] = None,
+                 use_cache: bool = True, timeout: Optional[float] = None) -> str:
+        """Response text for prompt"""
+        key = response_key(self.model, prompt, generation_config)
+        if use_cache:
+            cached = self.responses.get(key)
+            if cached is not None:
+                self._count('generate', 'cache_hits')
+                return cached
+
+        model = self._generative_model(generation_config)
+        with self._timed('generate'):
+            text = model.generate_content(
+                prompt, request_options={'timeout': timeout or self.generate_timeout}
+            ).text
+        self.responses.put(key, text)
+        return text
+
+    def generate_stream(self, prompt: str, generation_config: Optional[Dict] = None,
+                        use_cache: bool = True, timeout: Optional[float] = None) -> Iterator[str]:
+        """Response text for prompt in chunks as they are generated (a cached response is one chunk)"""
+        key = response_key(self.model, prompt, generation_config)
+        if use_cache:
+            cached = self.responses.get(key)
+            if cached is not None:
+                self._count('generate_stream', 'cache_hits')
+                yield cached
+                return
+
+        model = self._generative_model(generation_config)
+        chunks = []
+        with self._timed('generate_stream'):
+            start = time.perf_counter()
+            response = model.generate_content(
+                prompt, stream=True, request_options={'timeout': timeout or self.generate_timeout}
+            )
+            for chunk in response:
+                text = chunk.text
+                if not text:
+                    continue
+                if not chunks:
+                    self._count('generate_stream', 'first_chunk_seconds', time.perf_counter() - start)
+                chunks.append(text)
+                yield text
+        self.responses.put(key, ''.join(chunks))
+
+    def _embed_uncached(self, content, task_type: str, timeout: Optional[float]):
+        operation = 'embed_batch' if isinstance(content, list) else 'embed'
+        with self._timed(operation):
+            return genai.embed_content(
+                model=self.embedding_model,
+                content=content,
+                task_type=task_type,
+                request_options={'timeout': timeout or self.embed_timeout}
+            )['embedding']
+
+    def embed(self, text: str, task_type: str = 'retrieval_document',
+              use_cache: bool = True, timeout: Optional[float] = None) -> List[float]:
+        """Embedding vector for text"""
+        if not use_cache:
+            return self._embed_uncached(text, task_type, timeout)
+
+        cached = self.embeddings.get(self.embedding_model, task_type, text)
+        if cached is not None:
+            self._count('embed', 'cache_hits')
+            return cached
+        embedding = self._embed_uncached(text, task_type, timeout)
+        self.embeddings.put(self.embedding_model, task_type, text, embedding)
+        return embedding
+
+    def embed_batch(self, texts: List[str], task_type: str = 'retrieval_document',
+                    use_cache: bool = True, timeout: Optional[float] = None) -> List[List[float]]:
+        """Embedding vectors for texts, in order; uncached texts are sent EMBED_BATCH_LIMIT per request"""
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        missing = list(range(len(texts)))
+        if use_cache:
+            missing = []
+            for i, text in enumerate(texts):
+                results[i] = self.embeddings.get(self.embedding_model, task_type, text)
+                if results[i] is None:
+                    missing.append(i)
+            if len(texts) > len(missing):
+                self._count('embed_batch', 'cache_hits', len(texts) - len(missing))
+
+        for start in range(0, len(missing), EMBED_BATCH_LIMIT):
+            chunk = missing[start:start + EMBED_BATCH_LIMIT]
+            embeddings = self._embed_uncached([texts[i] for i in chunk], task_type, timeout)
+            for i, embedding in zip(chunk, embeddings):
+                results[i] = embedding
+                if use_cache:
+                    self.embeddings.put(self.embedding_model, task_type, texts[i], embedding)
+        return results
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-operation call counts, errors, cache hits and latency (API calls only)"""
+        with self._lock:
+            snapshot = {operation: dict(stats) for operation, stats in self._metrics.items()}
+        for stats in snapshot.values():
+            stats['avg_ms'] = round(1000 * stats['seconds'] / stats['calls'], 1) if stats['calls'] else 0.0
+            if 'first_chunk_seconds' in stats and stats['calls']:
+                stats['avg_first_chunk_ms'] = round(1000 * stats['first_chunk_seconds'] / stats['calls'], 1)
+        return snapshot
+
+
+# Shared by every caller in this process
+llm_client = LLMClient(
+    GEMINI_MODEL, EMBEDDING_MODEL,
+    responses=ResponseCache(LLM_RESPONSE_CACHE_TTL, LLM_RESPONSE_CACHE_SIZE),
+    embeddings=embedding_cache,
+    generate_timeout=LLM_GENERATE_TIMEOUT,
+    embed_timeout=LLM_EMBED_TIMEOUT,
+)
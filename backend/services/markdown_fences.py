@@ -0,0 +1,81 @@
+"""
+Markdown Fences
+Removes the ``` code fence an LLM sometimes wraps plain-text output in, whole or while streaming
+"""
+
+FENCE = '```'
+
+
+def strip_code_fence(text: str) -> str:
+    """text without surrounding whitespace or a ``` fence wrapped around it"""
+    text = text.strip()
+    if not text.startswith(FENCE):
+        return text
+    lines = text.split('\n')[1:]
+    if lines and lines[-1].strip().startswith(FENCE):
+        lines = lines[:-1]
+    return '\n'.join(lines).strip()
+
+
+class CodeFenceStripper:
+    """
+    strip_code_fence() for streamed text.
+
+    Pass each chunk to feed() and send on what it returns, then send
+    finish(); the pieces join to exactly strip_code_fence() of the whole
+    text. Only what is still undecided is held back: the start until it is
+    clear whether it opens a fence, the opening fence line, trailing
+    whitespace, and (inside a fence) the last line, which may close it.
+    """
+
+    def __init__(self):
+        self._pending = ''
+        self._state = 'start'  # start -> (opening ->) body_start -> body
+        self._fenced = False
+
+    def feed(self, chunk: str) -> str:
+        self._pending += chunk
+
+        if self._state == 'start':
+            head = self._pending.lstrip()
+            if len(head) < len(FENCE) and FENCE.startswith(head):
+                return ''
+            self._fenced = head.startswith(FENCE)
+            self._pending = head
+            self._state = 'opening' if self._fenced else 'body'
+
+        if self._state == 'opening':
+            newline = self._pending.find('\n')
+            if newline == -1:
+                return ''
+            self._pending = self._pending[newline + 1:]
+            self._state = 'body_start'
+
+        if self._state == 'body_start':
+            self._pending = self._pending.lstrip()
+            if not self._pending:
+                return ''
+            self._state = 'body'
+
+        ready = self._pending.rstrip()
+        if self._fenced:
+            # Hold the last non-blank line back: it may be the closing fence
+            newline = ready.rfind('\n')
+            if newline == -1:
+                return ''
+            ready = ready[:newline].rstrip()
+        self._pending = self._pending[len(ready):]
+        return ready
+
+    def finish(self) -> str:
+        """Whatever was held back, once the stream has ended"""
+        if self._state in ('start', 'opening'):
+            return strip_code_fence(self._pending)
+
+        tail = self._pending.rstrip()
+        if self._fenced:
+            lines = tail.split('\n')
+            if lines[-1].strip().startswith(FENCE):
+                tail = '\n'.join(lines[:-1])
+        tail = tail.rstrip()
+        return tail.lstrip() if self._state == 'body_start' else tail
@@ -0,0 +1,189 @@
+"""
+Member Search
+Hybrid retrieval for chat member search: name lookup and BM25 over profile
+fields, fused with vector search results by reciprocal rank
+"""
+import math
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Searchable fields as (weight, columns tried in order); the weights are the
+# ones the old per-row keyword scan used
+FIELDS = (
+    (3.0, ('role_title', 'linkedinJobTitle')),
+    (2.0, ('headline', 'linkedinHeadline')),
+    (2.0, ('company_name', 'company')),
+    (3.0, ('company_industry', 'companyIndustry')),
+    (1.0, ('major', 'Major')),
+)
+
+# Words that say what to do rather than whom to find
+STOP_WORDS = frozenset({
+    'find', 'search', 'looking', 'for', 'who', 'works', 'at', 'anyone',
+    'members', 'alumni', 'someone', 'people', 'show', 'me', 'recommend',
+    'suggest', 'in', 'the', 'a', 'an', 'is', 'are', 'can', 'you', 'i',
+    'want', 'need', 'like', 'similar', 'to', 'else', 'give', 'get', 'gimme',
+    'contact', 'talk', 'speak', 'reach', 'connect', 'introduce', 'help',
+    'advice', 'about', 'with', 'should', 'could', 'would', 'names', 'list',
+    'some', 'any', 'all', 'more', 'other', 'out',
+})
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Reciprocal rank fusion: score = sum(weight / (RRF_K + rank)) over the rankings
+RRF_K = 60
+# Candidates taken from each ranking before fusing
+RRF_DEPTH = 50
+# A named person outranks anyone who only matches by profile text or embedding
+NAME_WEIGHT = 3.0
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _field_text(row, columns: Sequence[str]) -> str:
+    for column in columns:
+        value = row.get(column)
+        if value is not None and not pd.isna(value) and str(value).strip():
+            return str(value)
+    return ''
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Tuple[float, Sequence[int]]],
+                           k: int = RRF_K) -> List[Tuple[int, float]]:
+    """(id, score) best first, for rankings given as (weight, ids best first)"""
+    scores: Dict[int, float] = defaultdict(float)
+    for weight, ids in rankings:
+        for rank, doc_id in enumerate(ids, start=1):
+            scores[doc_id] += weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+class MemberSearchIndex:
+    """
+    Lexical indexes over one alumni snapshot, built once per snapshot.
+
+    Names are looked up by token; profile fields are scored with BM25, where
+    a term's frequency is weighted by the field it occurs in. A query term
+    also matches longer index terms it is a prefix of ('consult' finds
+    'consultant' and 'consulting'), as the old substring scan did.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.ids = [int(i) for i in df.index]
+        self._known = set(self.ids)
+        name_col = 'name' if 'name' in df.columns else 'Name'
+
+        self._name_tokens: Dict[str, List[int]] = defaultdict(list)
+        self._full_names: List[List[str]] = []
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        lengths = []
+
+        for pos, (_, row) in enumerate(df.iterrows()):
+            name = row.get(name_col)
+            tokens = tokenize(str(name)) if name is not None and not pd.isna(name) else []
+            self._full_names.append(tokens)
+            if tokens:
+                # First and last name, like the old per-row name scan
+                for token in {tokens[0], tokens[-1]}:
+                    self._name_tokens[token].append(pos)
+
+            weighted = Counter()
+            length = 0.0
+            for weight, columns in FIELDS:
+                field_tokens = tokenize(_field_text(row, columns))
+                length += weight * len(field_tokens)
+                for token in field_tokens:
+                    weighted[token] += weight
+            for token, tf in weighted.items():
+                postings[token][pos] = tf
+            lengths.append(length)
+
+        self._terms = sorted(postings)
+        self._postings = {
+            term: (np.fromiter(docs.keys(), dtype=np.int64, count=len(docs)),
+                   np.fromiter(docs.values(), dtype=np.float64, count=len(docs)))
+            for term, docs in postings.items()
+        }
+        lengths = np.array(lengths, dtype=np.float64)
+        avg_length = lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0
+        self._norms = K1 * (1 - B + B * lengths / avg_length)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _expand(self, term: str) -> List[str]:
+        """Index terms starting with term"""
+        start = bisect_left(self._terms, term)
+        end = start
+        while end < len(self._terms) and self._terms[end].startswith(term):
+            end += 1
+        return self._terms[start:end]
+
+    def name_matches(self, message: str) -> List[int]:
+        """Ids of alumni named in message, full-name mentions first"""
+        tokens = [t for t in tokenize(message) if t not in STOP_WORDS]
+        hits = Counter()
+        for token in set(tokens):
+            for pos in self._name_tokens.get(token, ()):
+                hits[pos] += 1
+
+        text = f" {' '.join(tokens)} "
+
+        def rank(pos):
+            full = self._full_names[pos]
+            mentioned = len(full) > 1 and f" {' '.join(full)} " in text
+            return (not mentioned, -hits[pos], pos)
+        return [self.ids[pos] for pos in sorted(hits, key=rank)]
+
+    def keyword_matches(self, message: str, limit: int = RRF_DEPTH) -> List[int]:
+        """Ids of the best BM25 matches for message's search terms, best first"""
+        terms = {t for t in tokenize(message) if t not in STOP_WORDS and len(t) > 2}
+        if not terms or not len(self):
+            return []
+
+        scores = np.zeros(len(self), dtype=np.float64)
+        for term in terms:
+            tf = np.zeros(len(self), dtype=np.float64)
+            for index_term in self._expand(term):
+                docs, freqs = self._postings[index_term]
+                np.add.at(tf, docs, freqs)
+            matched = np.flatnonzero(tf)
+            if not len(matched):
+                continue
+            idf = math.log(1 + (len(self) - len(matched) + 0.5) / (len(matched) + 0.5))
+            scores[matched] += idf * tf[matched] * (K1 + 1) / (tf[matched] + self._norms[matched])
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+        matched = matched[np.argsort(-scores[matched], kind='stable')]
+        return [self.ids[pos] for pos in matched]
+
+    def search(self, message: str, k: int = 10, vector_ids: Sequence[int] = (),
+               exclude_ids: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """
+        Top k (id, fused score) for message: name mentions, BM25 matches and
+        vector_ids (the embedding search's ranking) fused by reciprocal rank.
+        """
+        exclude = set(exclude_ids)
+
+        def ranking(ids):
+            return [i for i in ids if i not in exclude and i in self._known][:RRF_DEPTH]
+
+        fused = reciprocal_rank_fusion([
+            (NAME_WEIGHT, ranking(self.name_matches(message))),
+            (1.0, ranking(self.keyword_matches(message))),
+            (1.0, ranking(vector_ids)),
+        ])
+        return fused[:k]
@@ -0,0 +1,143 @@
+"""
+Name Index
+Candidate index for fuzzy (difflib.SequenceMatcher) name lookups
+"""
+import heapq
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Float slack for the bound checks, so rounding can never drop a true match
+_EPSILON = 1e-9
+
+
+def _bigrams(text: str) -> FrozenSet[Tuple[str, int]]:
+    """Bigrams tagged with their occurrence number, so a repeated bigram is shared at most as often as it occurs"""
+    seen: Counter = Counter()
+    grams = []
+    for i in range(len(text) - 1):
+        gram = text[i:i + 2]
+        seen[gram] += 1
+        grams.append((gram, seen[gram]))
+    return frozenset(grams)
+
+
+class NameIndex:
+    """
+    Answers "which names have SequenceMatcher(None, query, name).ratio() >
+    threshold" without running the matcher against every name.
+
+    ratio() is 2M/T, where M is the number of matched characters and T the
+    combined length. The matched characters form blocks separated by at
+    least one unmatched character, so there are at most T - 2M + 1 blocks
+    and the two names share at least 3M - T - 1 bigrams. A ratio above t
+    therefore needs more than (1.5t - 1)T - 1 shared bigrams. Names are
+    narrowed by length and by that bigram count (counted for every name at
+    once from posting arrays), then by SequenceMatcher's own quick_ratio()
+    bounds. The exact ratio is only computed for the few that survive, so
+    results are identical to a full scan. The same counts bound each
+    candidate's ratio (M <= (shared + T + 1) / 3), which lets top() stop
+    early.
+    """
+
+    def __init__(self, names: List[str]):
+        """names are already normalized; results refer to positions in this list"""
+        self.names = list(names)
+        # Repeated names are scored once: postings refer to distinct names
+        self._distinct: List[str] = []
+        self._positions: List[List[int]] = []
+        distinct_ids: Dict[str, int] = {}
+        for pos, name in enumerate(self.names):
+            name_id = distinct_ids.get(name)
+            if name_id is None:
+                name_id = distinct_ids[name] = len(self._distinct)
+                self._distinct.append(name)
+                self._positions.append([])
+            self._positions[name_id].append(pos)
+
+        postings: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        for name_id, name in enumerate(self._distinct):
+            for gram in _bigrams(name):
+                postings[gram].append(name_id)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._lengths = np.array([len(name) for name in self._distinct], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _candidates(self, query: str, threshold: float) -> Dict[int, float]:
+        """Distinct names that may score above threshold, with an upper bound on each ratio"""
+        if not self._distinct:
+            return {}
+        la = len(query)
+        total = la + self._lengths
+
+        # Bigrams shared with every name at once: each tagged query bigram adds
+        # one to every name containing it
+        grams = [self._postings[gram] for gram in _bigrams(query) if gram in self._postings]
+        if grams:
+            shared = np.bincount(np.concatenate(grams), minlength=len(self._distinct))
+        else:
+            shared = np.zeros(len(self._distinct), dtype=np.int64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            length_bound = np.where(total > 0, 2.0 * np.minimum(la, self._lengths) / total, 1.0)
+            bigram_bound = np.where(total > 0, 2.0 * (shared + total + 1) / (3 * total), 1.0)
+        keep = (length_bound > threshold - _EPSILON) & (shared > (1.5 * threshold - 1) * total - 1 - _EPSILON)
+
+        name_ids = np.flatnonzero(keep)
+        bounds = np.minimum(length_bound, bigram_bound)[name_ids]
+        return dict(zip(name_ids.tolist(), bounds.tolist()))
+
+    def matches(self, query: str, threshold: float) -> List[Tuple[int, float]]:
+        """(position, ratio) for every name with ratio > threshold, in list order"""
+        results = []
+        for name_id in self._candidates(query, threshold):
+            ratio = self._ratio(query, self._distinct[name_id], threshold)
+            if ratio is not None:
+                results.extend((pos, ratio) for pos in self._positions[name_id])
+        results.sort()
+        return results
+
+    def top(self, query: str, k: int, threshold: float, exclude: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """
+        The k best (position, ratio) pairs with ratio > threshold, best first
+        (ties in list order), skipping positions in exclude.
+
+        Candidates are tried in order of their upper bound and the search stops
+        once no remaining bound can beat the k-th best ratio found so far.
+        """
+        if k <= 0:
+            return []
+        exclude = set(exclude)
+        bounds = self._candidates(query, threshold)
+
+        best: List[Tuple[float, int]] = []  # min-heap of (ratio, -pos): root is the current k-th best
+        for name_id in sorted(bounds, key=lambda name_id: -bounds[name_id]):
+            if len(best) == k and bounds[name_id] < best[0][0] - _EPSILON:
+                break
+            ratio = self._ratio(query, self._distinct[name_id], threshold)
+            if ratio is None:
+                continue
+            for pos in self._positions[name_id]:
+                if pos in exclude:
+                    continue
+                item = (ratio, -pos)
+                if len(best) < k:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+
+        return [(-neg_pos, ratio) for ratio, neg_pos in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _ratio(query: str, name: str, threshold: float) -> Optional[float]:
+        """Exact SequenceMatcher ratio if it beats threshold, else None"""
+        matcher = SequenceMatcher(None, query, name)
+        if matcher.real_quick_ratio() > threshold and matcher.quick_ratio() > threshold:
+            ratio = matcher.ratio()
+            if ratio > threshold:
+                return ratio
+        return None
@@ -0,0 +1,26 @@
+"""
+Pagination Helpers
+Opaque cursors for paged API responses
+"""
+import base64
+import json
+from typing import Dict
+
+
+def encode_cursor(state: Dict) -> str:
+    """Encode paging state as an opaque, URL-safe cursor string"""
+    raw = json.dumps(state, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Dict:
+    """Decode a cursor produced by encode_cursor (raises ValueError if invalid)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+    if not isinstance(state, dict):
+        raise ValueError('Invalid cursor')
+    return state
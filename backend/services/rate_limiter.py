@@ -0,0 +1,40 @@
+"""
+Rate Limiter
+Token bucket for pacing calls against an API quota
+"""
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Allows rate acquisitions per period seconds on average.
+
+    Tokens refill continuously, and up to capacity (default: one period's
+    worth) can be spent in a burst, so a quota is used as fast as it allows
+    rather than at a fixed sleep between calls. Safe to share across threads.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0, capacity: Optional[float] = None):
+        self.fill_rate = rate / period
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until tokens are available, then spend them"""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of {self.capacity}")
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.fill_rate
+            time.sleep(wait)
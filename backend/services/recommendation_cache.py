@@ -0,0 +1,55 @@
+"""
+Recommendation Cache
+Per-user ranked recommendation lists, so repeat requests skip the embedding search
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+
+def profile_version(profile_text: str, csv_source_id=None) -> str:
+    """Short fingerprint of everything the ranking depends on in the profile"""
+    raw = f"{csv_source_id}\n{profile_text}".encode('utf-8')
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+class RecommendationCache:
+    """
+    Ranked CSV row ids per user, valid for one profile version and alumni
+    snapshot generation.
+
+    Entries expire after ttl seconds; the least recently used are dropped
+    beyond max_entries. Each worker process keeps its own cache, so paging
+    must not depend on it: /api/recommendations cursors carry the ranking.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, version: str, generation: int) -> Optional[List[int]]:
+        """The cached ranking, or None if missing, stale or for another version"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            entry_version, entry_generation, built_at, ranked = entry
+            if time.time() - built_at >= self.ttl:
+                del self._entries[user_id]
+                return None
+            if entry_version != version or entry_generation != generation:
+                return None
+            self._entries.move_to_end(user_id)
+            return ranked
+
+    def put(self, user_id: str, version: str, generation: int, ranked: List[int]):
+        """Store the ranking for user_id (replacing any older one)"""
+        with self._lock:
+            self._entries[user_id] = (version, generation, time.time(), list(ranked))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
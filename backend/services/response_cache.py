@@ -0,0 +1,52 @@
+"""
+Response Cache
+Exact-duplicate cache for LLM responses (prompts fully determined by their inputs)
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def response_key(model: str, prompt: str, generation_config: Optional[Dict] = None) -> str:
+    """Fingerprint of everything that determines a generation call's output"""
+    raw = json.dumps([model, prompt, generation_config or {}], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Generated text keyed by response_key().
+
+    Entries expire after ttl seconds; the least recently used are dropped
+    beyond max_entries. Each worker process keeps its own cache.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """The cached response, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, text = entry
+            if time.time() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str):
+        """Store a response (replacing any older one for the same key)"""
+        with self._lock:
+            self._entries[key] = (time.time(), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,208 @@
+"""
+Resume Jobs
+Background pipeline for resume uploads: text extraction, LLM parsing, the
+storage upload and the profile update run on a worker pool while the client
+polls the job's status
+"""
+import io
+import os
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+# Job statuses in pipeline order; done and failed are final
+QUEUED = 'queued'
+EXTRACTING = 'extracting'
+PARSING = 'parsing'
+SAVING = 'saving'
+DONE = 'done'
+FAILED = 'failed'
+FINISHED = (DONE, FAILED)
+
+RESUMES_BUCKET = 'resumes'
+
+
+def extract_resume_text(pdf_bytes: bytes) -> str:
+    """Text of every page of a PDF, one page per line block"""
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    return ''.join((page.extract_text() or '') + '\n' for page in pdf_reader.pages)
+
+
+def profile_update_from_resume(resume_text: str, parsed_data: Dict, resume_url: str) -> Dict:
+    """user_profiles fields filled in from a parsed resume"""
+    update_data = {
+        'raw_resume_text': resume_text[:5000],  # Store first 5000 chars
+        'resume_url': resume_url,
+    }
+
+    # Add parsed fields if available
+    if parsed_data.get('major'):
+        update_data['major'] = parsed_data['major']
+    if parsed_data.get('graduation_year'):
+        update_data['graduation_year'] = parsed_data['graduation_year']
+    if parsed_data.get('linkedin_url'):
+        update_data['linkedin_url'] = parsed_data['linkedin_url']
+    if parsed_data.get('location'):
+        update_data['location'] = parsed_data['location']
+    if parsed_data.get('email'):
+        update_data['personal_email'] = parsed_data['email']
+    if parsed_data.get('phone'):
+        update_data['phone'] = parsed_data['phone']
+    if parsed_data.get('skills'):
+        # Store as bio for now (can expand schema later)
+        skills_text = ', '.join(parsed_data['skills'][:20])
+        update_data['bio'] = f"Skills: {skills_text}"
+
+    # Extract work experience - get all companies and roles
+    if parsed_data.get('work_experience') and len(parsed_data['work_experience']) > 0:
+        companies = [job.get('company') for job in parsed_data['work_experience'] if job.get('company')]
+        roles = [job.get('title') for job in parsed_data['work_experience'] if job.get('title')]
+
+        if companies:
+            update_data['companies'] = companies
+        if roles:
+            update_data['roles'] = roles
+
+    # Extract industries
+    if parsed_data.get('industries'):
+        update_data['career_interests'] = parsed_data['industries']
+
+    return update_data
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ResumeJobRunner:
+    """
+    Runs resume jobs on a per-process thread pool.
+
+    submit() records the job and returns at once; the job then extracts the
+    PDF's text, parses it with the LLM while the PDF uploads to storage, and
+    updates the profile. Job state lives in the resume_jobs table, so any
+    worker process can answer status polls. A job whose process died mid-way
+    stops being updated and is reported as failed once it is stale_after
+    seconds old.
+
+    client must be the service-role client: jobs outlive the request, and
+    the request client's session belongs to whichever user the worker is
+    serving by then. Every write is scoped to the job's user_id instead.
+    """
+
+    def __init__(self, client, parse: Callable[[str], Dict],
+                 on_profile_updated: Callable[[Dict], None], workers: int, stale_after: float):
+        self.client = client
+        self.parse = parse
+        self.on_profile_updated = on_profile_updated
+        self.workers = workers
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        self._pid = None
+        self._jobs: Optional[ThreadPoolExecutor] = None
+        self._uploads: Optional[ThreadPoolExecutor] = None
+
+    def _pools(self):
+        # Created lazily in each process: pool threads started in the gunicorn
+        # master would not exist in its forked workers
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._jobs = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='resume-job')
+                self._uploads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='resume-upload')
+            return self._jobs, self._uploads
+
+    def _set(self, job_id: str, **fields):
+        fields['updated_at'] = _now().isoformat()
+        self.client.table('resume_jobs').update(fields).eq('id', job_id).execute()
+
+    def submit(self, user_id: str, storage_name: str, pdf_bytes: bytes) -> str:
+        """Record a job for an uploaded PDF and queue it; returns the job id"""
+        job_id = str(uuid.uuid4())
+        self.client.table('resume_jobs').insert({
+            'id': job_id,
+            'user_id': user_id,
+            'status': QUEUED,
+            'updated_at': _now().isoformat(),
+        }).execute()
+
+        jobs, _ = self._pools()
+        jobs.submit(self._run, job_id, user_id, storage_name, pdf_bytes)
+        return job_id
+
+    def _upload(self, storage_name: str, pdf_bytes: bytes) -> str:
+        self.client.storage.from_(RESUMES_BUCKET).upload(
+            storage_name,
+            pdf_bytes,
+            file_options={"content-type": "application/pdf"}
+        )
+        return self.client.storage.from_(RESUMES_BUCKET).get_public_url(storage_name)
+
+    def _run(self, job_id: str, user_id: str, storage_name: str, pdf_bytes: bytes):
+        try:
+            self._set(job_id, status=EXTRACTING)
+            resume_text = extract_resume_text(pdf_bytes)
+            if not resume_text.strip():
+                self._set(job_id, status=FAILED, error='Could not extract text from PDF')
+                return
+
+            # The upload doesn't depend on the parse, so it overlaps the LLM call
+            _, uploads = self._pools()
+            upload = uploads.submit(self._upload, storage_name, pdf_bytes)
+
+            self._set(job_id, status=PARSING)
+            parsed_data = self.parse(resume_text)
+            resume_url = upload.result()
+
+            self._set(job_id, status=SAVING)
+            profile_response = self.client.table('user_profiles').update(
+                profile_update_from_resume(resume_text, parsed_data, resume_url)
+            ).eq('user_id', user_id).execute()
+            if not profile_response.data:
+                self._set(job_id, status=FAILED, error='User profile not found')
+                return
+            self.on_profile_updated(profile_response.data[0])
+
+            self._set(job_id, status=DONE, parsed_data=parsed_data, resume_url=resume_url)
+            print(f"✓ Resume job {job_id} done")
+
+        except Exception as e:
+            print(f"Error processing resume job {job_id}: {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            try:
+                self._set(job_id, status=FAILED, error=f'Failed to process resume: {str(e)}')
+            except Exception as save_error:
+                print(f"Could not record failure of resume job {job_id}: {save_error}")
+
+    def get(self, job_id: str, user_id: str) -> Optional[Dict]:
+        """The user's job (id, status, error, parsed_data, resume_url), or None if they have no such job"""
+        try:
+            uuid.UUID(job_id)
+        except ValueError:
+            return None
+        response = self.client.table('resume_jobs').select(
+            'id, status, error, parsed_data, resume_url, updated_at'
+        ).eq('id', job_id).eq('user_id', user_id).execute()
+        if not response.data:
+            return None
+
+        job = response.data[0]
+        if job['status'] not in FINISHED and self._is_stale(job.get('updated_at')):
+            job['status'] = FAILED
+            job['error'] = 'Resume processing was interrupted. Please upload it again.'
+        job.pop('updated_at', None)
+        return job
+
+    def _is_stale(self, updated_at: Optional[str]) -> bool:
+        try:
+            updated = datetime.fromisoformat(updated_at)
+        except (TypeError, ValueError):
+            return False
+        if updated.tzinfo is None:
+            updated = updated.replace(tzinfo=timezone.utc)
+        return (_now() - updated).total_seconds() > self.stale_after
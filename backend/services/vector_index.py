@@ -0,0 +1,184 @@
+"""
+Alumni Vector Index
+In-process exact cosine search over alumni_embeddings (alternative to the match_alumni RPC)
+"""
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Rows per request when paging alumni_embeddings out of Supabase
+PAGE_SIZE = 1000
+
+
+def _parse_embedding(value) -> Optional[List[float]]:
+    """pgvector columns come back from PostgREST as '[0.1,0.2,...]' strings"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return json.loads(value)
+    return list(value)
+
+
+class VectorIndex:
+    """
+    Read-only matrix of unit-length float32 embeddings, one row per alumnus.
+
+    search() mirrors match_alumni: cosine similarity = dot product of the
+    normalized vectors, exact rather than ivfflat-approximate. Rows are
+    replaced copy-on-write, so a search never sees a half-applied update.
+    """
+
+    def __init__(self, ids: List[int], names: List[str], vectors: np.ndarray):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.names = list(names)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.matrix = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        self._positions = {int(csv_id): pos for pos, csv_id in enumerate(self.ids)}
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> 'VectorIndex':
+        """Build from alumni_embeddings rows (csv_row_id, name, embedding)"""
+        ids, names, vectors = [], [], []
+        for row in rows:
+            embedding = _parse_embedding(row.get('embedding'))
+            if not embedding:
+                continue
+            ids.append(row['csv_row_id'])
+            names.append(row.get('name') or '')
+            vectors.append(embedding)
+        dim = len(vectors[0]) if vectors else 0
+        return cls(ids, names, np.array(vectors, dtype=np.float32).reshape(len(ids), dim))
+
+    def search(self, query_embedding, match_count: int = 10,
+               exclude_ids: Iterable[int] = ()) -> List[Dict]:
+        """Top match_count rows as match_alumni returns them: csv_row_id, name, similarity"""
+        if not len(self) or match_count <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        scores = self.matrix @ query
+
+        excluded = [self._positions[i] for i in exclude_ids if i in self._positions]
+        if excluded:
+            scores[excluded] = -np.inf
+        count = min(match_count, len(self) - len(excluded))
+        if count <= 0:
+            return []
+
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [
+            {'csv_row_id': int(self.ids[pos]), 'name': self.names[pos], 'similarity': float(scores[pos])}
+            for pos in top
+        ]
+
+    def with_row(self, csv_row_id: int, name: str, embedding) -> 'VectorIndex':
+        """Copy of the index with csv_row_id added or replaced"""
+        vector = np.asarray(_parse_embedding(embedding), dtype=np.float32)
+        pos = self._positions.get(csv_row_id)
+        if pos is None:
+            ids = np.append(self.ids, csv_row_id)
+            names = self.names + [name]
+            matrix = np.vstack([self.matrix, vector[None, :]]) if len(self) else vector[None, :]
+        else:
+            ids, names, matrix = self.ids, list(self.names), self.matrix.copy()
+            names[pos] = name
+            matrix[pos] = vector
+        return self._derive(ids, names, matrix)
+
+    def without_row(self, csv_row_id: int) -> 'VectorIndex':
+        """Copy of the index with csv_row_id removed"""
+        pos = self._positions.get(csv_row_id)
+        if pos is None:
+            return self
+        keep = np.arange(len(self)) != pos
+        return self._derive(self.ids[keep], [n for i, n in enumerate(self.names) if i != pos], self.matrix[keep])
+
+    def _derive(self, ids, names, matrix) -> 'VectorIndex':
+        # An edited copy is as old as the load it came from, so the scheduled reload still happens
+        index = VectorIndex(ids, names, matrix)
+        index.built_at = self.built_at
+        return index
+
+
+def load_vector_index(client, page_size: int = PAGE_SIZE) -> VectorIndex:
+    """Page every row of alumni_embeddings out of Supabase into a VectorIndex"""
+    rows = []
+    start = 0
+    while True:
+        response = client.table('alumni_embeddings').select(
+            'csv_row_id, name, embedding'
+        ).order('csv_row_id').range(start, start + page_size - 1).execute()
+        page = response.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            break
+        start += page_size
+    return VectorIndex.from_rows(rows)
+
+
+class VectorIndexCache:
+    """
+    Process-wide holder for the current VectorIndex.
+
+    The first get() loads the index in the calling thread. After max_age
+    seconds get() keeps returning the loaded index and reloads it in a
+    background thread, so embeddings written by other processes show up
+    without a request ever waiting on the reload.
+    """
+
+    def __init__(self, max_age: float, load: Callable[[], VectorIndex]):
+        self.max_age = max_age
+        self.load = load
+        self._index: Optional[VectorIndex] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _refresh(self):
+        try:
+            self._index = self.load()
+            print(f"✓ Loaded vector index ({len(self._index)} embeddings)")
+        except Exception as e:
+            print(f"Failed to refresh vector index: {e}")
+        finally:
+            self._refreshing = False
+
+    def get(self) -> VectorIndex:
+        """Return the current index, loading it if there is none yet"""
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self.load()
+                    print(f"✓ Loaded vector index ({len(self._index)} embeddings)")
+                return self._index
+
+        if time.time() - index.built_at >= self.max_age and not self._refreshing:
+            with self._lock:
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh, name='vector-index-refresh', daemon=True).start()
+        return index
+
+    def upsert(self, csv_row_id: int, name: str, embedding):
+        """Apply a single embedding write to the loaded index (no-op if none loaded)"""
+        with self._lock:
+            if self._index is not None:
+                self._index = self._index.with_row(csv_row_id, name, embedding)
+
+    def remove(self, csv_row_id: int):
+        """Apply a single embedding delete to the loaded index (no-op if none loaded)"""
+        with self._lock:
+            if self._index is not None:
+                self._index = self._index.without_row(csv_row_id)
@@ -67,38 +67,49 @@ const Chatbot = () => {
     setMessages(prev => [...prev, { role: 'user', content: userMessage }]);
     setIsLoading(true);
 
-    try {
-      const response = await chatAPI.sendMessage(userMessage, sessionId);
-
-      if (response.success) {
-        // Add AI response with member cards attached to the message
-        setMessages(prev => [...prev, {
-          role: 'assistant',
-          content: response.response,
-          memberCards: response.member_cards || null
-        }]);
-
-        // Update session ID if new
-        if (response.session_id) {
-          setSessionId(response.session_id);
-        }
+    // Replace the reply being streamed (always the last message)
+    const updateReply = (update) => setMessages(prev => {
+      const last = prev[prev.length - 1];
+      if (!last || !last.streaming) return prev;
+      return [...prev.slice(0, -1), { ...last, ...update(last) }];
+    });
 
-        // Also update the current memberCards state for expanded card functionality
-        if (response.member_cards && response.member_cards.length > 0) {
-          setMemberCards(response.member_cards);
-        }
-      } else {
-        setMessages(prev => [...prev, {
-          role: 'assistant',
-          content: 'Sorry, I encountered an error. Please try again.'
-        }]);
-      }
+    try {
+      const response = await chatAPI.streamMessage(userMessage, sessionId, {
+        // Member cards arrive before the reply text; show them right away
+        onMeta: ({ session_id, member_cards }) => {
+          setMessages(prev => [...prev, {
+            role: 'assistant',
+            content: '',
+            memberCards: member_cards || null,
+            streaming: true
+          }]);
+
+          // Update session ID if new
+          if (session_id) {
+            setSessionId(session_id);
+          }
+
+          // Also update the current memberCards state for expanded card functionality
+          if (member_cards && member_cards.length > 0) {
+            setMemberCards(member_cards);
+          }
+        },
+        onToken: (text) => updateReply(last => ({ content: last.content + text })),
+      });
+
+      updateReply(() => ({ content: response, streaming: false }));
     } catch (error) {
       console.error('Error sending message:', error);
-      setMessages(prev => [...prev, {
-        role: 'assistant',
-        content: 'Sorry, I had trouble processing your request. Please try again.'
-      }]);
+      setMessages(prev => {
+        const last = prev[prev.length - 1];
+        const rest = last && last.streaming ? prev.slice(0, -1) : prev;
+        return [...rest, {
+          role: 'assistant',
+          content: 'Sorry, I had trouble processing your request. Please try again.',
+          memberCards: last && last.streaming ? last.memberCards : null
+        }];
+      });
     } finally {
       setIsLoading(false);
     }
@@ -133,19 +144,23 @@ const Chatbot = () => {
     setGeneratingEmailFor(memberId);
     setGeneratedEmail(null);
 
+    // Show the subject right away and fill the body in as it streams
+    const updateEmail = (update) =>
+      setGeneratedEmail(prev => (prev && prev.memberId === memberId ? { ...prev, ...update(prev) } : prev));
+
     try {
-      const response = await alumniAPI.generateEmail(member);
-      if (response.success && response.email) {
-        setGeneratedEmail({
+      const result = await alumniAPI.streamEmail(member, {
+        onSubject: (subject) => setGeneratedEmail({
           memberId,
-          email: response.email,
-          subject: response.subject || 'Connecting from Purdue THINK'
-        });
-      } else {
-        console.error('Failed to generate email:', response.error);
-      }
+          email: '',
+          subject: subject || 'Connecting from Purdue THINK'
+        }),
+        onToken: (text) => updateEmail(prev => ({ email: prev.email + text })),
+      });
+      updateEmail(() => ({ email: result.email }));
     } catch (error) {
       console.error('Error generating email:', error);
+      setGeneratedEmail(prev => (prev && prev.memberId === memberId ? null : prev));
     } finally {
       setGeneratingEmailFor(null);
     }
@@ -333,7 +348,7 @@ const Chatbot = () => {
                   <strong>Subject:</strong> {generatedEmail.subject}
                 </div>
                 <div className="chat-email-body">{generatedEmail.email}</div>
-                <button className="chat-email-copy" onClick={handleCopyGeneratedEmail}>
+                <button className="chat-email-copy" disabled={generatingEmailFor === cardId} onClick={handleCopyGeneratedEmail}>
                   <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
                     <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
                     <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
@@ -436,7 +451,13 @@ const Chatbot = () => {
                     </div>
                   )}
                   <div className="chatbot-message-content">
-                    {msg.content}
+                    {msg.streaming && !msg.content ? (
+                      <div className="chatbot-typing">
+                        <span></span>
+                        <span></span>
+                        <span></span>
+                      </div>
+                    ) : msg.content}
                   </div>
                 </div>
                 {/* Member Cards inline with the message that generated them */}
@@ -449,7 +470,7 @@ const Chatbot = () => {
               </div>
             ))}
 
-            {isLoading && (
+            {isLoading && !messages[messages.length - 1]?.streaming && (
               <div className="chatbot-message assistant">
                 <div className="chatbot-message-avatar">
                   <img
@@ -3,6 +3,7 @@ import { useState, useRef, useEffect } from 'react';
 const SearchableDropdown = ({
   label,
   options = [],
+  counts = {},
   selectedValues = [],
   onChange,
   placeholder = 'Select...',
@@ -119,6 +120,9 @@ const SearchableDropdown = ({
                   />
                   <span className="checkbox-custom"></span>
                   <span className="option-text">{option}</span>
+                  {counts[option] != null && (
+                    <span className="option-count">{counts[option]}</span>
+                  )}
                 </label>
               ))
             )}
@@ -359,6 +363,14 @@ const SearchableDropdown = ({
           white-space: nowrap;
         }
 
+        .option-count {
+          margin-left: auto;
+          padding-left: 8px;
+          font-family: 'Inter', sans-serif;
+          font-size: 11px;
+          color: #8a8586;
+        }
+
         .dropdown-option:hover .option-text {
           color: #ffffff;
         }
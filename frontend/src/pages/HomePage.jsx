@@ -7,34 +7,42 @@ import SearchableDropdown from '../components/SearchableDropdown';
 import Chatbot from '../components/Chatbot';
 import '../styles/people.css';
 
+// Card fields used by the grid, the filters and the AI email writer
+const CARD_FIELDS = 'name,role_title,roles_list,headline,company,companies_list,company_industry,major,grad_year,location,profile_image_url,linkedin,email';
+const ALUMNI_PAGE_SIZE = 60;
+
 const HomePage = () => {
   const { user } = useAuth();
   const navigate = useNavigate();
 
   // State
   const [allAlumni, setAllAlumni] = useState([]);
+  const [totalAlumni, setTotalAlumni] = useState(0);
   const [filteredAlumni, setFilteredAlumni] = useState([]);
   const [loading, setLoading] = useState(true);
   const [showFilters, setShowFilters] = useState(false);
 
   // Recommendations state
   const [recommendations, setRecommendations] = useState([]);
-  const [excludedIds, setExcludedIds] = useState(() => {
+  const [recsCursor, setRecsCursor] = useState(() => {
     // Initialize from localStorage
     try {
-      const saved = localStorage.getItem('excludedRecIds');
-      return saved ? JSON.parse(saved) : [];
-    } catch { return []; }
+      return localStorage.getItem('recsCursor');
+    } catch { return null; }
   });
   const [loadingRecs, setLoadingRecs] = useState(false);
   const [recsMessage, setRecsMessage] = useState('');
 
-  // Persist excludedIds to localStorage
+  // Persist the next-page cursor to localStorage
   useEffect(() => {
     try {
-      localStorage.setItem('excludedRecIds', JSON.stringify(excludedIds));
+      if (recsCursor) {
+        localStorage.setItem('recsCursor', recsCursor);
+      } else {
+        localStorage.removeItem('recsCursor');
+      }
     } catch { /* ignore */ }
-  }, [excludedIds]);
+  }, [recsCursor]);
 
   // AI Email state
   const [generatingEmailFor, setGeneratingEmailFor] = useState(null);
@@ -50,6 +58,7 @@ const HomePage = () => {
     companies: [],
     industries: []
   });
+  const [filterCounts, setFilterCounts] = useState({});
 
   // Filter state
   const [filters, setFilters] = useState({
@@ -71,31 +80,17 @@ const HomePage = () => {
     }
   }, [user]);
 
-  const MAX_EXCLUDED_IDS = 80; // Auto-reset after seeing this many people
-
-  const loadRecommendations = async (currentExcludeIds = []) => {
+  const loadRecommendations = async (cursor = null) => {
     try {
       setLoadingRecs(true);
       setRecsMessage('');
 
-      // Auto-clear if we've seen too many - ensures we never run out
-      let excludeIdsToUse = currentExcludeIds;
-      if (currentExcludeIds.length >= MAX_EXCLUDED_IDS) {
-        excludeIdsToUse = [];
-        setExcludedIds([]);
-        localStorage.removeItem('excludedRecIds');
-      }
-
-      const data = await alumniAPI.getRecommendations(excludeIdsToUse, 8);
+      // The server wraps back to the best matches after the last page
+      const data = await alumniAPI.getRecommendations(cursor, 8);
       if (data.success) {
         if (data.recommendations && data.recommendations.length > 0) {
           setRecommendations(data.recommendations);
-          const newIds = data.recommendations.map(r => r.csv_row_id).filter(id => id != null);
-          setExcludedIds(prev => {
-            const updated = [...new Set([...prev, ...newIds])];
-            // Double-check: if somehow we exceed, reset
-            return updated.length >= MAX_EXCLUDED_IDS ? newIds : updated;
-          });
+          setRecsCursor(data.next_cursor || null);
         } else {
           setRecommendations([]);
           setRecsMessage(data.message || 'No recommendations available');
@@ -110,13 +105,12 @@ const HomePage = () => {
   };
 
   const refreshRecommendations = () => {
-    loadRecommendations(excludedIds);
+    loadRecommendations(recsCursor);
   };
 
   const resetRecommendations = () => {
-    setExcludedIds([]);
-    localStorage.removeItem('excludedRecIds');
-    loadRecommendations([]);
+    setRecsCursor(null);
+    loadRecommendations(null);
   };
 
   useEffect(() => {
@@ -128,6 +122,7 @@ const HomePage = () => {
       const data = await alumniAPI.getFilters();
       if (data.success) {
         setFilterOptions(data.filters);
+        setFilterCounts(data.counts || {});
       }
     } catch (error) {
       console.error('Error loading filter options:', error);
@@ -137,10 +132,20 @@ const HomePage = () => {
   const loadAlumni = async () => {
     try {
       setLoading(true);
-      const data = await alumniAPI.getAll();
-      if (data.success) {
-        setAllAlumni(data.data);
-      }
+      // Render the first page as soon as it arrives, then fetch the rest
+      let loaded = [];
+      let cursor = null;
+      do {
+        const params = { sort: 'name', limit: ALUMNI_PAGE_SIZE, fields: CARD_FIELDS };
+        if (cursor) params.cursor = cursor;
+        const data = await alumniAPI.getAll(params);
+        if (!data.success) break;
+        loaded = [...loaded, ...data.data];
+        setAllAlumni(loaded);
+        setTotalAlumni(data.count);
+        setLoading(false);
+        cursor = data.next_cursor;
+      } while (cursor);
     } catch (error) {
       console.error('Error loading alumni:', error);
     } finally {
@@ -214,20 +219,24 @@ const HomePage = () => {
     if (generatingEmailFor) return;
     setGeneratingEmailFor(alumniId);
 
+    // The overlay opens with the subject and fills in as the email streams;
+    // closing it part way drops the rest of the stream
+    const updateOverlay = (update) =>
+      setEmailOverlay(prev => (prev && prev.alumniId === alumniId ? { ...prev, ...update(prev) } : prev));
+
     try {
-      const response = await alumniAPI.generateEmail(alumni);
-      if (response.success && response.email) {
-        setEmailOverlay({
+      const result = await alumniAPI.streamEmail(alumni, {
+        onSubject: (subject) => setEmailOverlay({
           alumniId,
-          email: response.email,
-          subject: response.subject || 'Connecting from Purdue THINK'
-        });
-      } else {
-        console.error('Failed to generate email:', response.error);
-        alert('Failed to generate email. Please try again.');
-      }
+          email: '',
+          subject: subject || 'Connecting from Purdue THINK'
+        }),
+        onToken: (text) => updateOverlay(prev => ({ email: prev.email + text })),
+      });
+      updateOverlay(() => ({ email: result.email }));
     } catch (error) {
       console.error('Error generating email:', error);
+      setEmailOverlay(prev => (prev && prev.alumniId === alumniId ? null : prev));
       alert('Failed to generate email. Please try again.');
     } finally {
       setGeneratingEmailFor(null);
@@ -481,7 +490,7 @@ const HomePage = () => {
               <div className="email-subject"><strong>Subject:</strong> {emailOverlay.subject}</div>
               <div className="email-body">{emailOverlay.email}</div>
             </div>
-            <button className="email-overlay-copy" onClick={(e) => { e.stopPropagation(); handleCopyEmail(); }}>
+            <button className="email-overlay-copy" disabled={generatingEmailFor === emailOverlay.alumniId} onClick={(e) => { e.stopPropagation(); handleCopyEmail(); }}>
               <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
                 <rect x="9" y="9" width="13" height="13" rx="2" ry="2"></rect>
                 <path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"></path>
@@ -524,7 +533,7 @@ const HomePage = () => {
             <span className="header-label">EXPLORE</span>
             <h1 className="header-title">Alumni Network</h1>
             <div className="header-divider"></div>
-            <p className="header-subtitle">Connect with {allAlumni.length} Purdue THINK members and alumni</p>
+            <p className="header-subtitle">Connect with {totalAlumni || allAlumni.length} Purdue THINK members and alumni</p>
           </div>
           <div className="header-actions">
             <button className="filter-toggle-btn" onClick={() => setShowFilters(true)}>
@@ -590,6 +599,7 @@ const HomePage = () => {
             <SearchableDropdown
               label="Major"
               options={filterOptions.majors}
+              counts={filterCounts.majors}
               selectedValues={filters.selectedMajors}
               onChange={(values) => setFilters(prev => ({ ...prev, selectedMajors: values }))}
               placeholder="Select majors..."
@@ -601,6 +611,7 @@ const HomePage = () => {
             <SearchableDropdown
               label="Graduation Year"
               options={filterOptions.years}
+              counts={filterCounts.years}
               selectedValues={filters.selectedYears}
               onChange={(values) => setFilters(prev => ({ ...prev, selectedYears: values }))}
               placeholder="Select years..."
@@ -612,6 +623,7 @@ const HomePage = () => {
             <SearchableDropdown
               label="Company"
               options={filterOptions.companies}
+              counts={filterCounts.companies}
               selectedValues={filters.selectedCompanies}
               onChange={(values) => setFilters(prev => ({ ...prev, selectedCompanies: values }))}
               placeholder="Select companies..."
@@ -623,6 +635,7 @@ const HomePage = () => {
             <SearchableDropdown
               label="Industry"
               options={filterOptions.industries}
+              counts={filterCounts.industries}
               selectedValues={filters.selectedIndustries}
               onChange={(values) => setFilters(prev => ({ ...prev, selectedIndustries: values }))}
               placeholder="Select industries..."
@@ -703,7 +716,7 @@ const HomePage = () => {
 
         {/* Results Count */}
         <div className="results-info">
-          <span className="results-count">Showing {filteredAlumni.length} of {allAlumni.length} alumni</span>
+          <span className="results-count">Showing {filteredAlumni.length} of {totalAlumni || allAlumni.length} alumni</span>
         </div>
 
         {/* Alumni Grid */}
@@ -70,8 +70,8 @@ export const refreshSession = async () => {
   }
 };
 
-// API request helper with auth and auto-refresh on 401
-export const apiRequest = async (endpoint, options = {}) => {
+// Fetch with auth, refreshing the session and retrying once on 401
+const authorizedFetch = async (endpoint, options = {}) => {
   let token = getToken();
 
   const config = {
@@ -108,6 +108,12 @@ export const apiRequest = async (endpoint, options = {}) => {
     }
   }
 
+  return response;
+};
+
+// API request helper with auth and auto-refresh on 401
+export const apiRequest = async (endpoint, options = {}) => {
+  const response = await authorizedFetch(endpoint, options);
   const data = await response.json();
 
   if (!response.ok) {
@@ -117,6 +123,41 @@ export const apiRequest = async (endpoint, options = {}) => {
   return data;
 };
 
+// Server-Sent Events request: calls onEvent(event, data) for each event as it arrives
+export const streamRequest = async (endpoint, options = {}, onEvent) => {
+  const response = await authorizedFetch(endpoint, options);
+
+  if (!response.ok) {
+    const data = await response.json().catch(() => ({}));
+    throw new Error(data.error || 'Request failed');
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Events are separated by a blank line
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const raw = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = 'message';
+      const dataLines = [];
+      for (const line of raw.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+      }
+      if (dataLines.length) onEvent(event, JSON.parse(dataLines.join('\n')));
+    }
+  }
+};
+
 // Auth API calls
 export const authAPI = {
   async login(email, password) {
@@ -199,7 +240,9 @@ export const profileAPI = {
     });
   },
 
-  async uploadResume(file) {
+  // Upload a resume, then poll its processing job; onStatus(status) reports each
+  // stage. Resolves with the finished job ({success, parsed_data, resume_url})
+  async uploadResume(file, onStatus) {
     const formData = new FormData();
     formData.append('resume', file);
 
@@ -212,7 +255,27 @@ export const profileAPI = {
       body: formData,
     });
 
-    return response.json();
+    const upload = await response.json();
+    if (!upload.success || !upload.job_id) return upload;
+    return this.waitForResumeJob(upload.job_id, onStatus);
+  },
+
+  async getResumeJob(jobId) {
+    return apiRequest(`/api/resume/jobs/${jobId}`);
+  },
+
+  async waitForResumeJob(jobId, onStatus, { interval = 1000, timeout = 120000 } = {}) {
+    const deadline = Date.now() + timeout;
+    while (Date.now() < deadline) {
+      const job = await this.getResumeJob(jobId);
+      onStatus?.(job.status);
+      if (job.status === 'done') return job;
+      if (job.status === 'failed' || !job.success) {
+        return { ...job, success: false, error: job.error || 'Resume processing failed' };
+      }
+      await new Promise(resolve => setTimeout(resolve, interval));
+    }
+    return { success: false, error: 'Resume processing timed out' };
   },
 
   async uploadProfileImage(file) {
@@ -266,20 +329,37 @@ export const alumniAPI = {
     return apiRequest('/api/filters');
   },
 
-  // Get AI-powered alumni recommendations
-  async getRecommendations(excludeIds = [], count = 10) {
+  // Get AI-powered alumni recommendations (pass next_cursor for the next page)
+  async getRecommendations(cursor = null, count = 10) {
     return apiRequest('/api/recommendations', {
       method: 'POST',
-      body: JSON.stringify({ exclude_ids: excludeIds, count }),
+      body: JSON.stringify(cursor ? { cursor, count } : { count }),
     });
   },
 
-  // Generate AI-powered networking email
-  async generateEmail(alumniData) {
+  // Generate AI-powered networking email (regenerate skips the cached draft)
+  async generateEmail(alumniData, regenerate = false) {
     return apiRequest('/api/generate-email', {
       method: 'POST',
-      body: JSON.stringify({ alumni: alumniData }),
+      body: JSON.stringify(regenerate ? { alumni: alumniData, regenerate } : { alumni: alumniData }),
+    });
+  },
+
+  // Generate an email and stream it: onSubject(subject) first, then onToken(text)
+  // per chunk; resolves with {email, subject}
+  async streamEmail(alumniData, { onSubject, onToken } = {}, regenerate = false) {
+    let result = null;
+    await streamRequest('/api/generate-email/stream', {
+      method: 'POST',
+      body: JSON.stringify(regenerate ? { alumni: alumniData, regenerate } : { alumni: alumniData }),
+    }, (event, data) => {
+      if (event === 'meta') onSubject?.(data.subject);
+      else if (event === 'token') onToken?.(data.text);
+      else if (event === 'done') result = data;
+      else if (event === 'error') throw new Error(data.error || 'Failed to generate email');
     });
+    if (result === null) throw new Error('Email stream ended early');
+    return result;
   },
 };
 
@@ -293,6 +373,23 @@ export const chatAPI = {
     });
   },
 
+  // Send a message and stream the reply: onMeta({session_id, member_cards}) first,
+  // then onToken(text) per chunk; resolves with the full response text
+  async streamMessage(message, sessionId = null, { onMeta, onToken } = {}) {
+    let response = null;
+    await streamRequest('/api/chat/stream', {
+      method: 'POST',
+      body: JSON.stringify({ message, session_id: sessionId }),
+    }, (event, data) => {
+      if (event === 'meta') onMeta?.(data);
+      else if (event === 'token') onToken?.(data.text);
+      else if (event === 'done') response = data.response;
+      else if (event === 'error') throw new Error(data.error || 'Chat failed');
+    });
+    if (response === null) throw new Error('Chat stream ended early');
+    return response;
+  },
+
   // Get chat history
   async getHistory(sessionId = null) {
     const params = sessionId ? `?session_id=${sessionId}` : '';